@@ -23,17 +23,24 @@ class AggregatorAgent:
         """
         agent_results should look like {agent_name: {score, label, ...}}.
         Returns composite score, label, confidence, and per-source breakdown.
+
+        Sources marked "missing" (cut by the run's deadline) are left out of
+        the composite instead of counting as a neutral 0, and confidence is
+        scaled by the share of the total weight that actually reported.
         """
         composite = 0.0
         total_weight = 0.0
+        present_weight = 0.0
         breakdown = {}
 
         for agent_name, weight_attr in self.WEIGHT_MAP.items():
             weight = getattr(settings, weight_attr, 0.0)
             result = agent_results.get(agent_name, {})
             score = float(result.get("score", 0.0))
-            composite += score * weight
             total_weight += weight
+            if not result.get("missing"):
+                composite += score * weight
+                present_weight += weight
             breakdown[agent_name] = {
                 "score": round(score, 4),
                 "label": result.get("label", "neutral"),
@@ -41,9 +48,10 @@ class AggregatorAgent:
                 "reasoning": result.get("reasoning", ""),
             }
 
-        # normalize if weights don't perfectly sum to 1
-        if total_weight > 0:
-            composite /= total_weight
+        # normalize if weights don't perfectly sum to 1 (or some sources are missing)
+        if present_weight > 0:
+            composite /= present_weight
+        coverage = present_weight / total_weight if total_weight > 0 else 1.0
 
         composite = round(max(-1.0, min(1.0, composite)), 4)
         label = self._score_to_label(composite)
@@ -52,7 +60,7 @@ class AggregatorAgent:
         # 1) signal strength -- stronger composite = more confident
         # 2) agent agreement -- if all agents point the same way, confidence goes up;
         #    if they're all over the place, it goes down
-        scores = [float(r.get("score", 0.0)) for r in agent_results.values() if r]
+        scores = [float(r.get("score", 0.0)) for r in agent_results.values() if r and not r.get("missing")]
         if len(scores) > 1:
             mean = sum(scores) / len(scores)
             spread = (sum((s - mean) ** 2 for s in scores) / len(scores)) ** 0.5
@@ -64,7 +72,7 @@ class AggregatorAgent:
 
         # base confidence from signal strength, boosted by agreement
         signal_strength = min(abs(composite) * 1.2, 1.0)
-        confidence = round(min((0.3 + signal_strength * 0.7) * agreement, 1.0), 4)
+        confidence = round(min((0.3 + signal_strength * 0.7) * agreement, 1.0) * coverage, 4)
 
         return {
             "sentiment_score": composite,
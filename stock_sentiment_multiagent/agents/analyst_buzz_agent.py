@@ -2,10 +2,11 @@
 Fetches Wall St analyst recommendations from Finnhub and has the LLM
 interpret the overall analyst sentiment (upgrades, downgrades, targets).
 """
-import json
 from agents.base_agent import BaseAgent
+from agents.memo import memoized
 from data.analyst_fetcher import fetch_analyst_data
 from models.gemini_client import gemini_client
+from models.prompt_budget import compact_json
 from config.prompts import ANALYST_BUZZ_PROMPT
 
 
@@ -16,6 +17,9 @@ class AnalystBuzzAgent(BaseAgent):
 
     def run(self, ticker: str) -> dict:
         data = fetch_analyst_data(ticker)
+        if data.get("error"):
+            # zero counts from a failed fetch aren't "no coverage"
+            raise RuntimeError(f"Finnhub fetch failed: {data['error']}")
 
         # nothing useful came back — just return neutral
         if not data["recommendation_key"] or data["recommendation_key"] == "none":
@@ -27,6 +31,7 @@ class AnalystBuzzAgent(BaseAgent):
                     "buy_count": 0,
                     "hold_count": 0,
                     "sell_count": 0,
+                    "no_data": True,
                 }
 
         # tally up the recent upgrade/downgrade actions
@@ -59,9 +64,12 @@ class AnalystBuzzAgent(BaseAgent):
 
         prompt = ANALYST_BUZZ_PROMPT.format(
             ticker=ticker,
-            analyst_data=json.dumps(analyst_summary, indent=2),
+            analyst_data=compact_json(analyst_summary),
+        )
+        result = memoized(
+            self.name, ticker, analyst_summary,
+            lambda: gemini_client.generate_json(prompt), template=ANALYST_BUZZ_PROMPT,
         )
-        result = gemini_client.generate_json(prompt)
 
         result["buy_count"] = buy_count
         result["hold_count"] = hold_count
@@ -6,15 +6,27 @@ at minimum: score (float, -1 to 1), label, reasoning, and agent name.
 """
 import logging
 from abc import ABC, abstractmethod
+from telemetry.metrics import AGENT_FAILURES, DEADLINE_MISSES
+from utils import deadline
 
 logger = logging.getLogger(__name__)
 
 
+def _is_timeout(e: BaseException) -> bool:
+    # requests, httpx and the LLM SDKs each have their own timeout class; most aren't TimeoutError
+    while e is not None:
+        if isinstance(e, TimeoutError) or "timeout" in type(e).__name__.lower():
+            return True
+        e = e.__cause__ or e.__context__
+    return False
+
+
 class BaseAgent(ABC):
     """
     Every agent subclass must define a `name` property and a `run` method.
     The `_safe_run` wrapper catches exceptions so one failing agent
-    doesn't take down the whole pipeline.
+    doesn't take down the whole pipeline. An agent that runs out of the
+    run's time budget comes back neutral and marked "missing".
     """
 
     @property
@@ -29,11 +41,24 @@ class BaseAgent(ABC):
     def _safe_run(self, ticker: str) -> dict:
         """Wraps run() so the orchestrator never crashes if an agent throws."""
         try:
+            deadline.check(f"{self.name} agent")
             result = self.run(ticker)
             result["agent"] = self.name
             return result
         except Exception as e:
+            # a timeout once time is up (the SDKs' capped timeouts) is the deadline's doing; a bug is still a bug
+            if isinstance(e, deadline.DeadlineExceeded) or (deadline.expired() and _is_timeout(e)):
+                logger.warning(f"[{self.name}] Out of time for {ticker}: {e}")
+                DEADLINE_MISSES.inc(agent=self.name)
+                return {
+                    "agent": self.name,
+                    "score": 0.0,
+                    "label": "neutral",
+                    "reasoning": "Skipped: the run's deadline passed.",
+                    "missing": "deadline exceeded",
+                }
             logger.error(f"[{self.name}] Error for {ticker}: {e}")
+            AGENT_FAILURES.inc(agent=self.name)
             return {
                 "agent": self.name,
                 "score": 0.0,
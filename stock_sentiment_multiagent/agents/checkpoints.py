@@ -0,0 +1,121 @@
+"""
+Persistent LangGraph checkpoints for resumable batch runs.
+
+Every in-process batch (`main.py --ticker A B C ...`) gets a run id, and
+each ticker runs on the checkpointed graph under thread "<run_id>:<TICKER>".
+LangGraph saves the state after every node, so if the process dies --
+provider outage, OOM, Ctrl+C -- `main.py --resume <run_id>`:
+- skips tickers whose graph already reached the end,
+- continues in-progress ones from the node after their last checkpoint,
+  keeping the source results (and LLM calls) already paid for,
+- starts the rest from scratch.
+
+Checkpoints live in SQLite at CHECKPOINT_PATH, next to a small batch_runs
+table that remembers each run's ticker list, so --resume doesn't need it
+again. Runs older than CHECKPOINT_RETENTION_DAYS are pruned whenever a new
+run starts.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_runs (
+    run_id     TEXT PRIMARY KEY,
+    tickers    TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+"""
+
+_savers: dict = {}
+_lock = threading.Lock()
+
+
+def get_checkpointer(path: Optional[str] = None):
+    """This process's SqliteSaver for `path` (default CHECKPOINT_PATH), created on first use."""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    path = path or settings.checkpoint_path
+    with _lock:
+        saver = _savers.get(path)
+        if saver is None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # the saver serializes access itself, so one connection can serve every thread
+            saver = SqliteSaver(sqlite3.connect(path, check_same_thread=False, timeout=30))
+            saver.setup()
+            _savers[path] = saver
+        return saver
+
+
+@contextmanager
+def _connect(path: str):
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            conn.executescript(_SCHEMA)
+            yield conn
+    finally:
+        conn.close()
+
+
+def thread_config(run_id: str, ticker: str) -> dict:
+    return {"configurable": {"thread_id": f"{run_id}:{ticker}"}}
+
+
+def new_run_id() -> str:
+    # sortable by start time, unique across machines
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
+
+
+def start_run(tickers: list[str], path: Optional[str] = None) -> str:
+    """Register a new run and its tickers; returns the run id."""
+    path = path or settings.checkpoint_path
+    run_id = new_run_id()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _connect(path) as conn:
+        conn.execute(
+            "INSERT INTO batch_runs (run_id, tickers, started_at) VALUES (?, ?, ?)",
+            (run_id, json.dumps(tickers), datetime.now(timezone.utc).isoformat()),
+        )
+    prune(settings.checkpoint_retention_days, path)
+    return run_id
+
+
+def run_tickers(run_id: str, path: Optional[str] = None) -> Optional[list[str]]:
+    """The tickers a run was started with, or None if the run id is unknown."""
+    path = path or settings.checkpoint_path
+    if not os.path.exists(path):
+        return None
+    with _connect(path) as conn:
+        row = conn.execute("SELECT tickers FROM batch_runs WHERE run_id = ?", (run_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def prune(older_than_days: int, path: Optional[str] = None) -> int:
+    """Drop checkpoints of runs started more than `older_than_days` ago. Returns how many runs went."""
+    if older_than_days <= 0:
+        return 0
+    path = path or settings.checkpoint_path
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+    with _connect(path) as conn:
+        old = conn.execute("SELECT run_id, tickers FROM batch_runs WHERE started_at < ?", (cutoff,)).fetchall()
+    if not old:
+        return 0
+    saver = get_checkpointer(path)
+    for run_id, tickers in old:
+        for ticker in json.loads(tickers):
+            saver.delete_thread(f"{run_id}:{ticker}")
+    with _connect(path) as conn:
+        conn.executemany("DELETE FROM batch_runs WHERE run_id = ?", [(run_id,) for run_id, _ in old])
+    logger.info(f"Pruned checkpoints of {len(old)} run(s) older than {older_than_days} days")
+    return len(old)
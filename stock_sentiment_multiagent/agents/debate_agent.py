@@ -4,10 +4,51 @@ Runs a "bull vs bear" debate after all sentiment agents have finished.
 The idea here is inspired by multi-agent debate papers (Du et al., 2023) --
 having the LLM synthesize conflicting signals improves the final quality
 compared to just averaging scores blindly.
+
+Two modes (DEBATE_MODE):
+
+- single (default): one LLM call writes the bull case, the bear case and
+  the resolution. One long completion, which ends up being most of a
+  ticker's latency.
+- structured: a bull advocate and a bear advocate are separate, short
+  calls that run at the same time, then a short judge call reads both and
+  decides. With DEBATE_ROUNDS > 1 each advocate also sees the other side's
+  previous argument and answers it. A round costs as long as its slower
+  advocate, never both back to back, and is cut off after
+  DEBATE_ROUND_TIMEOUT_SECONDS: a side that hasn't answered by then keeps
+  its previous round's argument (or stays empty), and a round where
+  neither side answered ends the debate early. A debate where a side
+  missed a round is returned but not memoized, so the next run retries.
 """
-import json
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from agents.memo import memoized
 from models.gemini_client import gemini_client
-from config.prompts import DEBATE_PROMPT
+from models.prompt_budget import compact_json, truncate
+from config.prompts import DEBATE_ADVOCATE_PROMPT, DEBATE_JUDGE_PROMPT, DEBATE_PROMPT, DEBATE_REBUTTAL
+from config.settings import settings
+from telemetry.metrics import DEBATE_ADVOCATES
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+_STANCES = {"bull": "bullish", "bear": "bearish or cautious"}
+
+
+class _OneSided(Exception):
+    """An advocate missed a round: the debate is usable but mustn't be memoized."""
+
+    def __init__(self, result: dict):
+        super().__init__("debate advocate missed a round")
+        self.result = result
+
+
+def _bounded(seconds: float, fn):
+    # a round's timeout is a deadline scope, so the LLM client caps its own SDK timeout / backoff to it
+    with deadline.within(seconds):
+        return fn()
 
 
 class DebateAgent:
@@ -23,27 +64,124 @@ class DebateAgent:
             agent_summary[name] = {
                 "score": result.get("score", 0.0),
                 "label": result.get("label", "neutral"),
-                "reasoning": result.get("reasoning", ""),
+                "reasoning": truncate(result.get("reasoning", "")),
             }
 
-        prompt = DEBATE_PROMPT.format(
-            ticker=ticker,
-            agent_results=json.dumps(agent_summary, indent=2),
-        )
+        # key on the sources' fingerprints: if none changed, neither would the debate
+        upstream = {
+            name: result.get("fingerprint") or agent_summary[name]
+            for name, result in agent_results.items()
+        }
+        if settings.debate_mode == "structured":
+            template = f"{DEBATE_ADVOCATE_PROMPT}{DEBATE_REBUTTAL}{DEBATE_JUDGE_PROMPT}rounds={settings.debate_rounds}"
+            compute = lambda: self._structured(ticker, agent_summary)
+        else:
+            prompt = DEBATE_PROMPT.format(
+                ticker=ticker,
+                agent_results=compact_json(agent_summary),
+            )
+            template = DEBATE_PROMPT
+            compute = lambda: gemini_client.generate_json(prompt)
 
         try:
-            result = gemini_client.generate_json(prompt)
-            return {
-                "bull_case": result.get("bull_case", ""),
-                "bear_case": result.get("bear_case", ""),
-                "resolution": result.get("resolution", ""),
-                "key_drivers": result.get("key_drivers", []),
-            }
+            result = memoized("debate", ticker, upstream, compute, template=template)
+        except _OneSided as e:
+            # no fingerprint either: the summary keys on the resolution instead
+            return self._format(e.result)
         except Exception as e:
             # debate is nice-to-have, not critical
+            logger.error(f"[debate] Debate failed for {ticker}, using the fallback: {e}")
             return {
                 "bull_case": "Positive signals from multiple sources.",
                 "bear_case": "Some uncertainty remains.",
                 "resolution": "Debate unavailable.",
                 "key_drivers": [],
             }
+        return self._format(result)
+
+    @staticmethod
+    def _format(result: dict) -> dict:
+        debate = {
+            "bull_case": result.get("bull_case", ""),
+            "bear_case": result.get("bear_case", ""),
+            "resolution": result.get("resolution", ""),
+            "key_drivers": result.get("key_drivers", []),
+        }
+        for key in ("rounds", "fingerprint"):
+            if key in result:
+                debate[key] = result[key]
+        return debate
+
+    def _structured(self, ticker: str, agent_summary: dict) -> dict:
+        evidence = compact_json(agent_summary)
+        timeout = settings.debate_round_timeout_seconds
+        cases = {}
+        rounds = 0
+        missed = False
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debate")
+        try:
+            for _ in range(max(1, settings.debate_rounds)):
+                if deadline.expired():
+                    missed = True
+                    break
+                argued = self._round(pool, ticker, evidence, cases, timeout)
+                missed = missed or len(argued) < 2
+                if not argued:
+                    break
+                cases.update(argued)
+                rounds += 1
+        finally:
+            # a straggler past its round's timeout is abandoned, not waited for
+            pool.shutdown(wait=False, cancel_futures=True)
+        if not cases:
+            raise TimeoutError(f"no debate advocate answered within {timeout}s")
+
+        prompt = DEBATE_JUDGE_PROMPT.format(
+            ticker=ticker,
+            agent_results=compact_json({name: s["score"] for name, s in agent_summary.items()}),
+            bull_case=cases.get("bull") or "(none)",
+            bear_case=cases.get("bear") or "(none)",
+        )
+        verdict = _bounded(timeout, lambda: gemini_client.generate_json(prompt))
+        result = {
+            "bull_case": cases.get("bull", ""),
+            "bear_case": cases.get("bear", ""),
+            "resolution": verdict.get("resolution", ""),
+            "key_drivers": verdict.get("key_drivers", [])[:3],
+            "rounds": rounds,
+        }
+        if missed:
+            raise _OneSided(result)
+        return result
+
+    def _round(self, pool, ticker: str, evidence: str, previous: dict, timeout: float) -> dict:
+        """Both advocates at once; whatever each side argued within `timeout`."""
+        opponent = {"bull": "bear", "bear": "bull"}
+        futures = {}
+        for side in ("bull", "bear"):
+            rebuttal = ""
+            if previous.get(opponent[side]):
+                rebuttal = DEBATE_REBUTTAL.format(argument=truncate(previous[opponent[side]]))
+            prompt = DEBATE_ADVOCATE_PROMPT.format(
+                side=side, stance=_STANCES[side], ticker=ticker, agent_results=evidence, rebuttal=rebuttal,
+            )
+            # each thread gets a copy of this context: the run's deadline and the current span go with it
+            ctx = contextvars.copy_context()
+            futures[side] = pool.submit(ctx.run, _bounded, timeout, lambda p=prompt: gemini_client.generate_json(p))
+
+        left = deadline.remaining()
+        done, _ = wait(futures.values(), timeout=timeout if left is None else min(timeout, left))
+        argued = {}
+        for side, future in futures.items():
+            if future not in done:
+                DEBATE_ADVOCATES.inc(side=side, outcome="timeout")
+                logger.warning(f"[debate] {side} advocate for {ticker} didn't answer within {timeout}s")
+            elif future.exception() is not None:
+                DEBATE_ADVOCATES.inc(side=side, outcome="error")
+                logger.warning(f"[debate] {side} advocate for {ticker} failed: {future.exception()}")
+            else:
+                DEBATE_ADVOCATES.inc(side=side, outcome="ok")
+                argument = str(future.result().get("argument", "")).strip()
+                if argument:
+                    argued[side] = argument
+        return argued
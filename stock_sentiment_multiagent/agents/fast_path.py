@@ -0,0 +1,89 @@
+"""
+Fast path: skip the debate and summary LLM calls when they'd add nothing.
+
+Two cases don't need an LLM to synthesize:
+- no information: every source answered and had nothing (no headlines,
+  not trending, no analyst coverage, no search results). The debate would
+  be a bull and a bear arguing over four zeros.
+- strong agreement: at least FAST_PATH_MIN_SOURCES sources had data, they
+  all carry the same label, and the aggregate confidence (which already
+  folds in signal strength and spread) is at least
+  FAST_PATH_MIN_CONFIDENCE.
+
+Then debate_node writes a templated debate from the sources' own
+reasoning, summary_node a templated summary from the aggregate, and the
+report's "fast_path" field says which case applied (null when the LLM
+did the synthesis). Only a source that says so with no_data=True counts
+as empty: the agents set it when their fetch succeeded and found nothing,
+while a failed fetch surfaces as an error. Sources that failed or were
+cut by the deadline are missing information, not an empty answer.
+
+FAST_PATH_ENABLED=false always takes the LLM path.
+"""
+from typing import Optional
+
+from config.settings import settings
+
+NO_DATA = "no_data"
+AGREEMENT = "agreement"
+
+
+def _empty(result: dict) -> bool:
+    # the source answered, but there was nothing there
+    return bool(result.get("no_data"))
+
+
+def _failed(result: dict) -> bool:
+    return bool(result.get("error") or result.get("missing")) or not result
+
+
+def reason(agent_results: dict, aggregation: dict) -> Optional[str]:
+    """NO_DATA or AGREEMENT if the LLM synthesis can be skipped, else None."""
+    if not settings.fast_path_enabled or not agent_results:
+        return None
+    if all(not _failed(r) and _empty(r) for r in agent_results.values()):
+        return NO_DATA
+
+    informative = [r for r in agent_results.values() if not _failed(r) and not _empty(r)]
+    labels = {str(r.get("label", "neutral")).lower() for r in informative}
+    if (
+        len(informative) >= settings.fast_path_min_sources
+        and len(labels) == 1
+        and aggregation.get("confidence", 0.0) >= settings.fast_path_min_confidence
+    ):
+        return AGREEMENT
+    return None
+
+
+def templated_debate(ticker: str, agent_results: dict, aggregation: dict, why: str) -> dict:
+    """Debate section built from the sources' own reasoning, no LLM."""
+    if why == NO_DATA:
+        return {
+            "bull_case": "No source had data to support a bullish view.",
+            "bear_case": "No source had data to support a bearish view.",
+            "resolution": f"None of the sources had data for {ticker}; nothing to debate.",
+            "key_drivers": [],
+            "fast_path": why,
+        }
+
+    label = aggregation.get("sentiment_label", "NEUTRAL")
+    drivers = [name for name, r in agent_results.items() if not _failed(r) and not _empty(r)]
+    reasons = " ".join(
+        agent_results[name].get("reasoning", "").strip() for name in drivers if agent_results[name].get("reasoning")
+    )
+    agreed = f"All {len(drivers)} sources with data read {label.lower()}."
+    return {
+        "bull_case": reasons if label == "POSITIVE" else "No source argued the bullish side.",
+        "bear_case": reasons if label == "NEGATIVE" else "No source argued the bearish side.",
+        "resolution": f"{agreed} Confidence {aggregation.get('confidence', 0.0):.2f}.",
+        "key_drivers": drivers,
+        "fast_path": why,
+    }
+
+
+def templated_summary(ticker: str, aggregation: dict, debate: dict) -> str:
+    label = aggregation.get("sentiment_label", "NEUTRAL")
+    numbers = f"score {aggregation.get('sentiment_score', 0.0):+.2f}, confidence {aggregation.get('confidence', 0.0):.2f}"
+    if debate.get("fast_path") == NO_DATA:
+        return f"No news, social, analyst or web data was found for {ticker}, so sentiment defaults to {label} ({numbers})."
+    return f"Sentiment for {ticker} is {label} ({numbers}). {debate.get('resolution', '')}".strip()
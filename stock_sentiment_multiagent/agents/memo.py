@@ -0,0 +1,197 @@
+"""
+Per-node memoization keyed by what the node actually saw.
+
+Rerunning a ticker whose sources haven't moved -- same headlines, same
+ApeWisdom numbers, same analyst counts -- used to cost the same LLM calls
+as the first run, for the same answer. Now each LLM-backed step
+fingerprints its inputs (a SHA-256 of canonical JSON, plus the prompt
+template and the model, so a prompt or provider change invalidates it)
+and reuses the stored result when that fingerprint was seen before:
+
+- news / social / analyst / web: the fetched data that goes into the prompt,
+- debate: the four sources' fingerprints, so when none of them changed the
+  debate isn't even prompted,
+- summary: the debate's fingerprint and the aggregate numbers.
+
+The fetches themselves still run -- that's how we know nothing changed.
+Results carry their `fingerprint` so downstream nodes can key on it.
+Failures and fallbacks are never stored.
+
+Entries (inputs included, which is handy for offline analysis) live in
+SQLite at MEMO_PATH for MEMO_TTL_SECONDS; 0 turns memoization off.
+Cassette runs bypass it so they record/replay every LLM call.
+
+    python -m agents.memo stats
+    python -m agents.memo clear --node debate
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from config.settings import settings
+from telemetry.metrics import MEMO_LOOKUPS
+from telemetry.spans import current_span
+from utils import cassette
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    node        TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    ticker      TEXT NOT NULL,
+    inputs      TEXT NOT NULL,
+    result      TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (node, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_memo_node_ts ON memo (node, recorded_at);
+"""
+
+
+def fingerprint(value) -> str:
+    """Stable hash of any JSON-able value (key order doesn't matter)."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoStore:
+    def __init__(self, path: str, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # a fresh connection per call keeps this safe to use from threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, node: str, fp: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM memo WHERE node = ? AND fingerprint = ? AND recorded_at >= ?",
+                (node, fp, self._clock() - self.ttl_seconds),
+            ).fetchone()
+        return json.loads(row["result"]) if row else None
+
+    def put(self, node: str, fp: str, ticker: str, inputs, result: dict) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (node, fingerprint, ticker, inputs, result, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (node, fp, ticker.upper(), json.dumps(inputs, default=str), json.dumps(result, default=str), self._clock()),
+            )
+
+    def entries(self, node: str, limit: Optional[int] = None) -> list[dict]:
+        """Stored (ticker, inputs, result) for a node, newest first, expired ones included."""
+        sql = "SELECT ticker, inputs, result, recorded_at FROM memo WHERE node = ? ORDER BY recorded_at DESC"
+        params: tuple = (node,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {"ticker": r["ticker"], "inputs": json.loads(r["inputs"]), "result": json.loads(r["result"]),
+             "recorded_at": r["recorded_at"]}
+            for r in rows
+        ]
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            return {r["node"]: r["n"] for r in conn.execute("SELECT node, COUNT(*) AS n FROM memo GROUP BY node")}
+
+    def clear(self, node: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            if node:
+                return conn.execute("DELETE FROM memo WHERE node = ?", (node,)).rowcount
+            return conn.execute("DELETE FROM memo").rowcount
+
+
+_store: Optional[MemoStore] = None
+_lock = threading.Lock()
+
+
+def get_memo_store() -> Optional[MemoStore]:
+    """The store for the configured path, or None when MEMO_TTL_SECONDS is 0."""
+    global _store
+    if settings.memo_ttl_seconds <= 0:
+        return None
+    with _lock:
+        if _store is None or _store.path != settings.memo_path:
+            _store = MemoStore(settings.memo_path, settings.memo_ttl_seconds)
+        _store.ttl_seconds = settings.memo_ttl_seconds
+        return _store
+
+
+def reset_memo_store() -> None:
+    global _store
+    with _lock:
+        _store = None
+
+
+def _model() -> str:
+    provider = settings.llm_provider.lower()
+    return f"{provider}:{getattr(settings, f'{provider}_model', '')}"
+
+
+def memoized(node: str, ticker: str, inputs, compute: Callable[[], dict], template: str = "") -> dict:
+    """
+    compute()'s result for these inputs -- from the store if this exact
+    (node, ticker, inputs, prompt template, model) was computed before.
+    The returned dict always carries its "fingerprint".
+    """
+    fp = fingerprint({"node": node, "ticker": ticker.upper(), "inputs": inputs, "template": template, "model": _model()})
+    # a cassette run should make (and record / replay) every call
+    store = get_memo_store() if cassette.active() is None else None
+    if store is not None:
+        hit = store.lookup(node, fp)
+        if hit is not None:
+            MEMO_LOOKUPS.inc(node=node, outcome="hit")
+            logger.debug(f"[{node}] inputs unchanged for {ticker}, reusing the previous result")
+            s = current_span()
+            if s is not None:
+                s.attrs["memo"] = "hit"
+            return {**hit, "fingerprint": fp}
+        MEMO_LOOKUPS.inc(node=node, outcome="miss")
+
+    result = compute()
+    if store is not None:
+        store.put(node, fp, ticker, inputs, result)
+    return {**result, "fingerprint": fp}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the per-node memo store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries per node")
+    p = sub.add_parser("clear", help="Drop entries so the nodes recompute")
+    p.add_argument("--node")
+    args = parser.parse_args(argv)
+
+    store = MemoStore(settings.memo_path, settings.memo_ttl_seconds)
+    if args.command == "stats":
+        for node, count in sorted(store.stats().items()):
+            print(f"{node:<18} {count}")
+    else:
+        print(f"Removed {store.clear(args.node)} entries")
+
+
+if __name__ == "__main__":
+    main()
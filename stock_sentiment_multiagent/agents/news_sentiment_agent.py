@@ -3,8 +3,11 @@ Scrapes financial news headlines (Finviz + Yahoo) and asks the LLM
 to score the overall sentiment for a given ticker.
 """
 from agents.base_agent import BaseAgent
+from agents.memo import memoized
+from models.distilled import score_locally
 from data.news_fetcher import fetch_all_headlines
 from models.gemini_client import gemini_client
+from models.prompt_budget import bullets, fit
 from config.prompts import NEWS_SENTIMENT_PROMPT
 
 
@@ -21,11 +24,16 @@ class NewsSentimentAgent(BaseAgent):
                 "label": "neutral",
                 "reasoning": "No headlines found.",
                 "sources": 0,
+                "no_data": True,
             }
 
-        headlines_text = "\n".join(f"- {h}" for h in headlines)
-        prompt = NEWS_SENTIMENT_PROMPT.format(ticker=ticker, headlines=headlines_text)
-        result = gemini_client.generate_json(prompt)
+        # Finviz (newest first) comes before Yahoo, so the budget keeps the freshest
+        headlines = fit(NEWS_SENTIMENT_PROMPT, "headlines", headlines, ticker=ticker)
+        prompt = NEWS_SENTIMENT_PROMPT.format(ticker=ticker, headlines=bullets(headlines))
+        result = score_locally(self.name, headlines) or memoized(
+            self.name, ticker, {"headlines": headlines},
+            lambda: gemini_client.generate_json(prompt), template=NEWS_SENTIMENT_PROMPT,
+        )
 
         result["sources"] = len(headlines)
         result["score"] = float(max(-1.0, min(1.0, result.get("score", 0.0))))
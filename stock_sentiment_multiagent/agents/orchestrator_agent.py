@@ -1,9 +1,29 @@
 """
 Thin wrapper around the LangGraph pipeline.
-Just kicks off the graph and returns the final report dict.
+Kicks off the graph and either returns the final report dict (run) or
+yields each node's output as soon as it finishes (stream).
+
+Every run records timing spans (see telemetry/spans.py) and attaches
+their summary to the report under "timings". Sources whose upstream was
+refused outright (open circuit breaker) are listed under "skipped_sources".
+
+With a `run_id`, the ticker runs on the checkpointed graph (see
+agents/checkpoints.py) under thread "<run_id>:<TICKER>" and resumes from
+its last completed node if that thread was cut short earlier.
+
+An optional `deadline` (seconds) bounds the whole run, see utils/deadline.py.
+Sources it cuts are listed under "missing_sources" and the confidence is
+scaled down for them, rather than the run overrunning its budget.
 """
 import logging
-from agents.sentiment_graph import sentiment_graph
+import time
+from typing import Iterator, Optional
+from agents.checkpoints import thread_config
+from agents.sentiment_graph import get_checkpointed_graph, get_sentiment_graph
+from config.settings import settings
+from telemetry.metrics import TICKERS, PIPELINE_SECONDS
+from telemetry.spans import record_spans, skipped_sources
+from utils.deadline import within
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +35,31 @@ class OrchestratorAgent:
     news -> social -> analyst -> web -> debate -> aggregate -> summary -> report
     """
 
-    def run(self, ticker: str) -> dict:
+    def run(self, ticker: str, deadline: Optional[float] = None, run_id: Optional[str] = None) -> dict:
         ticker = ticker.upper().strip()
         logger.info(f"Starting LangGraph sentiment pipeline for {ticker}")
 
-        final_state = sentiment_graph.invoke({"ticker": ticker})
+        graph, invoke_args = get_sentiment_graph(), ({"ticker": ticker},)
+        if run_id is not None:
+            graph, config = get_checkpointed_graph(settings.checkpoint_path), thread_config(run_id, ticker)
+            invoke_args = ({"ticker": ticker}, config)
+            if self.checkpoint_status(run_id, ticker) == "in_progress":
+                # None tells LangGraph to carry on from the thread's last checkpoint
+                logger.info(f"Resuming {ticker} from its last checkpoint in run {run_id}")
+                invoke_args = (None, config)
+
+        try:
+            with within(deadline), record_spans() as recorder:
+                final_state = graph.invoke(*invoke_args)
+        except Exception:
+            TICKERS.inc(status="error")
+            raise
 
         report = final_state.get("report", {})
+        report["timings"] = recorder.summary()
+        report["skipped_sources"] = skipped_sources(report["timings"])
+        TICKERS.inc(status="ok")
+        PIPELINE_SECONDS.observe(report["timings"]["total_seconds"])
         agg = final_state.get("aggregation", {})
         logger.info(
             f"Pipeline complete for {ticker}: "
@@ -30,3 +68,47 @@ class OrchestratorAgent:
             f"confidence={agg.get('confidence')})"
         )
         return report
+
+    def checkpoint_status(self, run_id: str, ticker: str) -> str:
+        """"done", "in_progress" or "new" for this ticker's thread in a checkpointed run."""
+        graph = get_checkpointed_graph(settings.checkpoint_path)
+        snapshot = graph.get_state(thread_config(run_id, ticker.upper().strip()))
+        if not snapshot.values:
+            return "new"
+        return "in_progress" if snapshot.next else "done"
+
+    def run_batch(self, tickers: list[str], deadline: Optional[float] = None) -> list[dict]:
+        """
+        Run each ticker in turn; reports come back in input order. `deadline`
+        is one budget for the whole batch -- tickers reached after it has
+        passed still get a (mostly empty) report, just very quickly.
+        """
+        with within(deadline):
+            return [self.run(ticker) for ticker in tickers]
+
+    def stream(self, ticker: str, deadline: Optional[float] = None) -> Iterator[dict]:
+        """
+        Same pipeline as run(), but yields one event per graph node as it
+        completes, e.g. {"ticker": "AAPL", "node": "news", "elapsed": 3.2,
+        "data": {"news_result": {...}}}. The last event is the "report" node,
+        whose data holds the final report.
+        """
+        ticker = ticker.upper().strip()
+        logger.info(f"Streaming LangGraph sentiment pipeline for {ticker}")
+
+        started = time.monotonic()
+        with within(deadline), record_spans() as recorder:
+            for update in get_sentiment_graph().stream({"ticker": ticker}, stream_mode="updates"):
+                # "updates" mode gives {node_name: fields_that_node_returned}
+                for node, data in update.items():
+                    if node == "report" and "report" in data:
+                        data["report"]["timings"] = recorder.summary()
+                        data["report"]["skipped_sources"] = skipped_sources(data["report"]["timings"])
+                        TICKERS.inc(status="ok")
+                        PIPELINE_SECONDS.observe(data["report"]["timings"]["total_seconds"])
+                    yield {
+                        "ticker": ticker,
+                        "node": node,
+                        "elapsed": round(time.monotonic() - started, 3),
+                        "data": data,
+                    }
@@ -7,10 +7,15 @@ strict rate limits and bursting multiple requests causes 429 errors.
 Sequential execution is slightly slower but way more reliable.
 
 Pipeline: news -> social -> analyst -> web -> debate -> aggregate -> summary -> report
+
+The graph is compiled on first use (get_sentiment_graph), not at import
+time, so CLI paths that never run the pipeline don't pay for langgraph.
+Batch runs use a second copy compiled with a persistent checkpointer
+(get_checkpointed_graph, see agents/checkpoints.py) so they can resume.
 """
 import logging
-from typing import TypedDict, Optional
-from langgraph.graph import StateGraph, START, END
+from functools import lru_cache
+from typing import TypedDict
 
 from agents.news_sentiment_agent import NewsSentimentAgent
 from agents.social_sentiment_agent import SocialSentimentAgent
@@ -18,9 +23,14 @@ from agents.analyst_buzz_agent import AnalystBuzzAgent
 from agents.web_sentiment_agent import WebSentimentAgent
 from agents.debate_agent import DebateAgent
 from agents.aggregator_agent import AggregatorAgent
+from agents import fast_path
+from agents.memo import memoized
 from models.gemini_client import gemini_client
+from models.prompt_budget import truncate
 from config.prompts import SUMMARY_PROMPT
 from output.report_generator import build_report
+from telemetry.metrics import FAST_PATHS
+from telemetry.spans import traced
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +60,7 @@ _aggregator    = AggregatorAgent()
 # ---- graph node functions ----
 # each one takes state, does its thing, returns just the fields it owns
 
+@traced("news", kind="node")
 def news_node(state: SentimentState) -> dict:
     """Fetch headlines from Finviz + Yahoo and score them via LLM."""
     ticker = state["ticker"]
@@ -59,6 +70,7 @@ def news_node(state: SentimentState) -> dict:
     return {"news_result": result}
 
 
+@traced("social", kind="node")
 def social_node(state: SentimentState) -> dict:
     """Pull Reddit buzz from ApeWisdom and interpret it."""
     ticker = state["ticker"]
@@ -68,6 +80,7 @@ def social_node(state: SentimentState) -> dict:
     return {"social_result": result}
 
 
+@traced("analyst", kind="node")
 def analyst_node(state: SentimentState) -> dict:
     """Grab analyst recs from Finnhub (no cooldown needed, 60 calls/min)."""
     ticker = state["ticker"]
@@ -77,6 +90,7 @@ def analyst_node(state: SentimentState) -> dict:
     return {"analyst_result": result}
 
 
+@traced("web", kind="node")
 def web_node(state: SentimentState) -> dict:
     """Search DuckDuckGo for recent articles and score the snippets."""
     ticker = state["ticker"]
@@ -86,6 +100,7 @@ def web_node(state: SentimentState) -> dict:
     return {"web_result": result}
 
 
+@traced("debate", kind="node")
 def debate_node(state: SentimentState) -> dict:
     """Have the LLM synthesize a bull vs bear debate from all agent outputs."""
     ticker = state["ticker"]
@@ -95,12 +110,21 @@ def debate_node(state: SentimentState) -> dict:
         "analyst_buzz":    state.get("analyst_result", {}),
         "web_search":      state.get("web_result", {}),
     }
+    # cheap to compute twice; aggregate_node still owns the state field
+    aggregation = _aggregator.run(agent_results)
+    why = fast_path.reason(agent_results, aggregation)
+    if why is not None:
+        logger.info(f"[debate_node] Fast path for {ticker} ({why}), skipping the LLM debate")
+        FAST_PATHS.inc(reason=why)
+        return {"debate_result": fast_path.templated_debate(ticker, agent_results, aggregation, why)}
+
     logger.info(f"[debate_node] Running bull vs bear debate for {ticker}")
     result = _debate_agent.run(ticker, agent_results)
     logger.info(f"[debate_node] Resolution: {result.get('resolution', '')[:80]}")
     return {"debate_result": result}
 
 
+@traced("aggregate", kind="node")
 def aggregate_node(state: SentimentState) -> dict:
     """Weighted score fusion. No LLM call, just math."""
     agent_results = {
@@ -118,22 +142,32 @@ def aggregate_node(state: SentimentState) -> dict:
     return {"aggregation": aggregation}
 
 
+@traced("summary", kind="node")
 def summary_node(state: SentimentState) -> dict:
     """Ask the LLM to write a short natural-language summary."""
     ticker      = state["ticker"]
     aggregation = state.get("aggregation", {})
     debate      = state.get("debate_result", {})
+    if debate.get("fast_path"):
+        return {"summary": fast_path.templated_summary(ticker, aggregation, debate)}
 
     prompt = SUMMARY_PROMPT.format(
         ticker=ticker,
         sentiment_score=aggregation.get("sentiment_score", 0.0),
         sentiment_label=aggregation.get("sentiment_label", "NEUTRAL"),
         confidence=aggregation.get("confidence", 0.0),
-        resolution=debate.get("resolution", ""),
+        resolution=truncate(debate.get("resolution", "")),
     )
+    # same debate and same numbers -> same summary
+    inputs = {
+        "debate": debate.get("fingerprint") or debate.get("resolution", ""),
+        "aggregation": {k: aggregation.get(k) for k in ("sentiment_score", "sentiment_label", "confidence")},
+    }
     logger.info(f"[summary_node] Generating summary for {ticker}")
     try:
-        summary = gemini_client.generate(prompt)
+        summary = memoized(
+            "summary", ticker, inputs, lambda: {"summary": gemini_client.generate(prompt)}, template=SUMMARY_PROMPT,
+        )["summary"]
     except Exception as e:
         logger.error(f"[summary_node] Summary generation failed: {e}")
         summary = "Summary unavailable."
@@ -141,6 +175,7 @@ def summary_node(state: SentimentState) -> dict:
     return {"summary": summary}
 
 
+@traced("report", kind="node")
 def report_node(state: SentimentState) -> dict:
     """Package everything into the final JSON report. No LLM call."""
     agent_results = {
@@ -155,12 +190,21 @@ def report_node(state: SentimentState) -> dict:
         aggregation=state.get("aggregation", {}),
         debate=state.get("debate_result", {}),
         summary=state.get("summary", ""),
+        fast_path=state.get("debate_result", {}).get("fast_path"),
     )
     return {"report": report}
 
 
-def build_sentiment_graph():
-    """Wire up the LangGraph with sequential edges and return the compiled graph."""
+def build_sentiment_graph(checkpointer=None):
+    """
+    Wire up the LangGraph with sequential edges and return the compiled graph.
+    With a checkpointer, the state is saved after every node under the
+    thread_id passed in the invoke config.
+    """
+    # langgraph (and langchain_core under it) is slow to import, so only
+    # pull it in when a graph is actually being built
+    from langgraph.graph import StateGraph, START, END
+
     graph = StateGraph(SentimentState)
 
     graph.add_node("news",      news_node)
@@ -182,8 +226,17 @@ def build_sentiment_graph():
     graph.add_edge("summary",   "report")
     graph.add_edge("report",    END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=None)
+def get_sentiment_graph():
+    """The shared compiled graph -- built on the first call, reused afterwards."""
+    return build_sentiment_graph()
 
 
-# compiled once at import time
-sentiment_graph = build_sentiment_graph()
+@lru_cache(maxsize=None)
+def get_checkpointed_graph(path: str):
+    """The graph compiled with the SQLite checkpointer at `path` (one per process and path)."""
+    from agents.checkpoints import get_checkpointer
+    return build_sentiment_graph(checkpointer=get_checkpointer(path))
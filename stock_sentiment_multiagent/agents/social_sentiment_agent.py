@@ -3,6 +3,7 @@ Pulls Reddit mention/upvote data from ApeWisdom and asks the LLM
 to interpret the social buzz as a sentiment signal.
 """
 from agents.base_agent import BaseAgent
+from agents.memo import memoized
 from data.social_fetcher import fetch_apewisdom
 from models.gemini_client import gemini_client
 from config.prompts import SOCIAL_SENTIMENT_PROMPT
@@ -15,15 +16,26 @@ class SocialSentimentAgent(BaseAgent):
 
     def run(self, ticker: str) -> dict:
         data = fetch_apewisdom(ticker)
+        if data.get("error"):
+            # zeros from a failed fetch aren't "not trending"
+            raise RuntimeError(f"ApeWisdom fetch failed: {data['error']}")
+        # not trending at all -- nothing for the LLM to interpret
+        if data.get("no_data"):
+            return {
+                "score": 0.0,
+                "label": "neutral",
+                "reasoning": "Not in ApeWisdom's trending list.",
+                "mentions": 0,
+                "upvotes": 0,
+                "rank": data["rank"],
+                "no_data": True,
+            }
 
-        prompt = SOCIAL_SENTIMENT_PROMPT.format(
-            ticker=ticker,
-            mentions=data["mentions"],
-            upvotes=data["upvotes"],
-            rank=data["rank"],
-            rank_change=data["rank_change"],
+        inputs = {k: data[k] for k in ("mentions", "upvotes", "rank", "rank_change")}
+        prompt = SOCIAL_SENTIMENT_PROMPT.format(ticker=ticker, **inputs)
+        result = memoized(
+            self.name, ticker, inputs, lambda: gemini_client.generate_json(prompt), template=SOCIAL_SENTIMENT_PROMPT,
         )
-        result = gemini_client.generate_json(prompt)
 
         result["mentions"] = data["mentions"]
         result["upvotes"] = data["upvotes"]
@@ -3,15 +3,31 @@ Searches DuckDuckGo for recent articles about a stock and uses
 the LLM to score the sentiment of the search results.
 """
 from agents.base_agent import BaseAgent
+from agents.memo import memoized
+from models.distilled import score_locally
+from data.circuit_breaker import guard
+from data.news_fetcher import YAHOO_UPSTREAM
 from data.web_fetcher import fetch_web_snippets
 from models.gemini_client import gemini_client
+from models.prompt_budget import bullets, fit
+from models.relevance import filter_snippets
 from config.prompts import WEB_SENTIMENT_PROMPT
-import yfinance as yf
+from telemetry.spans import span
+from utils import cassette, deadline
+from utils.lazy_import import lazy_import
 import logging
 
+yf = lazy_import("yfinance")
+
 logger = logging.getLogger(__name__)
 
 
+def _live_info(ticker: str) -> dict:
+    deadline.check("Yahoo info")
+    with guard(YAHOO_UPSTREAM):
+        return yf.Ticker(ticker).info
+
+
 class WebSentimentAgent(BaseAgent):
     @property
     def name(self) -> str:
@@ -21,25 +37,44 @@ class WebSentimentAgent(BaseAgent):
         # try to grab the company name so the search query is better
         company_name = ""
         try:
-            info = yf.Ticker(ticker).info
+            # .info is a separate (and often slow) Yahoo request, so time it on its own
+            with span("yahoo_info", kind="fetch"):
+                # only the name fields are used, so that's all a cassette keeps
+                info = cassette.through(
+                    "yahoo", f"info:{ticker}", lambda: _live_info(ticker),
+                    encode=lambda full: {k: full.get(k) for k in ("shortName", "longName")},
+                )
             company_name = info.get("shortName", "") or info.get("longName", "")
         except Exception:
             pass
 
-        snippets = fetch_web_snippets(ticker, company_name=company_name)
+        fetched = fetch_web_snippets(ticker, company_name=company_name)
+        # listicles and other-company pages out, most relevant first
+        snippets, relevance = filter_snippets(fetched, ticker, company_name)
+        if relevance["snippets_filtered"]:
+            logger.info(
+                f"[web_search] dropped {relevance['snippets_filtered']} of {len(fetched)} snippets for {ticker} "
+                f"as irrelevant (~{relevance['tokens_saved']} prompt tokens)"
+            )
 
         if not snippets:
             return {
                 "score": 0.0,
                 "label": "neutral",
-                "reasoning": "No web search results found.",
+                "reasoning": "No relevant web search results found." if fetched else "No web search results found.",
                 "snippets_analyzed": 0,
+                "no_data": True,
+                **relevance,
             }
 
-        snippets_text = "\n".join(f"- {s}" for s in snippets)
-        prompt = WEB_SENTIMENT_PROMPT.format(ticker=ticker, snippets=snippets_text)
-        result = gemini_client.generate_json(prompt)
+        snippets = fit(WEB_SENTIMENT_PROMPT, "snippets", snippets, ticker=ticker)
+        prompt = WEB_SENTIMENT_PROMPT.format(ticker=ticker, snippets=bullets(snippets))
+        result = score_locally(self.name, snippets) or memoized(
+            self.name, ticker, {"snippets": snippets},
+            lambda: gemini_client.generate_json(prompt), template=WEB_SENTIMENT_PROMPT,
+        )
 
         result["snippets_analyzed"] = len(snippets)
+        result.update(relevance)
         result["score"] = float(max(-1.0, min(1.0, result.get("score", 0.0))))
         return result
@@ -0,0 +1,338 @@
+"""
+Local stand-in for every HTTP upstream the pipeline talks to.
+
+benchmarks/fakes.py patches Python objects; this serves the same payloads
+over real sockets instead, so the requests sessions, the Finnhub SDK and
+the OpenAI / google-genai SDKs all run their actual HTTP code. Point the
+*_BASE_URL settings at it and the whole pipeline works on an air-gapped box:
+
+    python -m benchmarks.fake_server --port 9000 --latency llm=0.5
+    # prints the env lines to export, e.g.
+    FINVIZ_BASE_URL=http://127.0.0.1:9000/finviz
+    ...
+
+Routes (one port, one path prefix per upstream):
+    GET  /finviz/quote.ashx?t=X                          quote page HTML
+    GET  /duckduckgo/html/?q=...                         search results HTML
+    GET  /apewisdom/filter/all-stocks/page/N             trending JSON
+    GET  /finnhub/stock/recommendation?symbol=X          recommendation trends
+    GET  /finnhub/stock/price-target, /upgrade-downgrade 403 (free tier)
+    POST /openai/chat/completions                        OpenAI-compatible (groq, deepseek)
+    POST /gemini/{version}/models/{model}:generateContent
+
+Responses come from --fixtures DIR when a matching file exists
+(finviz/<TICKER>.html, duckduckgo/<query slug>.html, apewisdom/all-stocks.json,
+finnhub/<TICKER>.json) and from the seeded generators in fakes.py otherwise.
+Latency and 429 rates per source work exactly as in FakeConfig.
+
+Yahoo is not served: yfinance has no configurable endpoint, so
+install_fake_server() still patches yf.Ticker in-process.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import ExitStack, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fakes import (
+    FakeConfig, FakeUpstream, FakeYahooTicker, RateLimitError, SOURCES, _ScaledTime, cold_caches,
+    apewisdom_json, duckduckgo_html, fake_completion, finnhub_recommendations, finviz_html,
+    synthetic_universe,
+)
+
+logger = logging.getLogger(__name__)
+
+_FINNHUB_PAID = {"price-target", "upgrade-downgrade"}
+
+
+class FixtureStore:
+    """Optional directory of recorded responses, checked before the generators."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+
+    def get(self, source: str, key: str) -> Optional[str]:
+        if not self.root:
+            return None
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_")
+        for ext in ("html", "json"):
+            path = os.path.join(self.root, source, f"{slug}.{ext}")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        return None
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Routes by the first path segment; upstream/fixtures/universe live on the server."""
+
+    # keep-alive, so pooled sessions behave like they do against the real hosts
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeUpstream/1.0"
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        parsed = urlparse(self.path)
+        # the Finnhub SDK joins API_URL and path with a double slash
+        parts = [p for p in parsed.path.split("/") if p]
+        query = parse_qs(parsed.query)
+        body = self._read_body()
+        route = parts[0] if parts else ""
+        handler = getattr(self, f"_serve_{route}", None)
+        if handler is None:
+            self._send(404, "text/plain", f"No fake upstream for {parsed.path}")
+            return
+
+        source = "llm" if route in ("openai", "gemini") else route
+        try:
+            self.server.upstream.hit(source)
+        except RateLimitError:
+            self._send_rate_limited(route)
+            return
+        handler(parts[1:], query, body)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {}
+
+    # ---- per-upstream handlers ----
+
+    def _serve_finviz(self, parts, query, body):
+        ticker = query.get("t", ["?"])[0].upper()
+        html = self.server.fixtures.get("finviz", ticker) or finviz_html(ticker)
+        self._send(200, "text/html; charset=utf-8", html)
+
+    def _serve_duckduckgo(self, parts, query, body):
+        q = query.get("q", [""])[0]
+        html = self.server.fixtures.get("duckduckgo", q) or duckduckgo_html(q)
+        self._send(200, "text/html; charset=utf-8", html)
+
+    def _serve_apewisdom(self, parts, query, body):
+        page = self.server.fixtures.get("apewisdom", "all-stocks")
+        self._send(200, "application/json", page or json.dumps(apewisdom_json(self.server.universe)))
+
+    def _serve_finnhub(self, parts, query, body):
+        endpoint = parts[-1] if parts else ""
+        if endpoint in _FINNHUB_PAID:
+            self._send(403, "application/json", json.dumps({"error": "You don't have access to this resource."}))
+            return
+        if endpoint != "recommendation":
+            self._send(404, "application/json", json.dumps({"error": f"Unknown endpoint {endpoint}"}))
+            return
+        symbol = query.get("symbol", ["?"])[0].upper()
+        payload = self.server.fixtures.get("finnhub", symbol)
+        if payload is None:
+            payload = json.dumps(finnhub_recommendations(symbol))
+        self._send(200, "application/json", payload)
+
+    def _serve_openai(self, parts, query, body):
+        messages = body.get("messages") or [{"content": ""}]
+        prompt = messages[-1].get("content", "")
+        text = fake_completion(prompt)
+        self._send(200, "application/json", json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(text) // 4,
+                "total_tokens": (len(prompt) + len(text)) // 4,
+            },
+        }))
+
+    def _serve_gemini(self, parts, query, body):
+        contents = body.get("contents") or []
+        prompt = "".join(
+            part.get("text", "")
+            for content in contents for part in content.get("parts", [])
+        )
+        text = fake_completion(prompt)
+        self._send(200, "application/json", json.dumps({
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4,
+            },
+        }))
+
+    # ---- plumbing ----
+
+    def _send_rate_limited(self, route: str):
+        if route == "gemini":
+            payload = {"error": {"code": 429, "message": "Resource exhausted.", "status": "RESOURCE_EXHAUSTED"}}
+        elif route == "openai":
+            payload = {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded", "code": "rate_limit_exceeded"}}
+        else:
+            payload = {"error": "Too Many Requests"}
+        self._send(429, "application/json", json.dumps(payload))
+
+    def _send(self, code: int, content_type: str, text: str):
+        body = text.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], upstream: FakeUpstream,
+                 universe: list[str], fixtures: FixtureStore = None):
+        super().__init__(address, FakeUpstreamHandler)
+        self.upstream = upstream
+        self.universe = universe
+        self.fixtures = fixtures or FixtureStore()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def base_url_settings(base_url: str) -> dict:
+    """The settings overrides that point every configurable upstream at `base_url`."""
+    return {
+        "finviz_base_url": f"{base_url}/finviz",
+        "duckduckgo_base_url": f"{base_url}/duckduckgo",
+        "apewisdom_base_url": f"{base_url}/apewisdom",
+        "finnhub_base_url": f"{base_url}/finnhub",
+        "groq_base_url": f"{base_url}/openai",
+        "deepseek_base_url": f"{base_url}/openai",
+        "gemini_base_url": f"{base_url}/gemini",
+    }
+
+
+@contextmanager
+def install_fake_server(config: FakeConfig, universe: list[str] = None, fixtures: Optional[str] = None):
+    """
+    Start a FakeUpstreamServer on an ephemeral port and point the pipeline
+    at it for the duration of the block. Like install_fakes() but every
+    call goes over a real socket. Yields the FakeUpstream.
+    """
+    from config.settings import settings
+    from data import analyst_fetcher, news_fetcher
+    from agents import web_sentiment_agent
+    from models import gemini_client as llm_module
+
+    upstream = FakeUpstream(config)
+    server = FakeUpstreamServer(("127.0.0.1", 0), upstream, universe or [], FixtureStore(fixtures))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+
+    yahoo_ticker = type("FakeYahooTicker", (FakeYahooTicker,), {"upstream": upstream})
+    overrides = {
+        **base_url_settings(server.base_url),
+        "llm_provider": config.provider,
+        "finnhub_api_key": "fake",
+        f"{config.provider}_api_key": "fake",
+    }
+    try:
+        with ExitStack() as stack:
+            for name, value in overrides.items():
+                stack.enter_context(patch.object(settings, name, value))
+            # drop cached SDK clients so they get rebuilt against the fake URLs
+            stack.enter_context(patch.object(analyst_fetcher, "_client", None))
+            stack.enter_context(patch.object(llm_module.gemini_client, "provider", config.provider))
+            stack.enter_context(patch.object(llm_module.gemini_client, "_client", None))
+            stack.enter_context(patch.object(llm_module.gemini_client, "_model", None))
+            stack.enter_context(patch.object(llm_module, "time", _ScaledTime(config.backoff_scale)))
+            stack.enter_context(patch.object(news_fetcher.yf, "Ticker", yahoo_ticker))
+            stack.enter_context(patch.object(web_sentiment_agent.yf, "Ticker", yahoo_ticker))
+            stack.enter_context(cold_caches())
+            yield upstream
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def worker_fakes(config: dict) -> None:
+    """
+    Setup hook for process-pool workers (service/process_pool.py) pointed at
+    a FakeUpstreamServer: yfinance has no base URL to redirect, so each
+    worker patches it -- and scales the LLM backoff -- for itself. Yahoo
+    calls made in workers don't show up in the parent's upstream stats.
+    """
+    from data import news_fetcher
+    from agents import web_sentiment_agent
+    from models import gemini_client as llm_module
+
+    config = FakeConfig(**config)
+    yahoo_ticker = type("FakeYahooTicker", (FakeYahooTicker,), {"upstream": FakeUpstream(config)})
+    # never stopped: the patches live as long as the worker process
+    patch.object(news_fetcher.yf, "Ticker", yahoo_ticker).start()
+    patch.object(web_sentiment_agent.yf, "Ticker", yahoo_ticker).start()
+    patch.object(llm_module, "time", _ScaledTime(config.backoff_scale)).start()
+
+
+def main(argv=None):
+    from benchmarks.run_benchmark import _parse_pairs
+
+    parser = argparse.ArgumentParser(description="Serve fake Finviz/DuckDuckGo/ApeWisdom/Finnhub/LLM endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--universe", type=int, default=100, help="Synthetic tickers on the ApeWisdom page")
+    parser.add_argument("--fixtures", help="Directory of recorded responses to serve when present")
+    parser.add_argument("--latency", nargs="*", metavar="SOURCE=SECONDS")
+    parser.add_argument("--rate-429", nargs="*", metavar="SOURCE=P")
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    config = FakeConfig(
+        latency=_parse_pairs(args.latency, "--latency"),
+        rate_429=_parse_pairs(args.rate_429, "--rate-429"),
+        jitter=args.jitter,
+        seed=args.seed,
+    )
+    server = FakeUpstreamServer(
+        (args.host, args.port), FakeUpstream(config),
+        synthetic_universe(args.universe), FixtureStore(args.fixtures),
+    )
+    print("# point the pipeline here:")
+    for name, value in base_url_settings(server.base_url).items():
+        print(f"{name.upper()}={value}")
+    print(f"# serving {', '.join(s for s in SOURCES if not s.startswith('yahoo'))} -- Ctrl+C to stop", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
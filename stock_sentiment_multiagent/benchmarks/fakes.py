@@ -0,0 +1,443 @@
+"""
+Latency-injecting stand-ins for every external dependency of the pipeline.
+
+The unit tests mock agents to return instantly, which is fine for
+correctness but says nothing about scheduling. These fakes sit at the
+lowest layer instead -- the HTTP session, yfinance, the Finnhub client
+and the LLM SDK client -- so the real fetchers, parsers, agents, retry
+logic and graph all run, and only the network is simulated:
+
+    finviz       quote page with a news table           (data.http_client session)
+    duckduckgo   HTML results page                      (data.http_client session)
+    apewisdom    JSON "all-stocks" page                 (data.http_client session)
+    yahoo_news   yf.Ticker(...).news                    (yfinance proxy)
+    yahoo_info   yf.Ticker(...).info                    (yfinance proxy)
+    finnhub      recommendation_trends / price_target / upgrade_downgrade
+    llm          OpenAI-compatible (groq, deepseek) or Gemini client
+
+Each source has a latency (mean seconds, with multiplicative jitter) and
+a 429 rate. Randomness is seeded, so runs with the same config produce
+the same responses.
+
+    with install_fakes(FakeConfig(latency={"llm": 0.2}, rate_429={"llm": 0.05})):
+        OrchestratorAgent().run("AAPL")
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+# typical production latencies (seconds), roughly what we see from a laptop
+DEFAULT_LATENCY = {
+    "finviz": 0.30,
+    "duckduckgo": 0.35,
+    "apewisdom": 0.20,
+    "yahoo_news": 0.25,
+    "yahoo_info": 0.40,
+    "finnhub": 0.15,
+    "llm": 0.90,
+}
+
+SOURCES = tuple(DEFAULT_LATENCY)
+
+# keep a handle on the real sleep -- simulated latency must never be scaled
+_real_sleep = time.sleep
+
+
+class FakeConfig:
+    """
+    latency:       {source: mean seconds}, missing sources use DEFAULT_LATENCY
+    rate_429:      {source: probability a call answers 429}
+    jitter:        latency is scaled by a factor drawn from [1 - jitter, 1 + jitter]
+    provider:      which LLM SDK shape to fake: "groq", "deepseek" or "gemini"
+    backoff_scale: multiplies LLMClient's 429 backoff sleeps (5-60 s in real life)
+                   so rate-limit scenarios finish in reasonable time
+    tail_rate:     {source: probability a call is a tail-latency outlier}
+    tail_factor:   outliers take this many times the source's latency
+    """
+
+    def __init__(
+        self,
+        latency: dict = None,
+        rate_429: dict = None,
+        jitter: float = 0.3,
+        provider: str = "groq",
+        backoff_scale: float = 0.01,
+        seed: int = 7,
+        tail_rate: dict = None,
+        tail_factor: float = 10.0,
+    ):
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.rate_429 = {source: 0.0 for source in SOURCES}
+        self.rate_429.update(rate_429 or {})
+        self.jitter = jitter
+        self.provider = provider
+        self.backoff_scale = backoff_scale
+        self.seed = seed
+        self.tail_rate = {source: 0.0 for source in SOURCES}
+        self.tail_rate.update(tail_rate or {})
+        self.tail_factor = tail_factor
+
+    def as_dict(self) -> dict:
+        return {
+            "latency": self.latency,
+            "rate_429": self.rate_429,
+            "jitter": self.jitter,
+            "provider": self.provider,
+            "backoff_scale": self.backoff_scale,
+            "seed": self.seed,
+            "tail_rate": self.tail_rate,
+            "tail_factor": self.tail_factor,
+        }
+
+
+class RateLimitError(Exception):
+    """Raised by the fakes in place of an HTTP 429."""
+
+
+class FakeTimeout(TimeoutError):
+    """The simulated response would have taken longer than the caller's timeout."""
+
+
+class FakeUpstream:
+    """Shared latency / 429 behaviour plus per-source call counters."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.calls = {source: 0 for source in SOURCES}
+        self.rate_limited = {source: 0 for source in SOURCES}
+
+    def hit(self, source: str, timeout: float = None) -> None:
+        """Sleep for the source's latency, then maybe raise a 429. Honors a read timeout."""
+        with self._lock:
+            self.calls[source] += 1
+            factor = 1 + self._rng.uniform(-self.config.jitter, self.config.jitter)
+            if self._rng.random() < self.config.tail_rate.get(source, 0.0):
+                factor *= self.config.tail_factor
+            limited = self._rng.random() < self.config.rate_429.get(source, 0.0)
+            if limited:
+                self.rate_limited[source] += 1
+        latency = max(0.0, self.config.latency[source] * factor)
+        if timeout is not None and latency > timeout:
+            _real_sleep(timeout)
+            raise FakeTimeout(f"{source} took longer than {timeout}s")
+        _real_sleep(latency)
+        if limited:
+            raise RateLimitError(f"429 Too Many Requests ({source})")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": dict(self.calls), "rate_limited": dict(self.rate_limited)}
+
+
+def synthetic_universe(n: int) -> list[str]:
+    """Deterministic fake tickers: TA, TB, ..., TAA, TAB, ..."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    tickers = []
+    i = 0
+    while len(tickers) < n:
+        name, k = "", i
+        while True:
+            name = letters[k % 26] + name
+            k = k // 26 - 1
+            if k < 0:
+                break
+        tickers.append("T" + name)
+        i += 1
+    return tickers
+
+
+def _seeded(*parts) -> random.Random:
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+# ---- canned payloads ----
+
+_HEADLINE_TEMPLATES = [
+    "{t} beats quarterly earnings estimates as revenue climbs {n}%",
+    "Analysts raise {t} price target after strong guidance",
+    "{t} shares slip as regulators open new probe",
+    "{t} announces ${n}B buyback program",
+    "Why {t} stock is moving today",
+    "{t} faces supply chain headwinds heading into Q{q}",
+    "Hedge funds trimmed {t} stakes last quarter, filings show",
+    "{t} unveils new product line at annual event",
+    "{t} CFO to step down at end of year",
+    "Options traders bet on {t} volatility ahead of earnings",
+]
+
+
+def finviz_html(ticker: str) -> str:
+    rng = _seeded("finviz", ticker)
+    rows = []
+    for i in range(12):
+        headline = rng.choice(_HEADLINE_TEMPLATES).format(t=ticker, n=rng.randint(2, 40), q=rng.randint(1, 4))
+        rows.append(
+            f'<tr><td align="right">Oct-{10 + i % 9:02d}-26 0{i % 9}:30AM</td>'
+            f'<td align="left"><div class="news-link-container"><div class="news-link-left">'
+            f'<a class="tab-link-news" href="https://news.example/{ticker}/{i}">{headline} #{i}</a>'
+            f'</div></div></td></tr>'
+        )
+    filler = "<div class='filler'>" + ("<span>quote data</span>" * 400) + "</div>"
+    return (
+        f"<html><head><title>{ticker} Stock Quote</title></head><body>{filler}"
+        f'<table id="news-table" class="fullview-news-outer">{"".join(rows)}</table>'
+        f"</body></html>"
+    )
+
+
+def duckduckgo_html(query: str) -> str:
+    rng = _seeded("ddg", query)
+    results = []
+    for i in range(10):
+        results.append(
+            f'<div class="result results_links results_links_deep web-result"><div class="links_main links_deep result__body">'
+            f'<h2 class="result__title"><a class="result__a" href="https://site{i}.example/">'
+            f'{query.split()[0]} outlook piece {i}</a></h2>'
+            f'<a class="result__snippet" href="https://site{i}.example/">'
+            f'Analysts see {rng.choice(["upside", "downside", "mixed signals"])} for {query.split()[0]} '
+            f'with a price target of ${rng.randint(50, 500)} over the next {rng.randint(3, 18)} months.</a>'
+            f"</div></div>"
+        )
+    return f"<html><body><div id='links'>{''.join(results)}</div></body></html>"
+
+
+def apewisdom_json(universe: list[str]) -> dict:
+    rng = _seeded("apewisdom", len(universe))
+    results = []
+    for rank, ticker in enumerate(universe[:100], start=1):
+        results.append({
+            "rank": rank,
+            "ticker": ticker,
+            "name": f"{ticker} Inc.",
+            "mentions": rng.randint(5, 900),
+            "upvotes": rng.randint(10, 5000),
+            "rank_24h_ago": max(1, rank + rng.randint(-20, 20)),
+            "mentions_24h_ago": rng.randint(5, 900),
+        })
+    return {"count": len(results), "pages": 1, "currentPage": 1, "results": results}
+
+
+def finnhub_recommendations(ticker: str) -> list[dict]:
+    rng = _seeded("finnhub", ticker)
+    return [{
+        "symbol": ticker, "period": "2026-10-01", "strongBuy": rng.randint(0, 15), "buy": rng.randint(0, 20),
+        "hold": rng.randint(0, 15), "sell": rng.randint(0, 5), "strongSell": rng.randint(0, 3),
+    }]
+
+
+class FakeResponse:
+    def __init__(self, text: str = "", status_code: int = 200, url: str = ""):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class FakeHTTP:
+    """Stands in for the requests.Session behind data.http_client; routes by host."""
+
+    def __init__(self, upstream: FakeUpstream, universe: list[str]):
+        self.upstream = upstream
+        self.universe = universe
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        parsed = urlparse(url)
+        host = parsed.netloc
+        if "finviz" in host:
+            source = "finviz"
+        elif "duckduckgo" in host:
+            source = "duckduckgo"
+        elif "apewisdom" in host:
+            source = "apewisdom"
+        else:
+            raise ConnectionError(f"Fake HTTP has no route for {url}")
+
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+        try:
+            self.upstream.hit(source, timeout=timeout)
+        except RateLimitError:
+            return FakeResponse("Too Many Requests", status_code=429, url=url)
+        except FakeTimeout as e:
+            import requests
+            raise requests.ReadTimeout(str(e))
+
+        if source == "finviz":
+            ticker = parse_qs(parsed.query).get("t", ["?"])[0]
+            return FakeResponse(finviz_html(ticker), url=url)
+        if source == "duckduckgo":
+            query = parse_qs(parsed.query).get("q", [""])[0]
+            return FakeResponse(duckduckgo_html(query), url=url)
+        return FakeResponse(json.dumps(apewisdom_json(self.universe)), url=url)
+
+
+class FakeYahooTicker:
+    """Stands in for yfinance.Ticker: .news and .info each cost one round trip."""
+
+    upstream: FakeUpstream = None
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+    @property
+    def news(self):
+        self.upstream.hit("yahoo_news")
+        rng = _seeded("yahoo", self.ticker)
+        return [
+            {"content": {"title": rng.choice(_HEADLINE_TEMPLATES).format(t=self.ticker, n=i, q=1) + f" (Yahoo {i})"}}
+            for i in range(8)
+        ]
+
+    @property
+    def info(self):
+        self.upstream.hit("yahoo_info")
+        return {"shortName": f"{self.ticker} Holdings Inc.", "longName": f"{self.ticker} Holdings Incorporated"}
+
+
+class FakeFinnhubClient:
+    def __init__(self, upstream: FakeUpstream):
+        self.upstream = upstream
+
+    def recommendation_trends(self, ticker):
+        self.upstream.hit("finnhub")
+        return finnhub_recommendations(ticker)
+
+    def price_target(self, ticker):
+        # free tier: paid endpoints answer 403 after a round trip
+        self.upstream.hit("finnhub")
+        raise Exception("FinnhubAPIException(status_code: 403): You don't have access to this resource.")
+
+    def upgrade_downgrade(self, symbol=None):
+        self.upstream.hit("finnhub")
+        raise Exception("FinnhubAPIException(status_code: 403): You don't have access to this resource.")
+
+
+def fake_completion(prompt: str) -> str:
+    """Plausible JSON answer for whichever prompt template this is."""
+    rng = _seeded("llm", prompt)
+    if '"bull_case"' in prompt:
+        return json.dumps({
+            "bull_case": "Analyst consensus and earnings momentum support upside.",
+            "bear_case": "Regulatory risk and mixed web coverage temper the outlook.",
+            "resolution": "Bull case has more concrete, data-backed support.",
+            "key_drivers": ["analyst consensus", "earnings", "regulation"],
+        })
+    if '"summary"' in prompt:
+        return json.dumps({"ticker": "?", "sentiment": "POSITIVE", "confidence": 0.6,
+                           "summary": "Sentiment is moderately positive across sources."})
+    score = round(rng.uniform(-0.8, 0.9), 2)
+    label = "positive" if score > 0.3 else "negative" if score < -0.3 else "neutral"
+    return json.dumps({"score": score, "label": label, "reasoning": "Synthetic benchmark reasoning.",
+                       "key_themes": ["earnings"]})
+
+
+class FakeOpenAIClient:
+    """Shape of openai.OpenAI that LLMClient._generate_openai uses."""
+
+    def __init__(self, upstream: FakeUpstream):
+        self.upstream = upstream
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature=0.3, **kwargs):
+        try:
+            self.upstream.hit("llm")
+        except RateLimitError:
+            raise Exception("Error code: 429 - rate_limit_exceeded")
+        prompt = messages[-1]["content"]
+        text = fake_completion(prompt)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(text) // 4),
+        )
+
+
+class FakeGeminiClient:
+    """Shape of google.genai.Client that LLMClient._generate_gemini uses."""
+
+    def __init__(self, upstream: FakeUpstream):
+        self.upstream = upstream
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+
+    def _generate_content(self, model, contents, **kwargs):
+        try:
+            self.upstream.hit("llm")
+        except RateLimitError:
+            raise Exception("429 RESOURCE_EXHAUSTED")
+        text = fake_completion(contents)
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(prompt_token_count=len(contents) // 4, candidates_token_count=len(text) // 4),
+        )
+
+
+class _ScaledTime:
+    """Stand-in for the `time` module inside LLMClient: same API, but sleep() is scaled."""
+
+    def __init__(self, scale: float):
+        self._scale = scale
+
+    def sleep(self, seconds: float) -> None:
+        _real_sleep(seconds * self._scale)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@contextmanager
+def cold_caches():
+    """
+    Point the negative cache and the node memo store at empty temp files, so
+    a benchmark mode doesn't inherit earlier runs' misses or LLM results.
+    """
+    from config.settings import settings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch.object(settings, "negative_cache_path", os.path.join(tmp, "negative_cache.sqlite")), \
+                patch.object(settings, "memo_path", os.path.join(tmp, "memo.sqlite")):
+            yield
+
+
+@contextmanager
+def install_fakes(config: FakeConfig, universe: list[str] = None):
+    """Patch every external dependency with a fake for the duration of the block. Yields the FakeUpstream."""
+    from data import analyst_fetcher, http_client, news_fetcher
+    from agents import web_sentiment_agent
+    from models import gemini_client as llm_module
+
+    upstream = FakeUpstream(config)
+    http = FakeHTTP(upstream, universe or [])
+    yahoo_ticker = type("FakeYahooTicker", (FakeYahooTicker,), {"upstream": upstream})
+    llm_client = FakeGeminiClient(upstream) if config.provider == "gemini" else FakeOpenAIClient(upstream)
+
+    with ExitStack() as stack:
+        # swap the session, not http_client.get, so cassettes and breakers still run
+        stack.enter_context(patch.object(http_client, "get_session", lambda: http))
+        stack.enter_context(patch.object(news_fetcher.yf, "Ticker", yahoo_ticker))
+        stack.enter_context(patch.object(web_sentiment_agent.yf, "Ticker", yahoo_ticker))
+        stack.enter_context(patch.object(analyst_fetcher, "_get_client", lambda: FakeFinnhubClient(upstream)))
+        stack.enter_context(patch.object(llm_module.gemini_client, "provider", config.provider))
+        stack.enter_context(patch.object(llm_module.gemini_client, "_client", llm_client))
+        stack.enter_context(patch.object(llm_module.gemini_client, "_model", "fake-model"))
+        stack.enter_context(patch.object(llm_module, "time", _ScaledTime(config.backoff_scale)))
+        stack.enter_context(cold_caches())
+        yield upstream
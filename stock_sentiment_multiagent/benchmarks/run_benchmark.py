@@ -0,0 +1,247 @@
+"""
+Offline throughput benchmark for the full pipeline.
+
+Runs N synthetic tickers through the real graph with every external
+dependency replaced by the latency-injecting fakes in benchmarks/fakes.py,
+once per execution mode, and reports per-ticker latency percentiles,
+throughput, 429/retry counts and peak RSS as JSON.
+
+    python -m benchmarks.run_benchmark --tickers 50
+    python -m benchmarks.run_benchmark --tickers 200 --modes sequential thread-pool --concurrency 8
+    python -m benchmarks.run_benchmark --latency llm=0.2 --rate-429 llm=0.05 --out results.json
+    python -m benchmarks.run_benchmark --transport http   # through the local fake_server
+
+Modes:
+    sequential   one OrchestratorAgent.run after another -- what `main.py --ticker A B C` does
+    thread-pool  N concurrent OrchestratorAgent.run calls, the way the
+                 serve/daemon modes run overlapping requests
+    process-pool N worker processes (service/process_pool.py), what
+                 `main.py --ticker ... --workers N` does. Always runs over
+                 --transport http, since workers can't see in-process patches.
+
+Each mode runs in a fresh interpreter (a child `--in-process` run of this
+script), so its peak_rss_mb is its own: ru_maxrss is a high-water mark for
+the whole process, and modes run one after another in one process would
+each report the largest peak so far. --in-process runs every mode here,
+which is quicker but makes peak_rss_mb cumulative.
+
+Add a new execution mode by writing a `_mode_<name>(tickers, args, config)`
+function that returns {ticker: seconds} and listing it in MODES.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.fakes import FakeConfig, SOURCES, install_fakes, synthetic_universe
+from telemetry import metrics
+from telemetry.spans import _percentile
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _timed_run(orchestrator, ticker: str) -> float:
+    started = time.perf_counter()
+    orchestrator.run(ticker)
+    return time.perf_counter() - started
+
+
+def _mode_sequential(tickers: list[str], args, config: FakeConfig) -> dict:
+    from agents.orchestrator_agent import OrchestratorAgent
+    orchestrator = OrchestratorAgent()
+    return {ticker: _timed_run(orchestrator, ticker) for ticker in tickers}
+
+
+def _mode_thread_pool(tickers: list[str], args, config: FakeConfig) -> dict:
+    from agents.orchestrator_agent import OrchestratorAgent
+    orchestrator = OrchestratorAgent()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        durations = pool.map(lambda t: _timed_run(orchestrator, t), tickers)
+        return dict(zip(tickers, durations))
+
+
+def _mode_process_pool(tickers: list[str], args, config: FakeConfig) -> dict:
+    from benchmarks.fake_server import worker_fakes
+    from service.process_pool import scan
+
+    setup = functools.partial(worker_fakes, config.as_dict())
+    # wall time per ticker as the worker measured it (no queueing)
+    return {
+        ticker: response["report"]["timings"]["total_seconds"] if response["ok"] else float("nan")
+        for ticker, response in scan(tickers, args.concurrency, setup=setup)
+    }
+
+
+MODES = {
+    "sequential": _mode_sequential,
+    "thread-pool": _mode_thread_pool,
+    "process-pool": _mode_process_pool,
+}
+
+# modes whose work happens in other processes, so in-process patches can't reach it
+_OUT_OF_PROCESS = {"process-pool"}
+
+
+def _peak_rss_mb() -> float:
+    # this process's (and its reaped children's) high-water mark, so only per-mode in a per-mode child
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max(self_rss, child_rss) / divisor, 1)
+
+
+def _latency_summary(durations: list[float]) -> dict:
+    ordered = sorted(durations)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": round(_percentile(ordered, 50), 4),
+        "p90": round(_percentile(ordered, 90), 4),
+        "p95": round(_percentile(ordered, 95), 4),
+        "p99": round(_percentile(ordered, 99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def _install(transport: str, config: FakeConfig, tickers: list[str]):
+    if transport == "http":
+        from benchmarks.fake_server import install_fake_server
+        return install_fake_server(config, universe=tickers)
+    return install_fakes(config, universe=tickers)
+
+
+def run_mode(mode: str, tickers: list[str], config: FakeConfig, args) -> dict:
+    """Run one execution mode under fresh fakes and return its results block."""
+    metrics.registry.reset()
+    transport = "http" if mode in _OUT_OF_PROCESS else args.transport
+    with _install(transport, config, tickers) as upstream:
+        started = time.perf_counter()
+        durations = MODES[mode](tickers, args, config)
+        wall = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "tickers": len(tickers),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_minute": round(len(tickers) / wall * 60, 2) if wall else None,
+        "latency_seconds": _latency_summary(list(durations.values())),
+        "upstream": upstream.stats(),
+        "llm_rate_limited": metrics.LLM_RATE_LIMITED.total(),
+        "http_timeout_retries": metrics.HTTP_TIMEOUT_RETRIES.total(),
+        "agent_failures": metrics.AGENT_FAILURES.total(),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _without(argv: list[str], flags: set) -> list[str]:
+    # drop each of `flags` along with its values (everything up to the next --option)
+    kept, skipping = [], False
+    for token in argv:
+        if token.startswith("--"):
+            skipping = token.split("=", 1)[0] in flags
+        if not skipping:
+            kept.append(token)
+    return kept
+
+
+def run_mode_isolated(mode: str, argv: list[str]) -> dict:
+    """run_mode() in a child interpreter, so the mode's peak RSS isn't mixed with the others'."""
+    child_argv = _without(argv, {"--modes", "--out", "--in-process"}) + ["--modes", mode, "--in-process"]
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run_benchmark", *child_argv],
+        cwd=MODULE_ROOT, stdout=subprocess.PIPE, text=True, check=True,
+    )
+    return json.loads(proc.stdout)["modes"][0]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=MODULE_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _parse_pairs(pairs: list[str], flag: str) -> dict:
+    parsed = {}
+    for pair in pairs or []:
+        source, _, value = pair.partition("=")
+        if source not in SOURCES or not value:
+            raise SystemExit(f"{flag} expects SOURCE=VALUE with SOURCE in {', '.join(SOURCES)}, got {pair!r}")
+        parsed[source] = float(value)
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark with simulated upstreams")
+    parser.add_argument("--tickers", type=int, default=20, help="Number of synthetic tickers")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--concurrency", type=int, default=4, help="Workers for pooled modes")
+    parser.add_argument("--latency", nargs="*", metavar="SOURCE=SECONDS", help="Override mean latency per source")
+    parser.add_argument("--rate-429", nargs="*", metavar="SOURCE=P", help="Probability of a 429 per source")
+    parser.add_argument("--tail-rate", nargs="*", metavar="SOURCE=P",
+                        help="Probability per source of a tail-latency outlier (--tail-factor x latency)")
+    parser.add_argument("--tail-factor", type=float, default=10.0)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--provider", default="groq", choices=["groq", "deepseek", "gemini"])
+    parser.add_argument("--backoff-scale", type=float, default=0.01,
+                        help="Scale LLMClient's 429 backoff sleeps (1.0 = real time)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--transport", default="patch", choices=["patch", "http"],
+                        help="patch: in-process fakes; http: real sockets to benchmarks/fake_server.py")
+    parser.add_argument("--out", help="Also write the JSON results to this file")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every mode in this process (faster; peak_rss_mb becomes cumulative)")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(argv)
+
+    # keep the per-node INFO logging out of the timing loop
+    logging.basicConfig(level=logging.WARNING)
+
+    config = FakeConfig(
+        latency=_parse_pairs(args.latency, "--latency"),
+        rate_429=_parse_pairs(args.rate_429, "--rate-429"),
+        jitter=args.jitter,
+        provider=args.provider,
+        backoff_scale=args.backoff_scale,
+        seed=args.seed,
+        tail_rate=_parse_pairs(args.tail_rate, "--tail-rate"),
+        tail_factor=args.tail_factor,
+    )
+    tickers = synthetic_universe(args.tickers)
+
+    results = {
+        "benchmark": "pipeline",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {**config.as_dict(), "tickers": args.tickers, "concurrency": args.concurrency,
+                   "transport": args.transport},
+        "modes": [
+            run_mode(mode, tickers, config, args) if args.in_process else run_mode_isolated(mode, argv)
+            for mode in args.modes
+        ],
+    }
+
+    payload = json.dumps(results, indent=2)
+    print(payload)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(payload)
+
+
+if __name__ == "__main__":
+    main()
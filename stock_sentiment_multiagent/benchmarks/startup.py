@@ -0,0 +1,116 @@
+"""
+Startup benchmark for the CLI.
+
+Imports `main` in a fresh interpreter with `-X importtime`, several times,
+and reports how long the import took plus which heavy third-party
+packages got loaded along the way. Those packages (langgraph, yfinance,
+pandas, bs4, finnhub, the LLM SDKs) should only be imported when a run
+actually needs them, so any of them showing up here is a regression.
+
+    python -m benchmarks.startup                 # human-readable
+    python -m benchmarks.startup --json          # machine-readable
+    python -m benchmarks.startup --budget 0.4    # exit 1 if over budget
+
+tests/integration/test_startup.py runs the same check with the default budget.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import-time budget for `import main`, in seconds (override with STARTUP_BUDGET_SECONDS)
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "0.6"))
+
+HEAVY_MODULES = [
+    "langgraph", "langchain_core", "yfinance", "pandas", "numpy",
+    "bs4", "finnhub", "requests", "openai", "google.genai",
+]
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+
+def _measure_once(module: str) -> dict:
+    code = (
+        f"import json, sys\n"
+        f"import {module}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=MODULE_ROOT, capture_output=True, text=True, check=True,
+    )
+    imports = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            _, cumulative_us, indent, name = match.groups()
+            # the top-level entry (no indent) for a name wins
+            if name not in imports or not indent:
+                imports[name] = int(cumulative_us)
+    return {
+        "import_seconds": imports.get(module, 0) / 1e6,
+        "heavy_modules_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "imports_us": imports,
+    }
+
+
+def measure_startup(module: str = "main", runs: int = 5) -> dict:
+    """Import `module` `runs` times in fresh interpreters and summarize."""
+    samples = [_measure_once(module) for _ in range(runs)]
+    times = sorted(s["import_seconds"] for s in samples)
+    heavy = sorted({m for s in samples for m in s["heavy_modules_loaded"]})
+
+    # cumulative time per package (nested packages are counted in their parent too)
+    packages = [
+        (name, us) for name, us in samples[-1]["imports_us"].items()
+        if name != module and "." not in name
+    ]
+    packages.sort(key=lambda kv: kv[1], reverse=True)
+
+    return {
+        "module": module,
+        "runs": runs,
+        "median_seconds": round(statistics.median(times), 4),
+        "min_seconds": round(times[0], 4),
+        "max_seconds": round(times[-1], 4),
+        "budget_seconds": STARTUP_BUDGET_SECONDS,
+        "heavy_modules_loaded": heavy,
+        "package_imports_ms": {name: round(us / 1000, 1) for name, us in packages[:10]},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure CLI import time")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.module, args.runs)
+    result["budget_seconds"] = args.budget
+    over_budget = result["median_seconds"] > args.budget
+    result["passed"] = not over_budget and not result["heavy_modules_loaded"]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import {args.module}: median {result['median_seconds']:.3f}s "
+              f"(min {result['min_seconds']:.3f}s, max {result['max_seconds']:.3f}s, "
+              f"budget {args.budget:.3f}s)")
+        for name, ms in result["package_imports_ms"].items():
+            print(f"  {name:<24} {ms:>8.1f} ms")
+        if result["heavy_modules_loaded"]:
+            print(f"eagerly imported: {', '.join(result['heavy_modules_loaded'])}")
+
+    sys.exit(0 if result["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -118,6 +118,44 @@ Return a JSON object with exactly these fields:
 Respond with ONLY the JSON object, no markdown, no extra text."""
 
 
+# structured debate (DEBATE_MODE=structured): two advocates argue in parallel, then a judge decides
+DEBATE_ADVOCATE_PROMPT = """You are the {side} advocate in a sentiment debate for stock ticker {ticker}.
+
+The following specialized agents have produced these sentiment readings:
+{agent_results}
+{rebuttal}
+Make the strongest {stance} case you honestly can from this evidence. Cite specific data points from the agent outputs and do not invent any.
+
+Return a JSON object with exactly this field:
+- "argument": string (1-2 sentences)
+
+Respond with ONLY the JSON object, no markdown, no extra text."""
+
+
+DEBATE_REBUTTAL = """
+The opposing advocate argued:
+{argument}
+
+Answer their strongest point directly.
+"""
+
+
+DEBATE_JUDGE_PROMPT = """You are a senior financial analyst judging a sentiment debate for stock ticker {ticker}.
+
+Agent readings: {agent_results}
+
+Bull case: {bull_case}
+Bear case: {bear_case}
+
+Weigh the two: which side has more concrete, data-backed support?
+
+Return a JSON object with exactly these fields:
+- "resolution": string (1 sentence, state which side wins and why)
+- "key_drivers": list of up to 3 short strings naming the most important sentiment drivers
+
+Respond with ONLY the JSON object, no markdown, no extra text."""
+
+
 SUMMARY_PROMPT = """You are a senior investment analyst. Summarize the overall market sentiment for stock ticker {ticker}.
 
 Sentiment Score: {sentiment_score} (range: -1.0 to 1.0)
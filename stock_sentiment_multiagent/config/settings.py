@@ -5,7 +5,7 @@ via the LLM_PROVIDER environment variable.
 """
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -27,6 +27,105 @@ class Settings(BaseSettings):
     deepseek_model: str = "deepseek-chat"
     gemini_model: str = "gemini-2.0-flash"
 
+    # upstream endpoints. the defaults are the real services; point them at
+    # a local stand-in (python -m benchmarks.fake_server) to run the whole
+    # pipeline offline. gemini_base_url=None keeps the SDK's own default.
+    finviz_base_url: str = "https://finviz.com"
+    duckduckgo_base_url: str = "https://html.duckduckgo.com"
+    apewisdom_base_url: str = "https://apewisdom.io/api/v1.0"
+    finnhub_base_url: str = "https://api.finnhub.io/api/v1"
+    groq_base_url: str = "https://api.groq.com/openai/v1"
+    deepseek_base_url: str = "https://api.deepseek.com"
+    gemini_base_url: Optional[str] = None
+
+    # circuit breakers per upstream host (data/circuit_breaker.py): open after
+    # this many consecutive failures, probe again after breaker_reset_seconds
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 60.0
+
+    # scraper/API request timeouts (data/adaptive_timeout.py): learned per host
+    # from recent latency percentiles and kept within [min, max]; hosts
+    # without enough history get the default
+    http_timeout_min: float = 0.5
+    http_timeout_max: float = 20.0
+    http_timeout_default: float = 10.0
+
+    # negative cache (data/negative_cache.py): a source that answered with no
+    # data for a ticker (not on ApeWisdom, no Finnhub coverage, no Finviz
+    # news) is skipped for that ticker, LLM call included, for this long.
+    # 0 disables it.
+    negative_cache_ttl_seconds: int = 21600
+    negative_cache_path: str = "./output/negative_cache.sqlite"
+
+    # time budget in seconds for a `main.py --ticker ...` invocation, shared by
+    # all its tickers (utils/deadline.py); 0 = no limit. --deadline overrides it
+    run_deadline_seconds: float = 0.0
+
+    # client-side pacing per API key (utils/rate_limit.py), shared by all
+    # processes of a --workers run; 0 = no pacing. Free tiers: Finnhub 60,
+    # Groq 30.
+    llm_requests_per_minute: int = 0
+    finnhub_requests_per_minute: int = 0
+
+    # resumable batch runs (agents/checkpoints.py): LangGraph checkpoints per
+    # run and ticker, kept this many days ("" path = no checkpointing)
+    checkpoint_path: str = "./output/checkpoints.sqlite"
+    checkpoint_retention_days: int = 7
+
+    # distributed scan (workqueue/): where the queue lives, how long a lease
+    # hides a task from other workers (workers extend it while they run),
+    # and how often a failing or orphaned task is retried
+    queue_url: str = "sqlite:///./output/queue.sqlite"
+    queue_lease_seconds: float = 120.0
+    queue_max_attempts: int = 3
+    queue_retry_delay_seconds: float = 30.0
+
+    # prompt size per LLM call (models/prompt_budget.py): headlines/snippets
+    # beyond the token budget are dropped, each item/reasoning is cut to
+    # this many characters
+    prompt_token_budget: int = 1500
+    prompt_max_item_chars: int = 300
+
+    # web snippets scoring under this relevance to the ticker (models/relevance.py)
+    # are dropped before the LLM sees them; 0 = keep everything
+    web_relevance_min: float = 0.3
+
+    # local model distilled from past LLM news/web scores (models/distilled.py,
+    # `python -m models.distilled train`); when on, the LLM is only asked
+    # when the model's confidence is below the threshold
+    distilled_scoring: bool = False
+    distilled_model_path: str = "./output/distilled_model.npz"
+    distilled_min_confidence: float = 0.6
+
+    # per-node memoization (agents/memo.py): results reused while a node's
+    # inputs are unchanged, for this long; 0 = off
+    memo_ttl_seconds: float = 86400.0
+    memo_path: str = "./output/memo.sqlite"
+
+    # skip the debate/summary LLM calls when the sources agree strongly or
+    # have no data at all (agents/fast_path.py)
+    fast_path_enabled: bool = True
+    fast_path_min_sources: int = 3
+    fast_path_min_confidence: float = 0.8
+
+    # debate style (agents/debate_agent.py): "single" = one LLM call writes both
+    # sides and the verdict; "structured" = bull and bear advocates argue
+    # concurrently for DEBATE_ROUNDS rounds, then a short judge call decides.
+    # each round (and the judge) gets at most DEBATE_ROUND_TIMEOUT_SECONDS
+    debate_mode: Literal["single", "structured"] = "single"
+    debate_rounds: int = 1
+    debate_round_timeout_seconds: float = 20.0
+
+    # watch mode (service/watcher.py): base probe cadence and its floor, the
+    # report age that forces a rerun, how much input change is "material",
+    # and what counts as a big rank move / score swing
+    watch_interval_seconds: float = 900.0
+    watch_min_interval_seconds: float = 60.0
+    watch_max_age_seconds: float = 14400.0
+    watch_change_threshold: float = 0.5
+    watch_rank_scale: float = 20.0
+    watch_volatility_scale: float = 0.2
+
     # how much weight each agent gets in the final score (should sum to 1.0)
     # analyst data is the most reliable signal (institutional consensus from
     # dozens of analysts), followed by news headlines. Social and web are
@@ -37,5 +136,26 @@ class Settings(BaseSettings):
     weight_analyst: float = 0.35
     weight_web: float = 0.20
 
+    # long-running modes (main.py serve): reports younger than
+    # cache_fresh_seconds are served as-is, ones within the following
+    # cache_stale_seconds are served while a refresh runs in the background
+    server_host: str = "127.0.0.1"
+    server_port: int = 8080
+    cache_fresh_seconds: int = 300
+    cache_stale_seconds: int = 1800
+
+    # main.py daemon: warm worker pool behind a Unix socket. `main.py --ticker X`
+    # delegates to it automatically when it's running.
+    daemon_socket_path: str = "/tmp/stock_sentiment.sock"
+    daemon_workers: int = 4
+    # how long a CLI run waits on the daemon before running in-process instead
+    daemon_request_timeout_seconds: float = 300.0
+
+    # port for the daemon's Prometheus /metrics endpoint (0 = disabled;
+    # serve mode exposes /metrics on its own port), and the interface it
+    # binds -- local only unless you set e.g. 0.0.0.0 for a remote scraper
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
+
 
 settings = Settings()
@@ -0,0 +1,85 @@
+"""
+Per-host request timeouts derived from observed latency.
+
+A flat `timeout=10` is far too generous for ApeWisdom (usually well
+under a second) and occasionally too tight for Finviz under load. Instead
+data.http_client keeps a rolling window of recent response times per
+host and asks for a (connect, read) timeout pair:
+
+    connect = CONNECT_MULTIPLIER * p50      (a connect is a fraction of a round trip)
+    read    = READ_MULTIPLIER * p99
+
+both clamped to [HTTP_TIMEOUT_MIN, HTTP_TIMEOUT_MAX]. Until a host has
+MIN_SAMPLES observations it gets HTTP_TIMEOUT_DEFAULT.
+
+A request that hits the adaptive timeout is retried once with the full
+HTTP_TIMEOUT_MAX, so cutting a tail-latency outlier short costs a second
+attempt rather than a failed fetch.
+"""
+import math
+import threading
+from collections import deque
+from typing import Union
+
+from config.settings import settings
+
+WINDOW = 200
+MIN_SAMPLES = 20
+CONNECT_MULTIPLIER = 2.0
+READ_MULTIPLIER = 2.0
+
+Timeout = Union[float, tuple[float, float]]
+
+
+class LatencyTracker:
+    """Rolling window of one host's successful response times (thread-safe)."""
+
+    def __init__(self, window: int = WINDOW, min_samples: int = MIN_SAMPLES):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of the window (0.0 while empty)."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        rank = math.ceil(pct / 100 * len(ordered))
+        return ordered[max(0, min(len(ordered), rank) - 1)]
+
+    def timeout(self) -> Timeout:
+        """(connect, read) for the next request, or the flat default while warming up."""
+        with self._lock:
+            warm = len(self._samples) >= self.min_samples
+        if not warm:
+            return settings.http_timeout_default
+        return (
+            _clamp(CONNECT_MULTIPLIER * self.percentile(50)),
+            _clamp(READ_MULTIPLIER * self.percentile(99)),
+        )
+
+
+def _clamp(seconds: float) -> float:
+    return round(min(settings.http_timeout_max, max(settings.http_timeout_min, seconds)), 3)
+
+
+_trackers: dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_tracker(host: str) -> LatencyTracker:
+    with _registry_lock:
+        tracker = _trackers.get(host)
+        if tracker is None:
+            tracker = _trackers[host] = LatencyTracker()
+        return tracker
+
+
+def reset_trackers() -> None:
+    with _registry_lock:
+        _trackers.clear()
@@ -8,10 +8,21 @@ than yfinance's unofficial scraping. Requires a FINNHUB_API_KEY
 Free tier only includes recommendation_trends. Price targets and
 upgrade/downgrade data require a paid plan -- we try those but
 gracefully fall back if they return 403.
+
+A ticker Finnhub has no coverage for comes back with zero counts and
+no_data=True; a failed fetch comes back with zero counts and error=<message>.
 """
 import logging
-import finnhub
+from urllib.parse import urlparse
 from config.settings import settings
+from data.circuit_breaker import guard
+from data.negative_cache import known_missing, remember_missing
+from telemetry.spans import traced, mark_error
+from utils import cassette, deadline, rate_limit
+from utils.deadline import DeadlineExceeded
+from utils.lazy_import import lazy_import
+
+finnhub = lazy_import("finnhub")
 
 logger = logging.getLogger(__name__)
 
@@ -29,23 +40,44 @@ def _get_client():
                 "Get a free key at https://finnhub.io/register"
             )
         _client = finnhub.Client(api_key=api_key)
+        # the SDK keeps its endpoint on the class; override it per instance
+        _client.API_URL = settings.finnhub_base_url.rstrip("/")
     return _client
 
 
+def _call(endpoint: str, ticker: str, fn):
+    """fn(client) through the cassette (if any), so replays don't need a key or the network."""
+    return cassette.through("finnhub", f"{endpoint}:{ticker}", lambda: _live_call(fn))
+
+
+def _live_call(fn):
+    deadline.check("Finnhub call")
+    client = _get_client()
+    rate_limit.acquire("finnhub")
+    # a 403 is Finnhub saying "paid plan only", not the host failing
+    with guard(urlparse(settings.finnhub_base_url).netloc, is_failure=lambda e: "403" not in str(e)):
+        return fn(client)
+
+
+@traced("finnhub", kind="fetch")
 def fetch_analyst_data(ticker: str) -> dict:
     """
     Get analyst consensus and (optionally) price targets + upgrade/downgrade actions.
     The recommendation_trends endpoint is free; others may need a paid plan.
     """
     ticker = ticker.upper()
+    if known_missing("finnhub", ticker):
+        return {**_no_coverage(ticker), "no_data": True}
 
     try:
-        client = _get_client()
-
         # 1) recommendation trends (FREE tier) -- returns monthly snapshots
         #    each has: buy, hold, sell, strongBuy, strongSell, period
-        recs = client.recommendation_trends(ticker)
-        latest_rec = recs[0] if recs else {}
+        recs = _call("recommendation_trends", ticker, lambda client: client.recommendation_trends(ticker))
+        if not recs:
+            # no coverage at all -- the paid endpoints won't have anything either
+            remember_missing("finnhub", ticker, "no Finnhub analyst coverage")
+            return {**_no_coverage(ticker), "no_data": True}
+        latest_rec = recs[0]
 
         strong_buy  = latest_rec.get("strongBuy", 0)
         buy_count   = latest_rec.get("buy", 0)
@@ -71,7 +103,7 @@ def fetch_analyst_data(ticker: str) -> dict:
         target_high = None
         target_low  = None
         try:
-            targets = client.price_target(ticker)
+            targets = _call("price_target", ticker, lambda client: client.price_target(ticker))
             target_mean = targets.get("targetMean")
             target_high = targets.get("targetHigh")
             target_low  = targets.get("targetLow")
@@ -84,7 +116,7 @@ def fetch_analyst_data(ticker: str) -> dict:
         # 3) recent upgrades/downgrades (may need paid plan, gracefully skip if 403)
         recent_actions = []
         try:
-            upgrades = client.upgrade_downgrade(symbol=ticker)
+            upgrades = _call("upgrade_downgrade", ticker, lambda client: client.upgrade_downgrade(symbol=ticker))
             for item in (upgrades or [])[:10]:
                 recent_actions.append({
                     "firm":       item.get("company", ""),
@@ -113,20 +145,27 @@ def fetch_analyst_data(ticker: str) -> dict:
             "current_price":     None,
             "recent_actions":    recent_actions,
         }
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        mark_error(e)
         logger.error(f"Finnhub analyst data fetch error for {ticker}: {e}")
-        return {
-            "ticker": ticker,
-            "recommendation_key": "none",
-            "analyst_count": 0,
-            "strong_buy": 0,
-            "buy": 0,
-            "hold": 0,
-            "sell": 0,
-            "strong_sell": 0,
-            "target_mean_price": None,
-            "target_high_price": None,
-            "target_low_price":  None,
-            "current_price":     None,
-            "recent_actions":    [],
-        }
+        return {**_no_coverage(ticker), "error": str(e)}
+
+
+def _no_coverage(ticker: str) -> dict:
+    return {
+        "ticker": ticker,
+        "recommendation_key": "none",
+        "analyst_count": 0,
+        "strong_buy": 0,
+        "buy": 0,
+        "hold": 0,
+        "sell": 0,
+        "strong_sell": 0,
+        "target_mean_price": None,
+        "target_high_price": None,
+        "target_low_price":  None,
+        "current_price":     None,
+        "recent_actions":    [],
+    }
@@ -0,0 +1,178 @@
+"""
+Per-upstream circuit breakers.
+
+When DuckDuckGo starts blocking us or Finviz is down, every ticker would
+otherwise sit out the full request timeout before the fetcher gives up.
+A breaker per upstream host counts consecutive failures; after
+BREAKER_FAILURE_THRESHOLD of them it opens and calls fail immediately
+with CircuitOpenError. Once BREAKER_RESET_SECONDS have passed it goes
+half-open and lets exactly one probe through -- success closes it again,
+failure re-opens it for another reset period.
+
+A call cut short by the run's own deadline (utils/deadline.py) says
+nothing about the host either way: it leaves the state and the failure
+count alone, and a half-open breaker just lets the next probe through.
+
+Refused calls mark the open fetch span with `skipped` (and the reason),
+which OrchestratorAgent turns into the report's "skipped_sources".
+
+    with guard("html.duckduckgo.com") as outcome:
+        resp = session.get(...)
+        if resp.status_code == 429:
+            outcome.fail("HTTP 429")
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from config.settings import settings
+from telemetry.metrics import BREAKER_REJECTIONS, BREAKER_STATE
+from telemetry.spans import current_span
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, reason: str):
+        super().__init__(f"circuit open for {name}: {reason}")
+        self.name = name
+        self.reason = reason
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = ""
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a call may go through right now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            reason = f"{self.failures} consecutive failures, last: {self.last_error}"
+        BREAKER_REJECTIONS.inc(upstream=self.name)
+        raise CircuitOpenError(self.name, reason)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed again")
+                self._set_state(CLOSED)
+
+    def record_neutral(self) -> None:
+        """The call ended without an answer either way; only re-arm the half-open probe."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            probe_failed = self.state == HALF_OPEN
+            self._probing = False
+            if probe_failed or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures ({error})")
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        BREAKER_STATE.set(_STATE_VALUES[state], upstream=self.name)
+
+
+class _Outcome:
+    """Lets the guarded block flag a failure that didn't raise (e.g. an HTTP 429)."""
+
+    def __init__(self):
+        self.error: Optional[str] = None
+
+    def fail(self, error: str) -> None:
+        self.error = error
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_seconds=settings.breaker_reset_seconds,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _registry_lock:
+        _breakers.clear()
+
+
+@contextmanager
+def guard(name: str, is_failure: Callable[[Exception], bool] = lambda e: True):
+    """
+    Run the block through `name`'s breaker: refused if it's open. An
+    exception counts as a failure (unless is_failure says it's an expected
+    answer, like Finnhub's 403 for paid endpoints), as does calling fail()
+    on the yielded outcome. DeadlineExceeded counts as neither. Anything
+    else is a success.
+    """
+    breaker = get_breaker(name)
+    try:
+        breaker.allow()
+    except CircuitOpenError as e:
+        s = current_span()
+        if s is not None:
+            s.attrs["skipped"] = str(e)
+        raise
+
+    outcome = _Outcome()
+    try:
+        yield outcome
+    except Exception as e:
+        if isinstance(e, deadline.DeadlineExceeded):
+            breaker.record_neutral()
+        elif is_failure(e):
+            breaker.record_failure(type(e).__name__)
+        else:
+            breaker.record_success()
+        raise
+    if outcome.error:
+        breaker.record_failure(outcome.error)
+    else:
+        breaker.record_success()
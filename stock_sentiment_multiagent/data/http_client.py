@@ -0,0 +1,140 @@
+"""
+Shared HTTP plumbing for the scrapers (Finviz, DuckDuckGo, ApeWisdom).
+
+Each thread gets its own requests.Session, so repeated calls to the same
+host reuse the pooled keep-alive connection instead of paying a new
+TCP + TLS handshake every time. For a one-shot CLI run that saves little,
+but in the long-running modes (serve, daemon) the sessions stay warm
+across tickers.
+
+Every call also goes through the record/replay cassette (utils/cassette.py);
+a replayed call hands back a CassetteResponse with the recorded body. Live
+calls go through the host's circuit breaker (data/circuit_breaker.py) and,
+unless the caller passes its own `timeout`, get per-host adaptive timeouts
+(data/adaptive_timeout.py). Either way the timeout is capped to what's
+left of the run's deadline (utils/deadline.py).
+"""
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+from config.settings import settings
+from data.adaptive_timeout import get_tracker
+from data.circuit_breaker import guard
+from telemetry.metrics import HTTP_TIMEOUT_RETRIES
+from telemetry.spans import current_span
+from utils import cassette, deadline
+from utils.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+
+_local = threading.local()
+
+# answers that mean "we're being blocked / the host is struggling"
+_FAILURE_STATUSES = {403, 429}
+
+
+def get_session():
+    """This thread's requests.Session (created on first use)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+class CassetteResponse:
+    """The bits of requests.Response the fetchers use, rebuilt from a cassette."""
+
+    def __init__(self, url: str, status_code: int, text: str, content_type: str = ""):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {"Content-Type": content_type} if content_type else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CassetteResponse":
+        return cls(data["url"], data["status_code"], data["text"], data.get("content_type", ""))
+
+    @staticmethod
+    def to_dict(resp) -> dict:
+        return {
+            "url": resp.url,
+            "status_code": resp.status_code,
+            "text": resp.text,
+            "content_type": resp.headers.get("Content-Type", ""),
+        }
+
+    def json(self):
+        import json
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def _live_get(url: str, **kwargs):
+    host = urlparse(url).netloc
+    deadline.check(f"GET {host}")
+    # running out of our own budget says nothing about the host (guard leaves the breaker alone)
+    with guard(host) as outcome:
+        if "timeout" in kwargs:
+            kwargs["timeout"] = deadline.cap(kwargs["timeout"])
+            resp = _deadline_aware(host, lambda: get_session().get(url, **kwargs))
+        else:
+            resp = _adaptive_get(host, url, **kwargs)
+        if _is_failure(resp.status_code):
+            outcome.fail(f"HTTP {resp.status_code}")
+        return resp
+
+
+def _is_failure(status_code: int) -> bool:
+    return status_code in _FAILURE_STATUSES or status_code >= 500
+
+
+def _adaptive_get(host: str, url: str, **kwargs):
+    """GET with the host's learned timeout; one retry at the ceiling if that cuts it short."""
+    tracker = get_tracker(host)
+    timeout = deadline.cap(tracker.timeout())
+    started = time.perf_counter()
+    try:
+        resp = _deadline_aware(host, lambda: get_session().get(url, timeout=timeout, **kwargs))
+    except requests.Timeout:
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout >= settings.http_timeout_max:
+            raise
+        HTTP_TIMEOUT_RETRIES.inc(host=host)
+        started = time.perf_counter()
+        retry_timeout = deadline.cap(settings.http_timeout_max)
+        resp = _deadline_aware(host, lambda: get_session().get(url, timeout=retry_timeout, **kwargs))
+    # a quick 429 / 403 / 5xx says nothing about how long a real answer takes
+    if not _is_failure(resp.status_code):
+        tracker.observe(time.perf_counter() - started)
+    return resp
+
+
+def _deadline_aware(host: str, send):
+    """send(), turning a timeout that the run's deadline cut short into DeadlineExceeded."""
+    try:
+        return send()
+    except requests.Timeout as e:
+        if deadline.expired():
+            raise deadline.DeadlineExceeded(f"GET {host}") from e
+        raise
+
+
+def get(url: str, **kwargs):
+    """requests.get() through the thread's pooled session."""
+    # headers/timeouts don't change the answer, so only url + params form the key
+    params = kwargs.get("params")
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    resp = cassette.through(
+        "http", key, lambda: _live_get(url, **kwargs),
+        encode=CassetteResponse.to_dict, decode=CassetteResponse.from_dict,
+    )
+    # credit the download size to whichever fetch span is open
+    span = current_span()
+    if span is not None:
+        span.add("bytes", len(resp.content))
+    return resp
@@ -0,0 +1,192 @@
+"""
+Remembers "this source has nothing for this ticker" between runs.
+
+Illiquid names in the universe come back empty from the same places every
+time: they aren't in ApeWisdom's trending list, Finnhub has no analyst
+coverage, Finviz has no news for them. Without this, every run downloads
+the ApeWisdom page again, walks it, logs the miss, and still asks the LLM
+to interpret a row of zeros.
+
+When a fetcher gets a good answer that simply has no data for the ticker
+it calls remember_missing(); the next run's known_missing() check then
+skips the source -- and the agent skips its LLM call -- until
+NEGATIVE_CACHE_TTL_SECONDS have passed. Errors are never cached: a
+timeout or a 429 says nothing about the ticker.
+
+Skipped fetches mark their span with `skipped`, so they show up in the
+report's "skipped_sources" like an open circuit does.
+
+Code that exists to notice change -- the watch-mode probe -- runs under
+bypassed(): lookups are skipped so a cached miss can't hide a ticker that
+just started trending or got its first headlines (misses are still
+recorded).
+
+Entries live in a small SQLite file (NEGATIVE_CACHE_PATH) so they survive
+between CLI runs and are shared by daemon / serve workers.
+
+    python -m data.negative_cache list
+    python -m data.negative_cache clear --ticker XYZ
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from config.settings import settings
+from telemetry.metrics import NEGATIVE_CACHE_HITS
+from telemetry.spans import current_span
+from utils import cassette
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS negatives (
+    source      TEXT NOT NULL,
+    ticker      TEXT NOT NULL,
+    reason      TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (source, ticker)
+);
+"""
+
+
+class NegativeCache:
+    def __init__(self, path: str, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # a fresh connection per call keeps this safe to use from threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, source: str, ticker: str) -> Optional[str]:
+        """The recorded reason if `ticker` is known to have no data at `source`, else None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT reason FROM negatives WHERE source = ? AND ticker = ? AND recorded_at >= ?",
+                (source, ticker.upper(), self._clock() - self.ttl_seconds),
+            ).fetchone()
+        return row["reason"] if row else None
+
+    def add(self, source: str, ticker: str, reason: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO negatives (source, ticker, reason, recorded_at) VALUES (?, ?, ?, ?)",
+                (source, ticker.upper(), reason, self._clock()),
+            )
+
+    def entries(self) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM negatives ORDER BY source, ticker").fetchall()
+        now = self._clock()
+        return [{**dict(row), "expired": row["recorded_at"] < now - self.ttl_seconds} for row in rows]
+
+    def clear(self, source: Optional[str] = None, ticker: Optional[str] = None) -> int:
+        """Drop entries (all of them, or only one source / ticker). Returns how many went."""
+        clauses, params = [], []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker.upper())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM negatives{where}", params).rowcount
+
+
+_cache: Optional[NegativeCache] = None
+_lock = threading.Lock()
+_bypassed: ContextVar[bool] = ContextVar("negative_cache_bypassed", default=False)
+
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """The cache for the configured path, or None when NEGATIVE_CACHE_TTL_SECONDS is 0."""
+    global _cache
+    if settings.negative_cache_ttl_seconds <= 0:
+        return None
+    with _lock:
+        if _cache is None or _cache.path != settings.negative_cache_path:
+            _cache = NegativeCache(settings.negative_cache_path, settings.negative_cache_ttl_seconds)
+        _cache.ttl_seconds = settings.negative_cache_ttl_seconds
+        return _cache
+
+
+def reset_negative_cache() -> None:
+    global _cache
+    with _lock:
+        _cache = None
+
+
+@contextmanager
+def bypassed():
+    """Ask every source again inside the block, whatever the cache says."""
+    token = _bypassed.set(True)
+    try:
+        yield
+    finally:
+        _bypassed.reset(token)
+
+
+def known_missing(source: str, ticker: str) -> bool:
+    """True if `source` recently had no data for `ticker`; marks the open fetch span as skipped."""
+    if _bypassed.get():
+        return False
+    # a cassette run should see exactly what the upstream said, recorded or replayed
+    cache = get_negative_cache() if cassette.active() is None else None
+    if cache is None:
+        return False
+    reason = cache.lookup(source, ticker)
+    if reason is None:
+        return False
+    NEGATIVE_CACHE_HITS.inc(source=source)
+    logger.debug(f"Skipping {source} for {ticker}: {reason} (negative cache)")
+    s = current_span()
+    if s is not None:
+        s.attrs["skipped"] = f"no data: {reason}"
+    return True
+
+
+def remember_missing(source: str, ticker: str, reason: str) -> None:
+    """Record that `source` answered but had nothing for `ticker`."""
+    cache = get_negative_cache() if cassette.active() is None else None
+    if cache is not None:
+        cache.add(source, ticker, reason)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the negative (no data) cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show every entry")
+    p = sub.add_parser("clear", help="Drop entries so the sources get queried again")
+    p.add_argument("--source")
+    p.add_argument("--ticker")
+    args = parser.parse_args(argv)
+
+    cache = NegativeCache(settings.negative_cache_path, settings.negative_cache_ttl_seconds)
+    if args.command == "list":
+        for entry in cache.entries():
+            expired = " (expired)" if entry["expired"] else ""
+            print(f"{entry['source']:<12} {entry['ticker']:<8} {entry['reason']}{expired}")
+    else:
+        print(f"Removed {cache.clear(args.source, args.ticker)} entries")
+
+
+if __name__ == "__main__":
+    main()
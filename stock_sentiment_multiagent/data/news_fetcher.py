@@ -1,14 +1,30 @@
 """
 Scrapes news headlines from Finviz and Yahoo Finance for a given ticker.
 Results are combined and deduplicated before being passed to the news agent.
+
+Each source returns [] when it answered with no news and None when the
+fetch failed, so "no headlines" and "couldn't look" stay distinguishable.
 """
 import logging
-import requests
-from bs4 import BeautifulSoup
-import yfinance as yf
+from typing import Optional
+from config.settings import settings
+from data import http_client
+from data.circuit_breaker import guard
+from data.negative_cache import known_missing, remember_missing
+from telemetry.spans import traced, mark_error
+from utils import cassette, deadline
+from utils.deadline import DeadlineExceeded
+from utils.lazy_import import lazy_import
+
+# heavy third-party modules are only imported the first time they're used
+bs4 = lazy_import("bs4")
+yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
+# breaker name for everything yfinance fetches (it has no configurable host)
+YAHOO_UPSTREAM = "finance.yahoo.com"
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -18,15 +34,23 @@ HEADERS = {
 }
 
 
-def fetch_finviz_headlines(ticker: str, max_headlines: int = 10) -> list[str]:
+@traced("finviz", kind="fetch")
+def fetch_finviz_headlines(ticker: str, max_headlines: int = 10) -> Optional[list[str]]:
     """Scrape the news table on Finviz's quote page."""
-    url = f"https://finviz.com/quote.ashx?t={ticker.upper()}"
+    if known_missing("finviz", ticker):
+        return []
+    url = f"{settings.finviz_base_url}/quote.ashx?t={ticker.upper()}"
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = http_client.get(url, headers=HEADERS)
+        if resp.status_code == 404:
+            # finviz 404s tickers it doesn't cover
+            remember_missing("finviz", ticker, "no Finviz quote page")
+            return []
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = bs4.BeautifulSoup(resp.text, "html.parser")
         news_table = soup.find("table", id="news-table")
         if not news_table:
+            # not cached: a block / captcha page has no news table either
             logger.warning(f"No news table found on Finviz for {ticker}")
             return []
         headlines = []
@@ -34,30 +58,51 @@ def fetch_finviz_headlines(ticker: str, max_headlines: int = 10) -> list[str]:
             link = row.find("a")
             if link:
                 headlines.append(link.get_text(strip=True))
+        if not headlines:
+            remember_missing("finviz", ticker, "empty Finviz news table")
         return headlines
+    except DeadlineExceeded:
+        # let the agent report the source as missing rather than empty
+        raise
     except Exception as e:
+        mark_error(e)
         logger.error(f"Finviz fetch error for {ticker}: {e}")
-        return []
+        return None
 
 
-def fetch_yahoo_headlines(ticker: str, max_headlines: int = 5) -> list[str]:
+@traced("yahoo_news", kind="fetch")
+def fetch_yahoo_headlines(ticker: str, max_headlines: int = 5) -> Optional[list[str]]:
     """Get recent news from Yahoo Finance through yfinance."""
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news or []
+        news = cassette.through("yahoo", f"news:{ticker}", lambda: _live_yahoo_news(ticker)) or []
         return [
             item.get("content", {}).get("title", "")
             for item in news[:max_headlines]
             if item.get("content", {}).get("title")
         ]
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        mark_error(e)
         logger.error(f"Yahoo Finance news fetch error for {ticker}: {e}")
-        return []
+        return None
+
+
+def _live_yahoo_news(ticker: str) -> list:
+    deadline.check("Yahoo news")
+    with guard(YAHOO_UPSTREAM):
+        return yf.Ticker(ticker).news
 
 
 def fetch_all_headlines(ticker: str) -> list[str]:
-    """Combine both sources and deduplicate."""
-    headlines = fetch_finviz_headlines(ticker) + fetch_yahoo_headlines(ticker)
+    """
+    Combine both sources and deduplicate. Raises RuntimeError if nothing
+    came back and a source failed: that's not the same as no news.
+    """
+    fetched = [fetch_finviz_headlines(ticker), fetch_yahoo_headlines(ticker)]
+    headlines = [h for source in fetched if source for h in source]
+    if not headlines and None in fetched:
+        raise RuntimeError(f"No headlines for {ticker}: a news source failed")
     seen = set()
     unique = []
     for h in headlines:
@@ -4,22 +4,29 @@ ApeWisdom aggregates Reddit mentions across r/wallstreetbets, r/stocks, etc.
 No authentication required which is nice.
 """
 import logging
-import requests
+from config.settings import settings
+from data import http_client
+from data.negative_cache import known_missing, remember_missing
+from telemetry.spans import traced, mark_error
+from utils.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
-APEWISDOM_BASE = "https://apewisdom.io/api/v1.0"
-
 
+@traced("apewisdom", kind="fetch")
 def fetch_apewisdom(ticker: str) -> dict:
     """
     Look up the ticker in ApeWisdom's top stocks list.
     Returns mentions, upvotes, rank info. Falls back to zeros if
-    the ticker isn't trending or the API is down.
+    the ticker isn't trending or the API is down; a ticker that isn't
+    trending also gets no_data=True (and is remembered in the negative cache),
+    a failed fetch gets error=<message> instead.
     """
-    url = f"{APEWISDOM_BASE}/filter/all-stocks/page/1"
+    if known_missing("apewisdom", ticker):
+        return {**_zeros(ticker), "no_data": True}
+    url = f"{settings.apewisdom_base_url}/filter/all-stocks/page/1"
     try:
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url)
         resp.raise_for_status()
         data = resp.json()
         results = data.get("results", [])
@@ -36,21 +43,22 @@ def fetch_apewisdom(ticker: str) -> dict:
                 }
         # ticker not popular enough to be in the top list
         logger.info(f"{ticker} not found in ApeWisdom top results — returning zeros")
-        return {
-            "ticker": ticker_upper,
-            "mentions": 0,
-            "upvotes": 0,
-            "rank": 999,
-            "rank_24h_ago": 999,
-            "rank_change": 0,
-        }
+        remember_missing("apewisdom", ticker, "not in ApeWisdom's trending list")
+        return {**_zeros(ticker), "no_data": True}
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        mark_error(e)
         logger.error(f"ApeWisdom fetch error for {ticker}: {e}")
-        return {
-            "ticker": ticker.upper(),
-            "mentions": 0,
-            "upvotes": 0,
-            "rank": 999,
-            "rank_24h_ago": 999,
-            "rank_change": 0,
-        }
+        return {**_zeros(ticker), "error": str(e)}
+
+
+def _zeros(ticker: str) -> dict:
+    return {
+        "ticker": ticker.upper(),
+        "mentions": 0,
+        "upvotes": 0,
+        "rank": 999,
+        "rank_24h_ago": 999,
+        "rank_change": 0,
+    }
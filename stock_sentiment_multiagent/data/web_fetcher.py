@@ -3,8 +3,15 @@ Scrapes DuckDuckGo HTML search results for a stock ticker.
 No API key needed -- we just parse the HTML response.
 """
 import logging
-import requests
-from bs4 import BeautifulSoup
+from typing import Optional
+from urllib.parse import quote
+from config.settings import settings
+from data import http_client
+from telemetry.spans import traced, mark_error
+from utils.deadline import DeadlineExceeded
+from utils.lazy_import import lazy_import
+
+bs4 = lazy_import("bs4")
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +24,14 @@ HEADERS = {
 }
 
 
-def _search_ddg(query: str, max_results: int = 4) -> list[str]:
-    """Run a single DuckDuckGo HTML search and return title+snippet strings."""
-    url = f"https://html.duckduckgo.com/html/?q={requests.utils.quote(query)}"
+@traced("duckduckgo", kind="fetch")
+def _search_ddg(query: str, max_results: int = 4) -> Optional[list[str]]:
+    """Run a single DuckDuckGo HTML search and return title+snippet strings (None if it failed)."""
+    url = f"{settings.duckduckgo_base_url}/html/?q={quote(query)}"
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = http_client.get(url, headers=HEADERS)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = bs4.BeautifulSoup(resp.text, "html.parser")
 
         snippets = []
         results = soup.find_all("div", class_="result__body")
@@ -35,9 +43,12 @@ def _search_ddg(query: str, max_results: int = 4) -> list[str]:
             if title or snippet:
                 snippets.append(f"{title}: {snippet}".strip(": "))
         return snippets
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        mark_error(e)
         logger.warning(f"DuckDuckGo search failed for query '{query}': {e}")
-        return []
+        return None
 
 
 def fetch_web_snippets(ticker: str, company_name: str = "", max_results: int = 8) -> list[str]:
@@ -45,6 +56,7 @@ def fetch_web_snippets(ticker: str, company_name: str = "", max_results: int = 8
     Run multiple DuckDuckGo searches with different query angles to get a
     more balanced set of web snippets. Using just one query often skews
     results if the top results happen to be all bullish or all bearish.
+    Raises RuntimeError if nothing came back and a search failed.
     """
     name = company_name or ticker
 
@@ -57,12 +69,17 @@ def fetch_web_snippets(ticker: str, company_name: str = "", max_results: int = 8
     all_snippets = []
     seen = set()
     per_query = max_results // len(queries)
+    failed = False
 
     for query in queries:
-        for snippet in _search_ddg(query, max_results=per_query + 2):
+        found = _search_ddg(query, max_results=per_query + 2)
+        failed = failed or found is None
+        for snippet in found or []:
             # deduplicate across queries
             if snippet not in seen:
                 seen.add(snippet)
                 all_snippets.append(snippet)
 
+    if not all_snippets and failed:
+        raise RuntimeError(f"No web results for {ticker}: a DuckDuckGo search failed")
     return all_snippets[:max_results]
@@ -4,17 +4,40 @@ Entry point for running sentiment analysis from the command line.
 Example usage:
     python main.py --ticker AAPL
     python main.py --ticker TSLA --output ./results/
+    python main.py --ticker AAPL MSFT NVDA      # batch, plus a timings summary file
+    python main.py --ticker NVDA --stream      # NDJSON, one line per graph node
+    python main.py --ticker NVDA --record nvda.json.gz   # capture every upstream call
+    python main.py --ticker NVDA --replay nvda.json.gz   # rerun offline, deterministically
+    python main.py --ticker AAPL MSFT --profile          # cProfile + tracemalloc per node/fetcher
+    python main.py --ticker AAPL MSFT --deadline 45      # partial reports rather than overrunning 45s
+    python main.py --ticker $(cat universe.txt) --workers 8   # shard a big scan across 8 processes
+    python main.py --resume 20260101T020000Z-1a2b3c       # finish a batch that was cut short
+    python main.py serve --port 8080           # HTTP service, GET /sentiment/{ticker}
+    python main.py daemon --workers 4          # warm workers; --ticker runs then delegate to it
+    python main.py watch --ticker AAPL MSFT    # keep a watchlist fresh, rescoring only what moved
+
+Saved reports are indexed for quick lookups, see output/report_archive.py.
 """
 import argparse
 import json
 import logging
 import os
 import sys
+from contextlib import nullcontext
+from datetime import datetime, timezone
 
 # make sure imports work even if you run this from a different folder
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from agents.checkpoints import run_tickers, start_run
 from agents.orchestrator_agent import OrchestratorAgent
+from config.settings import settings
+from output.report_generator import save_report
+from service.daemon_client import request_report
+from telemetry import metrics
+from telemetry.spans import aggregate_timings
+from utils.cassette import use_cassette
+from utils.deadline import within
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,36 +51,233 @@ def main():
         description="Stock Sentiment Multi-Agent Framework"
     )
     parser.add_argument(
-        "--ticker", "-t", required=True, help="Stock ticker symbol (e.g. AAPL)"
+        "mode", nargs="?", default="run", choices=["run", "serve", "daemon", "watch"],
+        help=(
+            "run: analyze one ticker (default). serve: start the HTTP service. "
+            "daemon: start the warm worker pool on a Unix socket. "
+            "watch: keep --ticker fresh, rerunning a ticker only when its inputs move"
+        )
+    )
+    parser.add_argument(
+        "--ticker", "-t", nargs="+", help="Stock ticker symbol(s) (e.g. AAPL, or AAPL MSFT NVDA)"
     )
     parser.add_argument(
         "--output", "-o", default="./output",
         help="Directory to save JSON report (default: ./output)"
     )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Print each node's result as NDJSON on stdout as soon as it finishes"
+    )
+    parser.add_argument("--host", help="serve: interface to bind (default: SERVER_HOST)")
+    parser.add_argument("--port", type=int, help="serve: port to listen on (default: SERVER_PORT)")
+    parser.add_argument(
+        "--socket", default=settings.daemon_socket_path,
+        help="daemon: Unix socket path (default: DAEMON_SOCKET_PATH)"
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help=(
+            "daemon: number of warm workers (default: DAEMON_WORKERS). "
+            "run: shard the tickers across this many processes"
+        )
+    )
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="run: always run in-process, even if a daemon is listening"
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record", metavar="CASSETTE",
+        help="run: save every HTTP/SDK/LLM response to this cassette file"
+    )
+    cassette_group.add_argument(
+        "--replay", metavar="CASSETTE",
+        help="run: answer every HTTP/SDK/LLM call from this cassette instead of the network"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="run: write per-node/per-fetcher CPU and memory profiles under <output>/profiles/"
+    )
+    parser.add_argument(
+        "--deadline", type=float, default=settings.run_deadline_seconds, metavar="SECONDS",
+        help=(
+            "run: time budget for all tickers together; sources that don't make it are "
+            "reported as missing (default: RUN_DEADLINE_SECONDS, 0 = none)"
+        )
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID",
+        help=(
+            "run: continue an interrupted batch -- finished tickers are skipped, the rest pick up "
+            "from their last completed node (batches print their run id when they start)"
+        )
+    )
     args = parser.parse_args()
 
-    ticker = args.ticker.upper()
+    if args.mode == "serve":
+        from service.http_server import serve
+        serve(args.host, args.port, output_dir=args.output)
+        return
+
+    if args.mode == "daemon":
+        from service.daemon import run_daemon
+        run_daemon(args.socket, args.workers)
+        return
+
+    if args.mode == "watch":
+        if not args.ticker:
+            parser.error("--ticker is required in watch mode")
+        from service.watcher import watch
+        watch(args.ticker, output_dir=args.output)
+        return
+
+    if args.resume and (args.ticker or args.stream):
+        parser.error("--resume takes the tickers from the original run; drop --ticker / --stream")
+    if not args.ticker and not args.resume:
+        parser.error("--ticker is required in run mode")
+    pooled = (args.workers or 1) > 1
+    if pooled and (args.stream or args.record or args.replay or args.profile):
+        parser.error("--workers can't be combined with --stream, --record, --replay or --profile")
+
     orchestrator = OrchestratorAgent()
+    run_id = None
+    if args.resume:
+        if not settings.checkpoint_path:
+            parser.error("--resume needs CHECKPOINT_PATH")
+        stored = run_tickers(args.resume)
+        if stored is None:
+            parser.error(f"no checkpointed run {args.resume!r} in {settings.checkpoint_path}")
+        run_id = args.resume
+        tickers = []
+        for ticker in stored:
+            if orchestrator.checkpoint_status(run_id, ticker) == "done":
+                print(f"⏭  {ticker} already finished in run {run_id}")
+            else:
+                tickers.append(ticker)
+    else:
+        tickers = [t.upper() for t in args.ticker]
+        if len(tickers) > 1 and not args.stream and settings.checkpoint_path:
+            run_id = start_run(tickers)
+            print(f"Run id: {run_id} (if this gets cut short: python main.py --resume {run_id})", file=sys.stderr)
+
+    if args.record:
+        cassette = use_cassette(args.record, "record")
+    elif args.replay:
+        cassette = use_cassette(args.replay, "replay")
+    else:
+        cassette = nullcontext()
+
+    if args.profile:
+        from telemetry.profiling import profile_run
+        profiling = profile_run(args.output)
+    else:
+        profiling = nullcontext()
+
+    with cassette, profiling as profiler, within(args.deadline):
+        if args.stream:
+            for ticker in tickers:
+                with _profiled(profiler, ticker):
+                    _run_streaming(orchestrator, ticker, args.output)
+        else:
+            # the daemon can't see this process's cassette, profiler or deadline, and doesn't checkpoint
+            use_daemon = not (
+                args.no_daemon or args.record or args.replay or args.profile or args.deadline or pooled or run_id
+            )
+            _run_tickers(orchestrator, tickers, args, use_daemon, profiler, run_id)
+    metrics.write_textfile(os.path.join(args.output, "metrics.prom"))
+    if profiler is not None:
+        print(profiler.summary(), file=sys.stderr)
+
+
+def _profiled(profiler, ticker: str):
+    return profiler.ticker(ticker) if profiler is not None else nullcontext()
+
+
+def _run_tickers(
+    orchestrator: OrchestratorAgent, tickers: list[str], args, use_daemon: bool, profiler=None, run_id=None
+):
+    reports = []
+    for ticker, report in _reports(orchestrator, tickers, args, use_daemon, profiler, run_id):
+        reports.append(report)
 
-    print(f"\n🔍 Analyzing sentiment for {ticker}...\n")
-    report = orchestrator.run(ticker)
+        print(json.dumps(report, indent=2))
 
-    print(json.dumps(report, indent=2))
+        # write report to disk (and add it to the archive index)
+        filepath = save_report(report, args.output)
 
-    # write report to disk
-    os.makedirs(args.output, exist_ok=True)
-    timestamp = report["timestamp"].replace(":", "-").replace("+", "_")
-    filename = f"{ticker}_{timestamp}.json"
-    filepath = os.path.join(args.output, filename)
+        print(f"\n✅ Report saved to: {filepath}")
+        print(
+            f"   Sentiment: {report['sentiment_label']}  |  "
+            f"Score: {report['sentiment_score']}  |  "
+            f"Confidence: {report['confidence']}"
+        )
+
+    if len(reports) > 1:
+        _save_batch_timings(reports, args.output)
+
+
+def _reports(orchestrator: OrchestratorAgent, tickers: list[str], args, use_daemon: bool, profiler=None, run_id=None):
+    """Yield (ticker, report) in input order: from the process pool, the daemon, or in-process."""
+    if (args.workers or 1) > 1:
+        from service.process_pool import scan
+        for ticker, response in scan(tickers, args.workers, run_id=run_id):
+            if response["ok"]:
+                print(f"\n🔍 Sentiment for {ticker}:\n")
+                yield ticker, response["report"]
+            else:
+                print(f"\n❌ {ticker} failed: {response['error']}")
+        return
+
+    for ticker in tickers:
+        print(f"\n🔍 Analyzing sentiment for {ticker}...\n")
+        report = None
+        if use_daemon:
+            try:
+                # a CLI run saves what it gets as a new report: never take the daemon's cached one
+                report = request_report(
+                    ticker, args.socket, timeout=settings.daemon_request_timeout_seconds, fresh=True,
+                )
+            except (RuntimeError, OSError, ValueError) as e:
+                # ValueError: a reply cut off mid-line isn't JSON
+                logging.getLogger(__name__).warning(f"Daemon unavailable ({e}), running in-process")
+        if report is None:
+            with _profiled(profiler, ticker):
+                report = orchestrator.run(ticker, run_id=run_id)
+        yield ticker, report
+
+
+def _run_streaming(orchestrator: OrchestratorAgent, ticker: str, output_dir: str):
+    """
+    Stream mode: stdout carries only NDJSON events so it can be piped
+    straight into a consumer. Human-readable status goes to stderr.
+    """
+    report = None
+    for event in orchestrator.stream(ticker):
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+        if event["node"] == "report":
+            report = event["data"]["report"]
+
+    if report:
+        filepath = save_report(report, output_dir)
+        print(f"✅ Report saved to: {filepath}", file=sys.stderr)
+
+
+def _save_batch_timings(reports: list[dict], output_dir: str):
+    """Write the batch-wide timing rollup next to the reports."""
+    summary = aggregate_timings(reports)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    filepath = os.path.join(output_dir, f"timings_{stamp}.json")
     with open(filepath, "w") as f:
-        json.dump(report, f, indent=2)
+        json.dump(summary, f, indent=2)
 
-    print(f"\n✅ Report saved to: {filepath}")
-    print(
-        f"   Sentiment: {report['sentiment_label']}  |  "
-        f"Score: {report['sentiment_score']}  |  "
-        f"Confidence: {report['confidence']}"
-    )
+    run = summary["run_seconds"]
+    if run.get("count"):
+        print(
+            f"\n⏱  {run['count']} tickers  |  p50 {run['p50']}s  |  "
+            f"p95 {run['p95']}s  |  timings: {filepath}"
+        )
 
 
 if __name__ == "__main__":
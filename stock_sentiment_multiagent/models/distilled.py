@@ -0,0 +1,241 @@
+"""
+A small local sentiment model distilled from the LLM's own past scores.
+
+Every news and web score the LLM ever gave is still in the memo store
+(agents/memo.py), next to the exact headlines / snippets it was given.
+`python -m models.distilled train` turns those pairs into a ridge
+regression over hashed word n-grams, in plain NumPy:
+
+- features: lowercased unigrams + bigrams of all the items the LLM saw
+  together, hashed (crc32, signed) into DIMENSIONS buckets, log-scaled
+  and L2-normalized,
+- target: the LLM's score for that set (what it actually labelled -- it
+  never scored headlines one at a time),
+- fit: closed-form ridge in its dual form (an n x n solve over at most
+  MAX_EXAMPLES of the newest sets, rather than DIMENSIONS x DIMENSIONS).
+
+The artifact (DISTILLED_MODEL_PATH, an .npz of well under 200 KB) holds the
+weights, a bitmap of the n-grams training saw, and the held-out error.
+
+With DISTILLED_SCORING=true the news and web agents ask the model first
+and only go to the LLM when its confidence is under
+DISTILLED_MIN_CONFIDENCE. Confidence is the share of the input's n-grams
+the model has seen in training, times how well it did on held-out data,
+so unfamiliar vocabulary (a new product, a scandal) escalates. Local
+scores are never written back to the memo store: it only ever trains on
+the LLM.
+
+    python -m models.distilled train
+    python -m models.distilled info
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Optional
+
+from config.settings import settings
+from telemetry.metrics import DISTILLED_SCORES
+from utils.lazy_import import lazy_import
+
+# the agents import this module; numpy only loads once a model is trained or used
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = 2 ** 13
+# n-gram "seen in training" bitmap, much finer than the weights so collisions don't fake familiarity
+SEEN_BITS = 2 ** 20
+MAX_EXAMPLES = 5000
+NODES = ("news_sentiment", "web_search")
+# memo input field holding each node's text items
+_ITEMS = {"news_sentiment": "headlines", "web_search": "snippets"}
+_TOKEN = re.compile(r"[a-z0-9$%.']+")
+
+
+def _ngrams(text: str) -> list[str]:
+    words = [w.strip(".'") for w in _TOKEN.findall(text.lower())]
+    words = [w for w in words if w]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def ngram_hashes(items: list[str]) -> list[int]:
+    """crc32 of every unigram and bigram across `items` (shared with models/relevance.py)."""
+    return [zlib.crc32(gram.encode("utf-8")) for gram in _ngrams(" \n ".join(items))]
+
+
+def featurize(items: list[str]) -> "np.ndarray":
+    vec = np.zeros(DIMENSIONS, dtype=np.float64)
+    for h in ngram_hashes(items):
+        # the sign bit keeps collisions from always adding up
+        vec[h % DIMENSIONS] += 1.0 if (h >> 31) & 1 else -1.0
+    vec = np.sign(vec) * np.log1p(np.abs(vec))
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+
+def _ridge(X: "np.ndarray", y: "np.ndarray", alpha: float) -> tuple["np.ndarray", float]:
+    # dual form, w = X^T (X X^T + alpha I)^-1 y: cheap while there are fewer examples than dimensions
+    bias = float(y.mean())
+    w = X.T @ np.linalg.solve(X @ X.T + alpha * np.eye(len(y)), y - bias)
+    return w, bias
+
+
+class DistilledModel:
+    def __init__(self, weights: "np.ndarray", bias: float, seen: "np.ndarray", meta: dict):
+        self.weights = weights
+        self.bias = bias
+        self.seen = seen
+        self.meta = meta
+
+    @classmethod
+    def train(cls, examples: list[tuple[list[str], float]], alpha: float = 1.0, holdout: float = 0.2) -> "DistilledModel":
+        """examples: (items the LLM saw, the score it gave). Needs at least 5."""
+        if len(examples) < 5:
+            raise ValueError(f"Need at least 5 examples to train, have {len(examples)}")
+        examples = examples[:MAX_EXAMPLES]
+        X = np.stack([featurize(items) for items, _ in examples])
+        y = np.clip(np.array([score for _, score in examples], dtype=np.float64), -1.0, 1.0)
+
+        # held-out error first (deterministic split), then refit on everything
+        rng = np.random.default_rng(0)
+        order = rng.permutation(len(y))
+        n_test = max(1, int(len(y) * holdout))
+        test, train = order[:n_test], order[n_test:]
+        w, b = _ridge(X[train], y[train], alpha)
+        rmse = float(np.sqrt(np.mean((np.clip(X[test] @ w + b, -1, 1) - y[test]) ** 2)))
+
+        weights, bias = _ridge(X, y, alpha)
+        meta = {
+            "examples": len(y),
+            "holdout_rmse": round(rmse, 4),
+            "alpha": alpha,
+            "dimensions": DIMENSIONS,
+            "trained_at": time.time(),
+        }
+        seen = np.zeros(SEEN_BITS, dtype=bool)
+        for items, _ in examples:
+            seen[np.array(ngram_hashes(items), dtype=np.int64) % SEEN_BITS] = True
+        return cls(weights.astype(np.float32), bias, seen, meta)
+
+    def predict(self, items: list[str]) -> tuple[float, float]:
+        """(score in -1..1, confidence in 0..1) for a set of headlines / snippets."""
+        hashes = ngram_hashes(items)
+        if not hashes:
+            return 0.0, 0.0
+        score = float(np.clip(featurize(items) @ self.weights + self.bias, -1.0, 1.0))
+        coverage = float(self.seen[np.array(hashes, dtype=np.int64) % SEEN_BITS].mean())
+        # an rmse of 0.5 or worse on a -1..1 scale is no better than guessing
+        quality = max(0.0, 1.0 - self.meta["holdout_rmse"] / 0.5)
+        return score, round(coverage * quality, 4)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f, weights=self.weights, bias=np.float64(self.bias), seen=np.packbits(self.seen),
+                meta=np.frombuffer(json.dumps(self.meta).encode("utf-8"), dtype=np.uint8),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "DistilledModel":
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            seen = np.unpackbits(data["seen"]).astype(bool)
+            return cls(data["weights"], float(data["bias"]), seen, meta)
+
+
+def harvest(store=None, nodes=NODES) -> list[tuple[list[str], float]]:
+    """(items, LLM score) pairs from the memo store, newest first."""
+    if store is None:
+        from agents.memo import MemoStore
+        store = MemoStore(settings.memo_path, settings.memo_ttl_seconds)
+    found = []
+    for node in nodes:
+        for entry in store.entries(node):
+            items = entry["inputs"].get(_ITEMS[node]) or []
+            score = entry["result"].get("score")
+            if items and isinstance(score, (int, float)):
+                found.append((entry["recorded_at"], items, float(score)))
+    found.sort(key=lambda e: e[0], reverse=True)
+    return [(items, score) for _, items, score in found]
+
+
+_model: Optional[DistilledModel] = None
+_model_key: Optional[tuple] = None
+_lock = threading.Lock()
+
+
+def get_model() -> Optional[DistilledModel]:
+    """The trained model at DISTILLED_MODEL_PATH (reloaded when the file changes), or None if there isn't one."""
+    global _model, _model_key
+    path = settings.distilled_model_path
+    try:
+        key = (path, os.path.getmtime(path))
+    except OSError:
+        return None
+    with _lock:
+        if key != _model_key:
+            _model, _model_key = DistilledModel.load(path), key
+        return _model
+
+
+def reset_model() -> None:
+    global _model, _model_key
+    with _lock:
+        _model, _model_key = None, None
+
+
+def score_locally(agent: str, items: list[str]) -> Optional[dict]:
+    """
+    An agent result from the distilled model, or None when the LLM should
+    score these items instead (scoring off, no model, or low confidence).
+    """
+    if not settings.distilled_scoring or not items:
+        return None
+    model = get_model()
+    if model is None:
+        return None
+    score, confidence = model.predict(items)
+    if confidence < settings.distilled_min_confidence:
+        DISTILLED_SCORES.inc(agent=agent, outcome="escalated")
+        logger.info(f"[{agent}] distilled model unsure (confidence {confidence:.2f}), asking the LLM")
+        return None
+    DISTILLED_SCORES.inc(agent=agent, outcome="local")
+    label = "positive" if score >= 0.15 else "negative" if score <= -0.15 else "neutral"
+    return {
+        "score": score,
+        "label": label,
+        "reasoning": f"Scored by the local distilled model (confidence {confidence:.2f}).",
+        "scored_by": "distilled",
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or inspect the distilled news/web sentiment model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("train", help="Fit the model on the LLM scores in the memo store")
+    p.add_argument("--output", default=settings.distilled_model_path)
+    p.add_argument("--alpha", type=float, default=1.0, help="ridge regularization strength")
+    sub.add_parser("info", help="Show the saved model's metadata")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        examples = harvest()
+        model = DistilledModel.train(examples, alpha=args.alpha)
+        model.save(args.output)
+        print(
+            f"Trained on {model.meta['examples']} LLM-scored sets, held-out RMSE {model.meta['holdout_rmse']}, "
+            f"saved to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)"
+        )
+    else:
+        model = get_model()
+        print(json.dumps(model.meta, indent=2) if model else f"No model at {settings.distilled_model_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,10 @@ import re
 import time
 import logging
 from config.settings import settings
+from telemetry.metrics import LLM_RATE_LIMITED
+from models.prompt_budget import estimate_tokens
+from telemetry.spans import span
+from utils import cassette, deadline, rate_limit
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +52,10 @@ class LLMClient:
         from google import genai
         if not settings.gemini_api_key:
             raise ValueError("GEMINI_API_KEY is required when LLM_PROVIDER=gemini")
-        self._client = genai.Client(api_key=settings.gemini_api_key)
+        http_options = None
+        if settings.gemini_base_url:
+            http_options = genai.types.HttpOptions(base_url=settings.gemini_base_url)
+        self._client = genai.Client(api_key=settings.gemini_api_key, http_options=http_options)
         self._model = settings.gemini_model
 
     def _init_openai_compatible(self):
@@ -57,13 +64,13 @@ class LLMClient:
 
         if self.provider == "groq":
             api_key = settings.groq_api_key
-            base_url = "https://api.groq.com/openai/v1"
+            base_url = settings.groq_base_url
             self._model = settings.groq_model
             if not api_key:
                 raise ValueError("GROQ_API_KEY is required when LLM_PROVIDER=groq")
         elif self.provider == "deepseek":
             api_key = settings.deepseek_api_key
-            base_url = "https://api.deepseek.com"
+            base_url = settings.deepseek_base_url
             self._model = settings.deepseek_model
             if not api_key:
                 raise ValueError("DEEPSEEK_API_KEY is required when LLM_PROVIDER=deepseek")
@@ -72,11 +79,23 @@ class LLMClient:
 
     def generate(self, prompt: str, max_retries: int = 4) -> str:
         """Send a prompt and get text back. Has retry logic for rate limits."""
+        # a replayed cassette answers here without a key, a client or a span
+        return cassette.through(
+            "llm", cassette.prompt_key(prompt), lambda: self._generate(prompt, max_retries)
+        )
+
+    def _generate(self, prompt: str, max_retries: int) -> str:
+        deadline.check("LLM call")
         self._ensure_initialized()
-        if self.provider == "gemini":
-            return self._generate_gemini(prompt, max_retries)
-        else:
-            return self._generate_openai(prompt, max_retries)
+        # one span per call: wall time (incl. backoff sleeps), tokens (our estimate and the provider's count), retries
+        with span(
+            "generate", kind="llm", provider=self.provider, retries=0, sleep_seconds=0.0,
+            estimated_prompt_tokens=estimate_tokens(prompt),
+        ) as call_span:
+            if self.provider == "gemini":
+                return self._generate_gemini(prompt, max_retries, call_span)
+            else:
+                return self._generate_openai(prompt, max_retries, call_span)
 
     def generate_json(self, prompt: str, max_retries: int = 4) -> dict:
         """Same as generate() but parses the response as JSON."""
@@ -89,32 +108,57 @@ class LLMClient:
             logger.error(f"Failed to parse JSON response: {raw[:500]}")
             raise ValueError(f"Invalid JSON from {self.provider}: {e}") from e
 
-    def _generate_gemini(self, prompt: str, max_retries: int) -> str:
+    def _generate_gemini(self, prompt: str, max_retries: int, call_span) -> str:
         delay = 15
         for attempt in range(max_retries):
+            rate_limit.acquire("llm")
+            # same cap as the OpenAI path; genai takes its per-request timeout in milliseconds
+            left = deadline.remaining()
+            extra = {}
+            if left is not None:
+                from google.genai import types
+                extra = {"config": types.GenerateContentConfig(
+                    http_options=types.HttpOptions(timeout=max(1, int(left * 1000))),
+                )}
             try:
                 response = self._client.models.generate_content(
                     model=self._model,
                     contents=prompt,
+                    **extra,
                 )
+                usage = getattr(response, "usage_metadata", None)
+                if usage is not None:
+                    call_span.attrs["prompt_tokens"] = usage.prompt_token_count or 0
+                    call_span.attrs["completion_tokens"] = usage.candidates_token_count or 0
                 return response.text.strip()
             except Exception as e:
                 err_str = str(e)
                 if "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
+                    LLM_RATE_LIMITED.inc(provider=self.provider)
                     if attempt < max_retries - 1:
                         wait = delay * (2 ** attempt)
                         logger.warning(
                             f"Rate limit hit (attempt {attempt+1}/{max_retries}). "
                             f"Waiting {wait}s..."
                         )
+                        left = deadline.remaining()
+                        if left is not None and wait >= left:
+                            # sleeping would blow the run's budget; give up now instead
+                            raise deadline.DeadlineExceeded(f"{self.provider} retry in {wait}s") from e
+                        call_span.add("retries", 1)
+                        call_span.add("sleep_seconds", wait)
                         time.sleep(wait)
                         continue
                 logger.error(f"Gemini API error: {e}")
                 raise
 
-    def _generate_openai(self, prompt: str, max_retries: int) -> str:
+    def _generate_openai(self, prompt: str, max_retries: int, call_span) -> str:
         delay = 5
         for attempt in range(max_retries):
+            rate_limit.acquire("llm")
+            # the SDK's own timeout, capped to what's left of the run's deadline
+            left = deadline.remaining()
+            extra = {"timeout": left} if left is not None else {}
             try:
                 response = self._client.chat.completions.create(
                     model=self._model,
@@ -123,17 +167,29 @@ class LLMClient:
                         {"role": "user", "content": prompt},
                     ],
                     temperature=0.3,
+                    **extra,
                 )
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    call_span.attrs["prompt_tokens"] = usage.prompt_tokens or 0
+                    call_span.attrs["completion_tokens"] = usage.completion_tokens or 0
                 return response.choices[0].message.content.strip()
             except Exception as e:
                 err_str = str(e)
                 if "429" in err_str or "rate" in err_str.lower():
+                    LLM_RATE_LIMITED.inc(provider=self.provider)
                     if attempt < max_retries - 1:
                         wait = delay * (2 ** attempt)
                         logger.warning(
                             f"Rate limit hit (attempt {attempt+1}/{max_retries}). "
                             f"Waiting {wait}s..."
                         )
+                        left = deadline.remaining()
+                        if left is not None and wait >= left:
+                            # sleeping would blow the run's budget; give up now instead
+                            raise deadline.DeadlineExceeded(f"{self.provider} retry in {wait}s") from e
+                        call_span.add("retries", 1)
+                        call_span.add("sleep_seconds", wait)
                         time.sleep(wait)
                         continue
                 logger.error(f"{self.provider} API error: {e}")
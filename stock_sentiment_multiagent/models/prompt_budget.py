@@ -0,0 +1,80 @@
+"""
+Keeps prompts within a token budget, and estimates what they cost.
+
+The templates in config/prompts.py get filled with whatever the fetchers
+returned: every headline, every snippet at full length, analyst data as
+indented JSON, each agent's full reasoning in the debate. Nothing bounded
+any of it, and nothing told us what a call cost until the bill came. This
+sits between the templates and the agents:
+
+- estimate_tokens(): a local, provider-agnostic estimate (~4 characters
+  per token for English text, which is close for Llama, DeepSeek and
+  Gemini tokenizers alike). LLMClient records it on every call's span
+  next to the provider's actual prompt_tokens, so the two can be compared
+  per call and in the metrics.
+- fit(): keeps the leading items of a list field (headlines, snippets --
+  pass them most important first) that fit in PROMPT_TOKEN_BUDGET
+  together with the rest of the prompt, each cut to PROMPT_MAX_ITEM_CHARS.
+- compact_json(): JSON without indentation or empty values, for the
+  structured payloads.
+"""
+import json
+import logging
+import math
+from typing import Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate(text: str, max_chars: Optional[int] = None) -> str:
+    max_chars = max_chars or settings.prompt_max_item_chars
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - 1].rstrip() + "…"
+
+
+def _drop_empty(value):
+    if isinstance(value, dict):
+        return {k: _drop_empty(v) for k, v in value.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_drop_empty(v) for v in value]
+    return value
+
+
+def compact_json(value) -> str:
+    """JSON with no indentation, no spaces after separators and no null/empty fields."""
+    return json.dumps(_drop_empty(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def bullets(items: list[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def fit(template: str, field: str, items: list[str], budget: Optional[int] = None, **fields) -> list[str]:
+    """
+    The leading `items` (each truncated) that fit into `template` as a
+    bulleted `field`, with the other `fields` filled in, within `budget`
+    tokens (PROMPT_TOKEN_BUDGET). Always keeps at least one item.
+    """
+    budget = budget or settings.prompt_token_budget
+    left = budget - estimate_tokens(template.format(**{field: ""}, **fields))
+    kept = []
+    for item in items:
+        item = truncate(item)
+        cost = estimate_tokens(f"- {item}\n")
+        if kept and cost > left:
+            break
+        kept.append(item)
+        left -= cost
+    if len(kept) < len(items):
+        logger.info(f"Prompt budget ({budget} tokens): kept {len(kept)} of {len(items)} {field}")
+    return kept
@@ -0,0 +1,121 @@
+"""
+Local relevance filter for web snippets, run before they're scored.
+
+DuckDuckGo's top results for "<name> <ticker> stock outlook" regularly
+include "10 best stocks to buy now" listicles and pages about some other
+company. They pad the prompt and pull the score toward whatever the
+listicle was excited about. Each snippet is scored in two steps:
+
+- entity match, a gate: the ticker (1-2 letter tickers only as $GM,
+  "(GM)" or "NYSE: GM", since a bare "A" or "GM" is mostly just a word),
+  or the whole company name without its Inc./Corp./Holdings suffix. A
+  snippet without one scores 0 -- a page about another company talks
+  about price targets and earnings too.
+- 0.25, plus up to 0.75 for similarity to the query intent: cosine
+  between the snippet and a short stock-outlook vocabulary (no company
+  name in it, so merely naming the company doesn't count twice), over
+  hashed n-gram TF-IDF (the same hashing as models/distilled.py; IDF comes
+  from the snippet set itself, so boilerplate shared by every result
+  counts little), saturating at a cosine of _FULL_MATCH; minus 0.5 for
+  listicle phrasing ("best stocks", "top 10 stocks", ...).
+
+So naming the company only gets a snippet considered; at the default
+WEB_RELEVANCE_MIN=0.3 it also has to say something about the stock, and a
+"10 best stocks to buy" list that happens to include the ticker falls
+under the threshold.
+
+Snippets under WEB_RELEVANCE_MIN are dropped, and the rest are ordered most
+relevant first, so the prompt budget (models/prompt_budget.py) cuts the
+weakest ones. The web agent reports how many were filtered and roughly
+how many prompt tokens that saved. WEB_RELEVANCE_MIN=0 turns it off.
+"""
+import math
+import re
+from collections import Counter
+
+from config.settings import settings
+from models.distilled import ngram_hashes
+from models.prompt_budget import estimate_tokens
+
+_BUCKETS = 2 ** 18
+# cosines against a short query stay small; a clearly on-intent snippet lands around here
+_FULL_MATCH = 0.15
+_INTENT = (
+    "stock shares price analyst analysts investors outlook forecast earnings revenue guidance rating "
+    "target upgrade downgrade demand news risks"
+)
+_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc", "holdings",
+    "holding", "group", "the", "class", "a", "b", "c", "sa", "nv", "ag", "se",
+}
+_LISTICLE = re.compile(
+    r"\b(best|top\s*\d*|\d+)\s+(\w+\s+){0,2}stocks?\b|\bstocks?\s+to\s+(buy|watch|sell)\b", re.IGNORECASE,
+)
+
+
+def _core_name(company_name: str) -> str:
+    words = re.findall(r"[a-z0-9&']+", company_name.lower())
+    while words and words[-1] in _SUFFIXES:
+        words.pop()
+    return " ".join(w for w in words if w != "the")
+
+
+def _mentions(snippet: str, ticker: str, core: str) -> bool:
+    t = re.escape(ticker)
+    if len(ticker) <= 2:
+        # "A strong quarter", "GM" for good morning: short tickers need a cashtag or exchange context
+        pattern = rf"\${t}\b|\({t}\)|\b(?:NYSE|NASDAQ|Nasdaq|AMEX)\s*:\s*{t}\b"
+    else:
+        pattern = rf"(?<![A-Za-z0-9])\$?{t}(?![A-Za-z0-9])"
+    if re.search(pattern, snippet):
+        return True
+    if not core:
+        return False
+    # the whole name: "General Electric" isn't General Motors
+    text = " ".join(re.findall(r"[a-z0-9&']+", snippet.lower()))
+    return f" {core} " in f" {text} "
+
+
+def _tfidf(docs: list[list[str]]) -> list[dict]:
+    counts = [Counter(h % _BUCKETS for h in ngram_hashes(doc)) for doc in docs]
+    df = Counter(b for c in counts for b in c)
+    n = len(docs)
+    vectors = []
+    for c in counts:
+        vec = {b: (1 + math.log(tf)) * (math.log((1 + n) / (1 + df[b])) + 1) for b, tf in c.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        vectors.append({b: v / norm for b, v in vec.items()})
+    return vectors
+
+
+def score_snippets(snippets: list[str], ticker: str, company_name: str = "") -> list[float]:
+    """Relevance of each snippet to this ticker's stock, 0..1 (0 = doesn't name it)."""
+    core = _core_name(company_name)
+    # the entity is already the gate; similarity is only about what the snippet says
+    vectors = _tfidf([[s] for s in snippets] + [[_INTENT]])
+    query = vectors[-1]
+    similarities = [sum(v * query.get(b, 0.0) for b, v in vec.items()) for vec in vectors[:-1]]
+    scores = []
+    for snippet, similarity in zip(snippets, similarities):
+        if not _mentions(snippet, ticker.upper(), core):
+            scores.append(0.0)
+            continue
+        score = 0.25 + 0.75 * min(1.0, similarity / _FULL_MATCH)
+        if _LISTICLE.search(snippet):
+            score -= 0.5
+        scores.append(round(max(0.0, score), 4))
+    return scores
+
+
+def filter_snippets(snippets: list[str], ticker: str, company_name: str = "") -> tuple[list[str], dict]:
+    """
+    (kept snippets, most relevant first; {"snippets_filtered": n, "tokens_saved": n}).
+    """
+    if settings.web_relevance_min <= 0 or not snippets:
+        return snippets, {"snippets_filtered": 0, "tokens_saved": 0}
+    scores = score_snippets(snippets, ticker, company_name)
+    ranked = sorted(zip(scores, range(len(snippets)), snippets), key=lambda t: (-t[0], t[1]))
+    kept = [s for score, _, s in ranked if score >= settings.web_relevance_min]
+    dropped = [s for score, _, s in ranked if score < settings.web_relevance_min]
+    saved = estimate_tokens("".join(f"- {s}\n" for s in dropped))
+    return kept, {"snippets_filtered": len(dropped), "tokens_saved": saved}
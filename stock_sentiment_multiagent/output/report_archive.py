@@ -0,0 +1,287 @@
+"""
+SQLite index over the JSON reports saved in the output directory.
+
+Every run drops a {ticker}_{timestamp}.json file into ./output, so once
+the folder grows past a few thousand files, questions like "latest report
+for MSFT" or "every flip to NEGATIVE this week" turn into a full directory
+walk plus a json.load per file. Instead, save_report() records each report
+here as it's written: (ticker, timestamp, label, score, confidence) plus
+the file and byte range the report lives in. Queries only hit the index,
+and load() only opens the files that actually matched.
+
+Usage from the module folder:
+    python -m output.report_archive latest MSFT
+    python -m output.report_archive range MSFT --since 2026-10-12
+    python -m output.report_archive filter --label NEGATIVE --min-score -1 --max-score -0.5
+    python -m output.report_archive flips --label NEGATIVE --since 2026-10-12
+    python -m output.report_archive rebuild     # one-off backfill of existing files
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id         INTEGER PRIMARY KEY,
+    ticker     TEXT NOT NULL,
+    timestamp  TEXT NOT NULL,
+    label      TEXT NOT NULL,
+    score      REAL NOT NULL,
+    confidence REAL NOT NULL,
+    path       TEXT NOT NULL,
+    offset     INTEGER NOT NULL DEFAULT 0,
+    length     INTEGER NOT NULL,
+    UNIQUE (path, offset)
+);
+CREATE INDEX IF NOT EXISTS idx_reports_ticker_ts ON reports (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS idx_reports_label_ts  ON reports (label, timestamp);
+CREATE INDEX IF NOT EXISTS idx_reports_ts        ON reports (timestamp);
+"""
+
+_COLUMNS = "ticker, timestamp, label, score, confidence, path, offset, length"
+
+
+def _normalize_ts(value) -> Optional[str]:
+    """
+    Turn a datetime / date string into the same UTC isoformat the reports use,
+    so plain string comparison in SQLite orders them correctly.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class ReportArchive:
+    """
+    Index of saved reports, stored as index.sqlite next to the JSON files.
+    Paths are kept relative to the output folder so the whole directory
+    can be moved or synced without rebuilding the index.
+    """
+
+    def __init__(self, output_dir: str = "./output"):
+        self.output_dir = output_dir
+        self.index_path = os.path.join(output_dir, INDEX_FILENAME)
+        os.makedirs(output_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # a fresh connection per call keeps this safe to use from threads
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _entry(self, row: sqlite3.Row) -> dict:
+        entry = dict(row)
+        entry["path"] = os.path.join(self.output_dir, entry["path"])
+        return entry
+
+    # ---- writes ----
+
+    def add(self, report: dict, path: str, offset: int = 0, length: Optional[int] = None) -> None:
+        """Record one report. `path` is where its JSON lives, `offset`/`length` the byte range."""
+        if length is None:
+            length = os.path.getsize(path) - offset
+        rel_path = os.path.relpath(path, self.output_dir)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO reports ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    report["ticker"],
+                    _normalize_ts(report["timestamp"]),
+                    report["sentiment_label"],
+                    float(report["sentiment_score"]),
+                    float(report.get("confidence", 0.0)),
+                    rel_path,
+                    offset,
+                    length,
+                ),
+            )
+
+    def rebuild(self) -> int:
+        """
+        Re-index every *.json report already in the output folder.
+        This is the one operation that walks the directory -- it's meant
+        for backfilling an archive that predates the index.
+        """
+        count = 0
+        with self._connect() as conn:
+            conn.execute("DELETE FROM reports")
+        for entry in os.scandir(self.output_dir):
+            if not entry.is_file() or not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    report = json.load(f)
+                self.add(report, entry.path, offset=0, length=entry.stat().st_size)
+                count += 1
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping {entry.name} while rebuilding index: {e}")
+        return count
+
+    # ---- queries ----
+
+    def latest(self, ticker: str) -> Optional[dict]:
+        """Most recent report entry for a ticker, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM reports WHERE ticker = ? "
+                f"ORDER BY timestamp DESC LIMIT 1",
+                (ticker.upper(),),
+            ).fetchone()
+        return self._entry(row) if row else None
+
+    def range(self, ticker: str, since=None, until=None) -> list[dict]:
+        """All entries for a ticker within [since, until), oldest first."""
+        return self.filter(ticker=ticker, since=since, until=until)
+
+    def filter(
+        self,
+        ticker: Optional[str] = None,
+        label: Optional[str] = None,
+        since=None,
+        until=None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Entries matching every given condition, oldest first."""
+        clauses, params = self._where(ticker, label, since, until, min_score, max_score)
+        sql = f"SELECT {_COLUMNS} FROM reports"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            return [self._entry(r) for r in conn.execute(sql, params)]
+
+    def flips(
+        self,
+        label: Optional[str] = None,
+        ticker: Optional[str] = None,
+        since=None,
+        until=None,
+    ) -> list[dict]:
+        """
+        Entries whose label differs from the previous report for the same
+        ticker (e.g. label="NEGATIVE" gives every flip *into* negative).
+        Each entry also carries `previous_label`.
+        """
+        inner_clauses, inner_params = self._where(ticker, None, None, None, None, None)
+        inner = f"SELECT {_COLUMNS}, LAG(label) OVER (PARTITION BY ticker ORDER BY timestamp) AS previous_label FROM reports"
+        if inner_clauses:
+            inner += " WHERE " + " AND ".join(inner_clauses)
+
+        outer_clauses, outer_params = self._where(None, label, since, until, None, None)
+        outer_clauses.insert(0, "previous_label IS NOT NULL AND previous_label != label")
+        sql = f"SELECT * FROM ({inner}) WHERE " + " AND ".join(outer_clauses) + " ORDER BY timestamp"
+        with self._connect() as conn:
+            return [self._entry(r) for r in conn.execute(sql, inner_params + outer_params)]
+
+    def load(self, entry: dict) -> dict:
+        """Read back the full report for an index entry (only touches that file)."""
+        with open(entry["path"], "rb") as f:
+            f.seek(entry["offset"])
+            return json.loads(f.read(entry["length"]))
+
+    @staticmethod
+    def _where(ticker, label, since, until, min_score, max_score) -> tuple[list, list]:
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker.upper())
+        if label:
+            clauses.append("label = ?")
+            params.append(label.upper())
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_normalize_ts(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(_normalize_ts(until))
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(float(min_score))
+        if max_score is not None:
+            clauses.append("score <= ?")
+            params.append(float(max_score))
+        return clauses, params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the saved sentiment report archive")
+    parser.add_argument("--output", "-o", default="./output", help="Report directory (default: ./output)")
+    parser.add_argument("--full", action="store_true", help="Print full reports instead of index entries")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_latest = sub.add_parser("latest", help="Latest report for a ticker")
+    p_latest.add_argument("ticker")
+
+    p_range = sub.add_parser("range", help="Reports for a ticker in a time window")
+    p_range.add_argument("ticker")
+    p_range.add_argument("--since")
+    p_range.add_argument("--until")
+
+    p_filter = sub.add_parser("filter", help="Reports matching label/score/time filters")
+    p_filter.add_argument("--ticker")
+    p_filter.add_argument("--label")
+    p_filter.add_argument("--since")
+    p_filter.add_argument("--until")
+    p_filter.add_argument("--min-score", type=float)
+    p_filter.add_argument("--max-score", type=float)
+    p_filter.add_argument("--limit", type=int)
+
+    p_flips = sub.add_parser("flips", help="Reports whose label changed from the previous run")
+    p_flips.add_argument("--ticker")
+    p_flips.add_argument("--label", help="Only flips into this label")
+    p_flips.add_argument("--since")
+    p_flips.add_argument("--until")
+
+    sub.add_parser("rebuild", help="Re-index every JSON report in the output folder")
+
+    args = parser.parse_args(argv)
+    archive = ReportArchive(args.output)
+
+    if args.command == "rebuild":
+        print(f"Indexed {archive.rebuild()} reports into {archive.index_path}")
+        return
+
+    if args.command == "latest":
+        entry = archive.latest(args.ticker)
+        entries = [entry] if entry else []
+    elif args.command == "range":
+        entries = archive.range(args.ticker, since=args.since, until=args.until)
+    elif args.command == "filter":
+        entries = archive.filter(
+            ticker=args.ticker, label=args.label, since=args.since, until=args.until,
+            min_score=args.min_score, max_score=args.max_score, limit=args.limit,
+        )
+    else:
+        entries = archive.flips(label=args.label, ticker=args.ticker, since=args.since, until=args.until)
+
+    for entry in entries:
+        print(json.dumps(archive.load(entry) if args.full else entry))
+
+
+if __name__ == "__main__":
+    main()
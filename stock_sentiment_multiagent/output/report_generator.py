@@ -1,9 +1,13 @@
 """
-Assembles the final JSON report from all the pieces.
+Assembles the final JSON report from all the pieces and writes it to disk.
 This is just packaging -- no LLM calls happen here.
 """
+import json
+import os
 from datetime import datetime, timezone
+from typing import Optional
 from config.settings import settings
+from output.report_archive import ReportArchive
 
 
 def build_report(
@@ -12,12 +16,16 @@ def build_report(
     aggregation: dict,
     debate: dict,
     summary: str,
+    fast_path: Optional[str] = None,
 ) -> dict:
     """Put together the output dict that gets saved as the JSON report."""
 
     # build per-source section with scores and any extra fields each agent added
     sources = {}
+    missing = []
     for name, result in agent_results.items():
+        if result.get("missing"):
+            missing.append({"source": name, "reason": result["missing"]})
         source_data = {
             "score": result.get("score", 0.0),
             "label": result.get("label", "neutral"),
@@ -26,7 +34,7 @@ def build_report(
         # include extra fields like mentions, buy_count, etc.
         extra_keys = {
             k: v for k, v in result.items()
-            if k not in ("score", "label", "reasoning", "agent", "error")
+            if k not in ("score", "label", "reasoning", "agent", "error", "missing", "fingerprint")
         }
         source_data.update(extra_keys)
         sources[name] = source_data
@@ -38,6 +46,8 @@ def build_report(
         "sentiment_score": aggregation["sentiment_score"],
         "confidence": aggregation["confidence"],
         "sources": sources,
+        # sources the run's deadline cut (confidence is already scaled down for them)
+        "missing_sources": missing,
         "weights": {
             "news_sentiment": settings.weight_news,
             "social_sentiment": settings.weight_social,
@@ -51,4 +61,24 @@ def build_report(
             "key_drivers": debate.get("key_drivers", []),
         },
         "summary": summary,
+        # set when debate and summary were templated instead of written by the LLM (agents/fast_path.py)
+        "fast_path": fast_path,
     }
+
+
+def save_report(report: dict, output_dir: str = "./output") -> str:
+    """
+    Write the report as {ticker}_{timestamp}.json and record it in the
+    archive index so later lookups don't have to walk the folder.
+    Returns the path of the written file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = report["timestamp"].replace(":", "-").replace("+", "_")
+    filepath = os.path.join(output_dir, f"{report['ticker']}_{timestamp}.json")
+
+    payload = json.dumps(report, indent=2).encode("utf-8")
+    with open(filepath, "wb") as f:
+        f.write(payload)
+
+    ReportArchive(output_dir).add(report, filepath, offset=0, length=len(payload))
+    return filepath
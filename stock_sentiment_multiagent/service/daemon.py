@@ -0,0 +1,158 @@
+"""
+Warm worker-pool daemon listening on a Unix-domain socket.
+
+Every `python main.py --ticker X` normally starts cold: fresh imports,
+new HTTP connections, a new LLM client, empty caches. With the daemon
+running, main.py hands the ticker to it over the socket instead (see
+service/daemon_client.py), so a cron-driven single-ticker call only pays
+for the actual network/LLM I/O.
+
+The daemon keeps:
+- the compiled graph and agent singletons,
+- a pool of worker threads, each with its own warm requests.Session,
+- the same ReportCache / single-flight layer as the HTTP service, so
+  duplicate tickers from overlapping cron jobs share one run.
+
+Protocol: one JSON object per line in each direction.
+    -> {"ticker": "AAPL"}          <- {"ok": true, "cache": "miss", "report": {...}}
+    -> {"ticker": "AAPL", "fresh": true}   never served from the cache, only
+                                   coalesced with a run already in flight
+    -> {"command": "ping"}         <- {"ok": true, "workers": 4}
+    -> {"command": "metrics"}      <- {"ok": true, "metrics": "<prometheus text>"}
+Errors come back as {"ok": false, "error": "..."}.
+
+Start it with:
+    python main.py daemon --workers 4
+
+Set METRICS_PORT to also expose Prometheus metrics over HTTP.
+"""
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from config.settings import settings
+from service.report_cache import ReportCache
+from telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker():
+    """Runs once in each pool thread: open its HTTP session and load the heavy modules up front."""
+    from data import http_client
+    from data import news_fetcher, web_fetcher
+
+    http_client.get_session()
+    # touching an attribute makes each lazy module proxy do its import now
+    news_fetcher.bs4.BeautifulSoup, news_fetcher.yf.Ticker, web_fetcher.bs4.BeautifulSoup
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            response = self.server.dispatch(request)
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class SentimentDaemon(socketserver.ThreadingUnixStreamServer):
+    """
+    Accepts connections on a Unix socket; each request is run on the warm
+    worker pool (so at most `workers` pipelines run at once) via ReportCache.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, workers: int = 4, compute: Optional[Callable[[str], dict]] = None):
+        _claim_socket_path(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self.socket_path = socket_path
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sentiment-worker",
+            initializer=_warm_worker if compute is None else None,
+        )
+
+        if compute is None:
+            from agents.orchestrator_agent import OrchestratorAgent
+            from agents.sentiment_graph import get_sentiment_graph
+            get_sentiment_graph()
+            compute = OrchestratorAgent().run
+        run_pipeline = compute
+
+        def pooled(ticker: str) -> dict:
+            return self.pool.submit(run_pipeline, ticker).result()
+
+        self.report_cache = ReportCache(
+            pooled,
+            fresh_seconds=settings.cache_fresh_seconds,
+            stale_seconds=settings.cache_stale_seconds,
+        )
+
+    def dispatch(self, request: dict) -> dict:
+        if request.get("command") == "ping":
+            return {"ok": True, "workers": self.workers}
+        if request.get("command") == "metrics":
+            return {"ok": True, "metrics": metrics.render()}
+        ticker = str(request.get("ticker", "")).upper().strip()
+        if not ticker:
+            return {"ok": False, "error": "Request needs a 'ticker' or 'command'"}
+        report, status, _ = self.report_cache.get(ticker, fresh=bool(request.get("fresh")))
+        return {"ok": True, "cache": status, "report": report}
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _claim_socket_path(socket_path: str):
+    """Remove a stale socket file left by a crashed daemon; refuse if one is still alive."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"A sentiment daemon is already listening on {socket_path}")
+
+
+def _stop_on_sigterm(signum, frame):
+    # let SIGTERM (systemd, kill, timeout) take the same clean-up path as Ctrl+C
+    raise KeyboardInterrupt
+
+
+def run_daemon(socket_path: Optional[str] = None, workers: Optional[int] = None):
+    """Serve until interrupted."""
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
+    socket_path = socket_path or settings.daemon_socket_path
+    workers = workers or settings.daemon_workers
+    server = SentimentDaemon(socket_path, workers)
+    metrics_server = metrics.start_metrics_server(settings.metrics_port, settings.metrics_host)
+    logger.info(f"Sentiment daemon listening on {socket_path} with {workers} warm workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down daemon")
+    finally:
+        server.server_close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
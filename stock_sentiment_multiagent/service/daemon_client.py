@@ -0,0 +1,60 @@
+"""
+Thin client for the sentiment daemon (service/daemon.py).
+
+Deliberately imports nothing heavy: main.py calls request_report() before
+touching the pipeline, and if no daemon is listening it gets None back
+straight away and runs the pipeline in-process as usual.
+"""
+import json
+import logging
+import socket
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _call(socket_path: str, payload: dict, timeout: Optional[float]) -> Optional[dict]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None  # no daemon running
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise ConnectionError(f"Daemon at {socket_path} closed the connection without replying")
+    return json.loads(line)
+
+
+def request_report(
+    ticker: str, socket_path: str, timeout: Optional[float] = None, fresh: bool = False
+) -> Optional[dict]:
+    """
+    Ask the daemon for a report; with `fresh` it runs the pipeline (or joins
+    a run already in flight) instead of answering from its cache. Returns None if no daemon is listening,
+    raises RuntimeError if the daemon ran the ticker and failed, OSError
+    (socket.timeout included) if it doesn't answer within `timeout`, and
+    ValueError if the reply is cut off.
+    """
+    payload = {"ticker": ticker, "fresh": True} if fresh else {"ticker": ticker}
+    response = _call(socket_path, payload, timeout)
+    if response is None:
+        return None
+    if not response.get("ok"):
+        raise RuntimeError(f"Daemon error for {ticker}: {response.get('error')}")
+    logger.info(f"Report for {ticker} served by daemon ({response.get('cache')})")
+    return response["report"]
+
+
+def ping(socket_path: str, timeout: float = 1.0) -> bool:
+    """True if a daemon is up and answering on socket_path."""
+    try:
+        response = _call(socket_path, {"command": "ping"}, timeout)
+    except OSError:
+        return False
+    return bool(response and response.get("ok"))
@@ -0,0 +1,136 @@
+"""
+Small HTTP front-end for the sentiment pipeline (stdlib only).
+
+    GET /sentiment/{ticker}   -> the JSON report
+    GET /healthz              -> {"status": "ok"}
+    GET /metrics              -> Prometheus text format (telemetry/metrics.py)
+
+The process stays up between requests, so the compiled graph, the agent
+instances and the LLM client are built once and reused. Concurrent
+requests for the same ticker share one pipeline run, and recent reports
+are served from ReportCache (see service/report_cache.py). The response
+carries X-Cache (fresh/stale/coalesced/miss) and Age headers.
+
+Start it with:
+    python main.py serve --port 8080
+"""
+import json
+import logging
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from config.settings import settings
+from service.report_cache import ReportCache
+from telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+_TICKER_RE = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+_SENTIMENT_PATH = "/sentiment/"
+
+
+class SentimentRequestHandler(BaseHTTPRequestHandler):
+    """Routes GET requests; the ReportCache lives on the server object."""
+
+    server_version = "StockSentiment/1.0"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+
+        if path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+            return
+
+        if path == "/metrics":
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if not path.startswith(_SENTIMENT_PATH):
+            self._send_json(404, {"error": f"Unknown path: {path}"})
+            return
+
+        ticker = path[len(_SENTIMENT_PATH):].upper()
+        if not _TICKER_RE.match(ticker):
+            self._send_json(400, {"error": f"Invalid ticker: {ticker!r}"})
+            return
+
+        try:
+            report, status, age = self.server.report_cache.get(ticker)
+        except Exception as e:
+            logger.error(f"Pipeline failed for {ticker}: {e}")
+            self._send_json(500, {"error": f"Pipeline failed for {ticker}: {e}"})
+            return
+
+        self._send_json(200, report, headers={"X-Cache": status, "Age": str(int(age))})
+
+    def _send_json(self, code: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # route access logs through logging instead of raw stderr
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class SentimentHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that owns one ReportCache for its whole lifetime."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], report_cache: ReportCache):
+        super().__init__(address, SentimentRequestHandler)
+        self.report_cache = report_cache
+
+
+def build_server(host: str = None, port: int = None, compute=None, output_dir: Optional[str] = None) -> SentimentHTTPServer:
+    """
+    Wire up the server. `compute` defaults to a warm OrchestratorAgent;
+    if `output_dir` is given every freshly computed report is also saved
+    (and indexed) there.
+    """
+    if compute is None:
+        from agents.orchestrator_agent import OrchestratorAgent
+        compute = OrchestratorAgent().run
+
+    if output_dir:
+        from output.report_generator import save_report
+        run_pipeline = compute
+
+        def compute(ticker: str) -> dict:
+            report = run_pipeline(ticker)
+            save_report(report, output_dir)
+            return report
+
+    cache = ReportCache(
+        compute,
+        fresh_seconds=settings.cache_fresh_seconds,
+        stale_seconds=settings.cache_stale_seconds,
+    )
+    host = settings.server_host if host is None else host
+    port = settings.server_port if port is None else port
+    return SentimentHTTPServer((host, port), cache)
+
+
+def serve(host: str = None, port: int = None, output_dir: Optional[str] = None):
+    """Run the HTTP server until interrupted."""
+    server = build_server(host, port, output_dir=output_dir)
+    bound_host, bound_port = server.server_address[:2]
+    logger.info(f"Serving sentiment reports on http://{bound_host}:{bound_port}/sentiment/{{ticker}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down HTTP server")
+    finally:
+        server.server_close()
@@ -0,0 +1,148 @@
+"""
+Multi-core universe scan: shard tickers across worker processes.
+
+One process spends a surprising share of each ticker on CPU -- BeautifulSoup
+parsing, yfinance/pandas, JSON -- so a nightly scan of a couple of thousand
+tickers leaves most cores idle behind the GIL. `python main.py --ticker ...
+--workers N` runs them on a pool of N spawned processes instead.
+
+Each worker:
+- starts from the parent's settings (so overrides made in-process, like
+  the benchmark's fake base URLs, carry over),
+- builds its own graph, HTTP sessions, LLM / Finnhub clients, circuit
+  breakers and latency trackers once, up front, and keeps them warm for
+  every ticker it gets,
+- paces its LLM and Finnhub calls against rate-limit slots in shared
+  memory (utils/rate_limit.py), so the pool shares one budget per key
+  rather than each process assuming it has the key to itself,
+- inherits whatever is left of the caller's deadline (utils/deadline.py),
+  as an absolute wall-clock expiry.
+
+scan() yields (ticker, response) in input order, whatever order the
+workers finish in. The response follows the daemon's convention:
+{"ok": True, "report": {...}} or {"ok": False, "error": "..."}, so one bad
+ticker doesn't sink the scan. That includes a worker process dying outright
+(OOM kill, a segfault in a C extension): the tickers in flight on the pool
+at the time come back as errors, and the scan carries on with a fresh pool.
+At most 2 x workers tickers are in flight, which bounds what one crash costs.
+
+The cassette and profiler are per process, so --record / --replay /
+--profile don't combine with --workers. Only the ticker counters and
+pipeline timings make it back into the parent's metrics.
+"""
+import functools
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, Optional
+
+from config.settings import settings
+from telemetry.metrics import PIPELINE_SECONDS, TICKERS
+from utils import deadline, rate_limit
+
+logger = logging.getLogger(__name__)
+
+# per worker process, set up once by _init_worker
+_orchestrator = None
+_expires_at: Optional[float] = None
+
+
+def _init_worker(overrides: dict, limiter_slots: dict, expires_at: Optional[float], setup: Optional[Callable]):
+    global _orchestrator, _expires_at
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    rate_limit.adopt_shared(limiter_slots)
+
+    from agents.orchestrator_agent import OrchestratorAgent
+    from agents.sentiment_graph import get_sentiment_graph
+    from models.gemini_client import gemini_client
+    from service.daemon import _warm_worker
+
+    # the shared LLM client read LLM_PROVIDER at import, before the overrides
+    gemini_client.provider = settings.llm_provider.lower()
+    if setup is not None:
+        setup()
+    get_sentiment_graph()
+    _warm_worker()
+    _orchestrator = OrchestratorAgent()
+    _expires_at = expires_at
+
+
+def _run_one(ticker: str, run_id: Optional[str] = None) -> dict:
+    budget = None
+    if _expires_at is not None:
+        # within() reads <= 0 as "no limit", so a deadline that already passed becomes a tiny one
+        budget = max(_expires_at - time.time(), 1e-6)
+    try:
+        return {"ok": True, "report": _orchestrator.run(ticker, deadline=budget, run_id=run_id)}
+    except Exception as e:
+        logger.error(f"Worker failed on {ticker}: {e}")
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def scan(
+    tickers: list[str],
+    workers: int,
+    setup: Optional[Callable[[], None]] = None,
+    run_id: Optional[str] = None,
+) -> Iterator[tuple[str, dict]]:
+    """
+    Run every ticker on a pool of `workers` processes and yield (ticker,
+    response) in input order. `setup` (a picklable, module-level callable)
+    runs once in each worker after its settings are in place. With a
+    `run_id` the workers checkpoint (and resume) like OrchestratorAgent.run.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    left = deadline.remaining()
+    expires_at = time.time() + left if left is not None else None
+    initargs = (settings.model_dump(), rate_limit.share_limiters(ctx), expires_at, setup)
+
+    logger.info(f"Scanning {len(tickers)} tickers on {workers} worker processes")
+    new_pool = functools.partial(
+        ProcessPoolExecutor, max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=initargs,
+    )
+    run_one = functools.partial(_run_one, run_id=run_id)
+    pool = new_pool()
+    pending = deque()  # (ticker, future, the pool it went to), in input order
+    queue = iter(tickers)
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                ticker = next(queue, None)
+                if ticker is None:
+                    break
+                try:
+                    future = pool.submit(run_one, ticker)
+                except BrokenProcessPool:
+                    pool = _replace(pool, new_pool)
+                    future = pool.submit(run_one, ticker)
+                pending.append((ticker, future, pool))
+            if not pending:
+                break
+
+            ticker, future, owner = pending.popleft()
+            try:
+                response = future.result()
+            except BrokenProcessPool as e:
+                logger.error(f"A worker process died while {ticker} was in flight: {e}")
+                response = {"ok": False, "error": f"BrokenProcessPool: worker process died ({e})"}
+                if owner is pool:
+                    pool = _replace(pool, new_pool)
+            # the workers' own metrics stay in the workers; count the outcome here
+            if response["ok"]:
+                TICKERS.inc(status="ok")
+                PIPELINE_SECONDS.observe(response["report"].get("timings", {}).get("total_seconds", 0.0))
+            else:
+                TICKERS.inc(status="error")
+            yield ticker, response
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _replace(pool: ProcessPoolExecutor, new_pool: Callable[[], ProcessPoolExecutor]) -> ProcessPoolExecutor:
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning("Worker pool broken, starting a new one")
+    return new_pool()
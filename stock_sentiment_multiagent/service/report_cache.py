@@ -0,0 +1,151 @@
+"""
+In-process report cache for the long-running modes.
+
+Two pieces:
+- SingleFlight: if five requests for NVDA arrive while an NVDA run is
+  already in progress, they all wait on that one run instead of each
+  launching their own pipeline (and burning five times the LLM quota).
+- ReportCache: keeps the last report per ticker. Within `fresh_seconds`
+  it's served as-is; within the following `stale_seconds` it's still
+  served immediately but a background refresh is kicked off
+  (stale-while-revalidate). Older than that, the caller waits for a new run.
+  A caller that asks for `fresh` skips the stored report altogether and
+  only shares a run that is already in flight.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from telemetry.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight computation that any number of callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto a single execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], object]) -> tuple[object, bool]:
+        """
+        Run fn() unless a call for `key` is already running, in which case
+        wait for that one. Returns (result, shared) where shared=True means
+        this caller piggybacked on someone else's run.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    def do_background(self, key: str, fn: Callable[[], object]) -> bool:
+        """Start fn() on a daemon thread unless `key` is already in flight. Returns True if started."""
+        with self._lock:
+            if key in self._calls:
+                return False
+
+        def _runner():
+            try:
+                self.do(key, fn)
+            except Exception as e:
+                logger.error(f"Background refresh for {key} failed: {e}")
+
+        threading.Thread(target=_runner, name=f"refresh-{key}", daemon=True).start()
+        return True
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class ReportCache:
+    """
+    Per-ticker report cache with stale-while-revalidate, backed by SingleFlight.
+    `compute(ticker)` is whatever produces a fresh report (normally
+    OrchestratorAgent().run).
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[str], dict],
+        fresh_seconds: float = 300,
+        stale_seconds: float = 1800,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._compute = compute
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, dict]] = {}
+
+    def get(self, ticker: str, fresh: bool = False) -> tuple[dict, str, float]:
+        """
+        Returns (report, status, age_seconds). With fresh=True the stored
+        report is never served: the result is "coalesced" or "miss".
+        status is one of:
+        "fresh"     -- served from cache
+        "stale"     -- served from cache, refresh running in the background
+        "coalesced" -- waited on a run another request had already started
+        "miss"      -- this request ran the pipeline
+        """
+        report, status, age = self._lookup(ticker, fresh)
+        CACHE_REQUESTS.inc(cache="report", result=status)
+        return report, status, age
+
+    def _lookup(self, ticker: str, fresh: bool) -> tuple[dict, str, float]:
+        ticker = ticker.upper().strip()
+        now = self._clock()
+        with self._lock:
+            entry = None if fresh else self._entries.get(ticker)
+
+        if entry is not None:
+            stored_at, report = entry
+            age = now - stored_at
+            if age < self.fresh_seconds:
+                return report, "fresh", age
+            if age < self.fresh_seconds + self.stale_seconds:
+                self._flight.do_background(ticker, lambda: self._refresh(ticker))
+                return report, "stale", age
+
+        report, shared = self._flight.do(ticker, lambda: self._refresh(ticker))
+        return report, "coalesced" if shared else "miss", 0.0
+
+    def _refresh(self, ticker: str) -> dict:
+        report = self._compute(ticker)
+        with self._lock:
+            self._entries[ticker] = (self._clock(), report)
+        return report
+
+    def invalidate(self, ticker: str) -> None:
+        with self._lock:
+            self._entries.pop(ticker.upper().strip(), None)
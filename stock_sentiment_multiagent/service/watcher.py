@@ -0,0 +1,230 @@
+"""
+Continuous watch mode: keep a watchlist fresh without rerunning all of it.
+
+Cron reruns every ticker every N minutes whether or not anything moved,
+and most of those runs spend LLM calls to arrive at yesterday's answer.
+`python main.py watch --ticker ...` instead keeps a priority queue of
+tickers and, each time one comes up:
+
+1. runs a cheap probe -- headlines and the ApeWisdom rank, plain fetches,
+   no LLM, past the negative cache (data/negative_cache.py),
+2. compares it with the inputs the last full run saw, and runs the full
+   graph only if they changed materially (enough new headlines and/or
+   rank movement, WATCH_CHANGE_THRESHOLD) or the last report is older
+   than WATCH_MAX_AGE_SECONDS,
+3. puts the ticker back, due again sooner the higher its priority.
+
+Priority adds up four signals, each roughly 0..1:
+- staleness: age of the last report / WATCH_MAX_AGE_SECONDS,
+- news: share of the probed headlines the last full run hadn't seen,
+- rank: ApeWisdom's 24h rank change / WATCH_RANK_SCALE,
+- volatility: spread of the recent scores / WATCH_VOLATILITY_SCALE.
+A ticker is probed every WATCH_INTERVAL_SECONDS / (1 + priority), never
+more often than WATCH_MIN_INTERVAL_SECONDS; when several are due at once
+the highest priority goes first.
+
+On startup the last report time and recent scores come from the report
+archive (output/report_archive.py), so a restart doesn't rerun everything.
+"""
+import heapq
+import logging
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from config.settings import settings
+from telemetry.metrics import WATCH_PROBES
+
+logger = logging.getLogger(__name__)
+
+# scores kept per ticker for the volatility signal
+HISTORY = 5
+
+
+@dataclass
+class Watched:
+    ticker: str
+    last_run: Optional[float] = None          # wall-clock time of the latest report
+    headlines: frozenset = frozenset()        # what the latest full run saw
+    rank: Optional[int] = None
+    scores: list = field(default_factory=list)
+    priority: float = 0.0
+    due_at: float = 0.0                       # next probe; older heap entries for the ticker are ignored
+
+
+def probe(ticker: str) -> dict:
+    """The cheap, LLM-free look at a ticker's inputs."""
+    from data.negative_cache import bypassed
+    from data.news_fetcher import fetch_all_headlines
+    from data.social_fetcher import fetch_apewisdom
+
+    # a cached "not trending" / "no headlines" would hide exactly the change we're probing for
+    with bypassed():
+        social = fetch_apewisdom(ticker)
+        headlines = fetch_all_headlines(ticker)
+    return {
+        "headlines": headlines,
+        "rank": social.get("rank", 999),
+        "rank_change": social.get("rank_change", 0),
+    }
+
+
+class Watcher:
+    def __init__(
+        self,
+        tickers: list[str],
+        compute: Optional[Callable[[str], dict]] = None,
+        probe_fn: Callable[[str], dict] = probe,
+        output_dir: str = "./output",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.output_dir = output_dir
+        self.probe = probe_fn
+        self._clock = clock
+        self._stopping = threading.Event()
+        if compute is None:
+            from agents.orchestrator_agent import OrchestratorAgent
+            compute = OrchestratorAgent().run
+        self.compute = compute
+
+        self.watched = {t.upper(): Watched(t.upper()) for t in tickers}
+        self._seed_from_archive()
+        # (due_at, -priority, ticker): everything is due straight away
+        now = self._clock()
+        self._heap = []
+        for w in self.watched.values():
+            w.due_at = now
+            self._heap.append((now, 0.0, w.ticker))
+        heapq.heapify(self._heap)
+
+    def _seed_from_archive(self) -> None:
+        from output.report_archive import ReportArchive
+
+        try:
+            archive = ReportArchive(self.output_dir)
+            for w in self.watched.values():
+                entries = archive.range(w.ticker)[-HISTORY:]
+                if entries:
+                    w.last_run = datetime.fromisoformat(entries[-1]["timestamp"]).timestamp()
+                    w.scores = [e["score"] for e in entries]
+        except Exception as e:
+            logger.warning(f"Couldn't read the report archive, starting cold: {e}")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self, max_probes: Optional[int] = None) -> int:
+        """Probe (and refresh) tickers as they come due until stopped. Returns how many full runs happened."""
+        refreshed = probes = 0
+        while not self._stopping.is_set() and self._heap:
+            due_at = self._heap[0][0]
+            wait = due_at - self._clock()
+            if wait > 0:
+                self._stopping.wait(wait)
+                continue
+            due_at, _, ticker = heapq.heappop(self._heap)
+            if due_at != self.watched[ticker].due_at:
+                continue  # rescheduled since (step() called directly)
+            refreshed += self.step(ticker)
+            probes += 1
+            if max_probes is not None and probes >= max_probes:
+                break
+        return refreshed
+
+    def step(self, ticker: str) -> bool:
+        """Probe one ticker, refresh it if its inputs moved, and schedule its next probe."""
+        w = self.watched[ticker]
+        now = self._clock()
+        try:
+            seen = self.probe(ticker)
+        except Exception as e:
+            logger.error(f"[watch] probe failed for {ticker}: {e}")
+            WATCH_PROBES.inc(outcome="error")
+            self._schedule(w, now)
+            return False
+
+        if w.last_run is not None and w.rank is None:
+            # report from before this process started: its inputs weren't kept, so this probe is the baseline
+            w.headlines, w.rank = frozenset(seen.get("headlines") or []), seen.get("rank", 999)
+
+        signals = self.signals(w, seen, now)
+        w.priority = sum(signals.values())
+        change = signals["news"] + self._rank_drift(w, seen)
+        reason = None
+        if w.last_run is None:
+            reason = "no report yet"
+        elif signals["staleness"] >= 1.0:
+            reason = "stale"
+        elif change >= settings.watch_change_threshold:
+            reason = f"inputs moved ({change:.2f})"
+
+        refreshed = False
+        if reason is None:
+            logger.info(f"[watch] {ticker} unchanged (priority {w.priority:.2f})")
+            WATCH_PROBES.inc(outcome="skip")
+        else:
+            logger.info(f"[watch] refreshing {ticker}: {reason}")
+            refreshed = self._refresh(w, seen)
+            # the fresh report resets staleness and news
+            signals = self.signals(w, seen, self._clock())
+            w.priority = sum(signals.values())
+        self._schedule(w, self._clock())
+        return refreshed
+
+    def signals(self, w: Watched, seen: dict, now: float) -> dict:
+        headlines = seen.get("headlines") or []
+        new = [h for h in headlines if h not in w.headlines]
+        return {
+            "staleness": 1.0 if w.last_run is None else (now - w.last_run) / settings.watch_max_age_seconds,
+            "news": len(new) / len(headlines) if headlines else 0.0,
+            "rank": min(1.0, abs(seen.get("rank_change", 0)) / settings.watch_rank_scale),
+            "volatility": (
+                min(1.0, statistics.pstdev(w.scores) / settings.watch_volatility_scale) if len(w.scores) > 1 else 0.0
+            ),
+        }
+
+    @staticmethod
+    def _rank_drift(w: Watched, seen: dict) -> float:
+        # rank movement since the last full run (999 = not trending)
+        if w.rank is None:
+            return 0.0
+        return min(1.0, abs(seen.get("rank", 999) - w.rank) / settings.watch_rank_scale)
+
+    def _refresh(self, w: Watched, seen: dict) -> bool:
+        from output.report_generator import save_report
+
+        from data.negative_cache import bypassed
+
+        try:
+            # and the full run shouldn't skip a source the probe just saw data at
+            with bypassed():
+                report = self.compute(w.ticker)
+        except Exception as e:
+            logger.error(f"[watch] full run failed for {w.ticker}: {e}")
+            WATCH_PROBES.inc(outcome="error")
+            return False
+        save_report(report, self.output_dir)
+        w.last_run = self._clock()
+        w.headlines = frozenset(seen.get("headlines") or [])
+        w.rank = seen.get("rank", 999)
+        w.scores = (w.scores + [report.get("sentiment_score", 0.0)])[-HISTORY:]
+        WATCH_PROBES.inc(outcome="refresh")
+        return True
+
+    def _schedule(self, w: Watched, now: float) -> None:
+        delay = max(settings.watch_min_interval_seconds, settings.watch_interval_seconds / (1.0 + w.priority))
+        w.due_at = now + delay
+        heapq.heappush(self._heap, (w.due_at, -w.priority, w.ticker))
+
+
+def watch(tickers: list[str], output_dir: str = "./output") -> None:
+    """Entry point for `python main.py watch`: runs until Ctrl+C."""
+    watcher = Watcher(tickers, output_dir=output_dir)
+    logger.info(f"Watching {len(watcher.watched)} tickers (Ctrl+C to stop)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Watch stopped")
@@ -0,0 +1,278 @@
+"""
+Process-wide metrics in Prometheus text format.
+
+Most numbers come for free from the timing spans (telemetry/spans.py):
+a listener turns every finished node / fetch / llm span into histogram
+observations and counters. A few things spans can't see are counted
+directly where they happen -- agent failures caught by
+BaseAgent._safe_run, 429 responses inside LLMClient, ReportCache
+hits/misses, circuit breaker state, and finished tickers.
+
+Where it's exposed:
+    main.py serve        GET /metrics on the same port
+    main.py daemon       its own /metrics port (METRICS_PORT, 0 = off)
+    CLI runs             written to <output>/metrics.prom at the end, in the
+                         format node_exporter's textfile collector reads
+"""
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from telemetry.spans import Span, add_span_listener
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_str(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_one(key, value))
+        return lines
+
+    def _render_one(self, key: tuple, value) -> list[str]:
+        return [f"{self.name}{_label_str(self.label_names, key)} {_fmt(value)}"]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """Sum across every label combination."""
+        with self._lock:
+            return sum(self._values.values())
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def _render_one(self, key: tuple, state: dict) -> list[str]:
+        lines = []
+        for bound, count in zip(self.buckets, state["counts"]):
+            le = _label_str(self.label_names, key, f'le="{_fmt(float(bound))}"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+        inf = _label_str(self.label_names, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{inf} {state['count']}")
+        labels = _label_str(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_fmt(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+TICKERS = registry.register(Counter(
+    "sentiment_tickers_total", "Tickers that finished the pipeline", ("status",)))
+PIPELINE_SECONDS = registry.register(Histogram(
+    "sentiment_pipeline_seconds", "Wall time of one full ticker run"))
+NODE_SECONDS = registry.register(Histogram(
+    "sentiment_node_seconds", "Wall time per graph node", ("node",)))
+FETCH_SECONDS = registry.register(Histogram(
+    "sentiment_fetch_seconds", "Wall time per data-source call", ("source",)))
+FETCH_TOTAL = registry.register(Counter(
+    "sentiment_fetch_total", "Data-source calls", ("source", "status")))
+FETCH_BYTES = registry.register(Counter(
+    "sentiment_fetch_bytes_total", "Bytes downloaded per data source", ("source",)))
+LLM_SECONDS = registry.register(Histogram(
+    "sentiment_llm_seconds", "LLM call latency including retries", ("provider",)))
+LLM_REQUESTS = registry.register(Counter(
+    "sentiment_llm_requests_total", "LLM calls", ("provider", "status")))
+LLM_RATE_LIMITED = registry.register(Counter(
+    "sentiment_llm_rate_limited_total", "429 / RESOURCE_EXHAUSTED responses from the LLM provider", ("provider",)))
+LLM_TOKENS = registry.register(Counter(
+    "sentiment_llm_tokens_total", "LLM tokens used (type=estimated_prompt: our local estimate of the prompt)", ("provider", "type")))
+LLM_SLEEP_SECONDS = registry.register(Counter(
+    "sentiment_llm_backoff_seconds_total", "Time spent sleeping in LLM rate-limit backoff", ("provider",)))
+AGENT_FAILURES = registry.register(Counter(
+    "sentiment_agent_failures_total", "Agent runs that raised and fell back to neutral", ("agent",)))
+CACHE_REQUESTS = registry.register(Counter(
+    "sentiment_cache_requests_total", "Report cache lookups by outcome", ("cache", "result")))
+BREAKER_STATE = registry.register(Gauge(
+    "sentiment_breaker_state", "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)", ("upstream",)))
+HTTP_TIMEOUT_RETRIES = registry.register(Counter(
+    "sentiment_http_timeout_retries_total", "Requests cut short by the adaptive timeout and retried at the ceiling", ("host",)))
+BREAKER_REJECTIONS = registry.register(Counter(
+    "sentiment_breaker_rejections_total", "Calls refused because the upstream's circuit was open", ("upstream",)))
+DEADLINE_MISSES = registry.register(Counter(
+    "sentiment_deadline_misses_total", "Agents left out of a report because the run's deadline passed", ("agent",)))
+RATE_LIMIT_WAIT_SECONDS = registry.register(Counter(
+    "sentiment_rate_limit_wait_seconds_total", "Time spent waiting for a client-side rate limit slot", ("limiter",)))
+QUEUE_TASKS = registry.register(Counter(
+    "sentiment_queue_tasks_total", "Work-queue tasks this worker finished, by outcome", ("queue", "outcome")))
+NEGATIVE_CACHE_HITS = registry.register(Counter(
+    "sentiment_negative_cache_hits_total", "Fetches skipped because the source is known to have no data for the ticker", ("source",)))
+MEMO_LOOKUPS = registry.register(Counter(
+    "sentiment_memo_lookups_total", "Memoized node lookups by outcome (hit = LLM call skipped)", ("node", "outcome")))
+FAST_PATHS = registry.register(Counter(
+    "sentiment_fast_paths_total", "Runs whose debate and summary were templated instead of LLM-written", ("reason",)))
+DISTILLED_SCORES = registry.register(Counter(
+    "sentiment_distilled_scores_total", "Distilled-model scoring attempts (local = LLM call saved, escalated = sent to the LLM)", ("agent", "outcome")))
+DEBATE_ADVOCATES = registry.register(Counter(
+    "sentiment_debate_advocate_calls_total", "Structured-debate advocate calls, by side and outcome (ok, timeout, error)", ("side", "outcome")))
+WATCH_PROBES = registry.register(Counter(
+    "sentiment_watch_probes_total", "Watch-mode probes, by outcome (refresh, skip, error)", ("outcome",)))
+
+
+def _observe_span(s: Span) -> None:
+    """Span listener: turn finished spans into metric updates."""
+    status = "error" if "error" in s.attrs else "ok"
+    if s.kind == "node":
+        NODE_SECONDS.observe(s.seconds, node=s.name)
+    elif s.kind == "fetch":
+        FETCH_SECONDS.observe(s.seconds, source=s.name)
+        FETCH_TOTAL.inc(source=s.name, status=status)
+        if s.attrs.get("bytes"):
+            FETCH_BYTES.inc(s.attrs["bytes"], source=s.name)
+    elif s.kind == "llm":
+        provider = s.attrs.get("provider", "unknown")
+        LLM_SECONDS.observe(s.seconds, provider=provider)
+        LLM_REQUESTS.inc(provider=provider, status=status)
+        for token_type in ("prompt", "completion", "estimated_prompt"):
+            if s.attrs.get(f"{token_type}_tokens"):
+                LLM_TOKENS.inc(s.attrs[f"{token_type}_tokens"], provider=provider, type=token_type)
+        if s.attrs.get("sleep_seconds"):
+            LLM_SLEEP_SECONDS.inc(s.attrs["sleep_seconds"], provider=provider)
+
+
+add_span_listener(_observe_span)
+
+
+def render() -> str:
+    return registry.render()
+
+
+def write_textfile(path: str) -> str:
+    """Dump the current metrics to `path` atomically (tmp file + rename)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics on a background thread (for modes that have no HTTP server
+    of their own). Local-only unless `host` (METRICS_HOST) says otherwise.
+    """
+    if not port:
+        return None
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
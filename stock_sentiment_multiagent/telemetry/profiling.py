@@ -0,0 +1,225 @@
+"""
+Opt-in CPU and memory profiling per graph node and per fetcher.
+
+`python main.py --ticker A B --profile` activates a SpanProfiler. It rides on
+the timing spans (telemetry/spans.py): every node / fetch span gets its own
+cProfile.Profile and its own tracemalloc window. Both are exclusive --
+while a fetch span runs, the enclosing node's profiler is paused -- so a
+fetcher's parsing cost shows up under the fetcher and not twice.
+Whatever runs outside any node (LangGraph's own scheduling) lands in the
+per-ticker "run" profile.
+
+tracemalloc is restarted for every window rather than left running and
+diffed: once the first run has imported LangGraph, pandas and friends a
+full-process snapshot holds ~600k traces and takes tens of seconds to
+compare, while a per-window snapshot only holds what that span allocated
+and was still holding when it ended.
+
+Output, under <output>/profiles/<stamp>/:
+    <TICKER>/NN_<kind>.<name>.pstats      load with pstats / snakeviz
+    <TICKER>/NN_<kind>.<name>.alloc.txt   top allocation sites still alive at span exit
+    <TICKER>/stacks.collapsed             span path + function self time, for flamegraph.pl / speedscope
+    <TICKER>/memory.json                  cpu seconds, allocated / peak bytes per span
+    summary.txt                           top-N hot functions across the whole run
+
+cProfile is per thread and tracemalloc is process-wide, so this is meant
+for the sequential CLI run, not for serve/daemon.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from telemetry.spans import Span, add_span_listener, remove_span_listener
+
+logger = logging.getLogger(__name__)
+
+PROFILED_KINDS = ("node", "fetch")
+TOP_N = 25
+_ALLOC_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+class _Frame:
+    """One profiled span (or the per-ticker root) while it's open."""
+
+    def __init__(self, label: str, path: str):
+        self.label = label
+        self.path = path
+        self.profile = cProfile.Profile()
+        self.allocated = 0
+        self.peak = 0
+        # "file:line" -> [bytes, blocks], summed over this frame's tracemalloc windows
+        self.sites: dict[str, list[int]] = {}
+
+    def resume(self, trace_memory: bool) -> None:
+        if trace_memory:
+            tracemalloc.start()
+        self.profile.enable()
+
+    def pause(self, trace_memory: bool) -> None:
+        self.profile.disable()
+        if not trace_memory:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOC_FILTERS)
+        tracemalloc.stop()
+        self.allocated += current
+        self.peak = max(self.peak, peak)
+        for stat in snapshot.statistics("lineno"):
+            site = self.sites.setdefault(str(stat.traceback), [0, 0])
+            site[0] += stat.size
+            site[1] += stat.count
+
+
+class SpanProfiler:
+    def __init__(self, output_dir: str, top: int = TOP_N, trace_memory: bool = True):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.output_dir = os.path.join(output_dir, "profiles", stamp)
+        self.top = top
+        self.trace_memory = trace_memory
+        self._local = threading.local()
+        self._combined: Optional[pstats.Stats] = None
+        self.tickers: list[str] = []
+
+    # ---- frame stack (per thread) ----
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, label: str, path: str) -> None:
+        stack = self._stack()
+        if stack:
+            stack[-1].pause(self.trace_memory)
+        frame = _Frame(label, path)
+        stack.append(frame)
+        frame.resume(self.trace_memory)
+
+    def _pop(self) -> _Frame:
+        stack = self._stack()
+        frame = stack.pop()
+        frame.pause(self.trace_memory)
+        return frame
+
+    # ---- span hooks ----
+
+    def _on_start(self, s: Span) -> None:
+        stack = self._stack()
+        # only spans inside a profiled ticker, on the thread running it
+        if s.kind not in PROFILED_KINDS or not stack:
+            return
+        self._push(f"{s.kind}.{s.name}", f"{stack[-1].path};{s.kind}:{s.name}")
+
+    def _on_end(self, s: Span) -> None:
+        stack = self._stack()
+        if s.kind not in PROFILED_KINDS or len(stack) < 2:
+            return
+        self._finish(self._pop())
+        stack[-1].resume(self.trace_memory)
+
+    # ---- per ticker ----
+
+    @contextmanager
+    def ticker(self, ticker: str):
+        """Profile one ticker run; its files are written when the block exits."""
+        self._ticker_dir = os.path.join(self.output_dir, ticker)
+        os.makedirs(self._ticker_dir, exist_ok=True)
+        self._results: list[dict] = []
+        self._collapsed: dict[str, float] = {}
+        self._push("run", f"run:{ticker}")
+        try:
+            yield
+        finally:
+            # unwind anything an exception left open, then the root itself
+            while self._stack():
+                self._finish(self._pop())
+            self._write_ticker_files()
+            self.tickers.append(ticker)
+
+    def _finish(self, frame: _Frame) -> None:
+        """Write one closed frame's files (called with profiling and tracing paused)."""
+        name = f"{len(self._results):02d}_{frame.label}"
+        frame.profile.create_stats()
+        stats = pstats.Stats(frame.profile)
+        stats.dump_stats(os.path.join(self._ticker_dir, f"{name}.pstats"))
+        if self._combined is None:
+            self._combined = pstats.Stats(frame.profile)
+        else:
+            self._combined.add(frame.profile)
+
+        # collapsed stacks: the span path as the stack prefix, each function's self time as the leaf
+        for (filename, line, func), (_, _, tottime, _, _) in stats.stats.items():
+            if tottime > 0:
+                key = f"{frame.path};{os.path.basename(filename)}:{func}"
+                self._collapsed[key] = self._collapsed.get(key, 0.0) + tottime
+
+        entry = {"span": frame.label, "file": f"{name}.pstats", "cpu_seconds": round(stats.total_tt, 6)}
+        if self.trace_memory:
+            top_sites = sorted(frame.sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+            with open(os.path.join(self._ticker_dir, f"{name}.alloc.txt"), "w") as f:
+                for site, (size, count) in top_sites:
+                    f.write(f"{site}: size={size / 1024:.1f} KiB, count={count}\n")
+            entry["allocated_bytes"] = frame.allocated
+            entry["peak_bytes"] = frame.peak
+        self._results.append(entry)
+
+    def _write_ticker_files(self) -> None:
+        with open(os.path.join(self._ticker_dir, "stacks.collapsed"), "w") as f:
+            for key, seconds in sorted(self._collapsed.items()):
+                # flamegraph tools want integer sample counts -- use microseconds
+                micros = int(seconds * 1_000_000)
+                if micros:
+                    f.write(f"{key} {micros}\n")
+        with open(os.path.join(self._ticker_dir, "memory.json"), "w") as f:
+            json.dump(self._results, f, indent=2)
+
+    # ---- whole run ----
+
+    def summary(self) -> str:
+        """Top-N functions by self time and by cumulative time across every profiled span."""
+        if self._combined is None:
+            return "No profiles recorded.\n"
+        out = io.StringIO()
+        out.write(f"Profiled {len(self.tickers)} ticker(s): {', '.join(self.tickers)}\n\n")
+        stats = pstats.Stats(stream=out)
+        stats.add(self._combined)
+        stats.strip_dirs()
+        out.write(f"== top {self.top} by self time ==\n")
+        stats.sort_stats("tottime").print_stats(self.top)
+        out.write(f"== top {self.top} by cumulative time ==\n")
+        stats.sort_stats("cumulative").print_stats(self.top)
+        return out.getvalue()
+
+    def write_summary(self) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, "summary.txt")
+        with open(path, "w") as f:
+            f.write(self.summary())
+        return path
+
+
+@contextmanager
+def profile_run(output_dir: str, top: int = TOP_N, trace_memory: bool = True):
+    """Install a SpanProfiler for the block and write the run summary at the end. Yields it."""
+    if trace_memory and tracemalloc.is_tracing():
+        # we restart tracemalloc per span, which would clobber whoever started it
+        logger.warning("tracemalloc is already tracing; profiling CPU only")
+        trace_memory = False
+    profiler = SpanProfiler(output_dir, top=top, trace_memory=trace_memory)
+    add_span_listener(profiler._on_start, on_start=True)
+    add_span_listener(profiler._on_end)
+    try:
+        yield profiler
+    finally:
+        remove_span_listener(profiler._on_start)
+        remove_span_listener(profiler._on_end)
+        logger.info(f"Profile summary written to {profiler.write_summary()}")
@@ -0,0 +1,259 @@
+"""
+Lightweight timing spans for a pipeline run.
+
+Wrap a unit of work in `span(...)` (or decorate it with `@traced(...)`)
+and, if a recorder is active, its wall time and any attributes the code
+attaches (bytes downloaded, prompt/completion tokens, retries, backoff
+sleep) are captured. OrchestratorAgent.run activates a recorder per
+ticker and attaches its summary to the report under "timings".
+
+Three kinds of spans are used:
+    node   -- a LangGraph node (news, social, ..., report)
+    fetch  -- one data-source call (finviz, yahoo_news, apewisdom, ...)
+    llm    -- one LLMClient.generate call, including its 429 retries
+
+When no recorder is active (unit tests, ad-hoc calls) spans still work
+but nothing is kept.
+"""
+import functools
+import logging
+import math
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# numeric attributes that get summed into the per-kind totals
+_SUMMED_ATTRS = ("bytes", "prompt_tokens", "estimated_prompt_tokens", "completion_tokens", "retries", "sleep_seconds")
+
+
+class Span:
+    """One timed unit of work. `attrs` holds whatever the instrumented code recorded."""
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], start: float, attrs: dict):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.start = start
+        self.seconds = 0.0
+        self.attrs = attrs
+
+    def add(self, key: str, amount) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def as_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "parent": self.parent.name if self.parent else None,
+            "start": round(self.start - origin, 4),
+            "seconds": round(self.seconds, 4),
+            **self.attrs,
+        }
+
+
+class SpanRecorder:
+    """Collects the spans finished while it's active (thread-safe)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def _add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def summary(self) -> dict:
+        """Report-ready dict: totals per node, per kind, and the raw span list."""
+        end = self.finished or time.perf_counter()
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s.start)
+
+        nodes = {}
+        by_kind = {}
+        for s in spans:
+            if s.kind == "node":
+                nodes[s.name] = round(nodes.get(s.name, 0.0) + s.seconds, 4)
+                continue
+            totals = by_kind.setdefault(s.kind, {"calls": 0, "seconds": 0.0})
+            totals["calls"] += 1
+            totals["seconds"] += s.seconds
+            for key in _SUMMED_ATTRS:
+                if key in s.attrs:
+                    totals[key] = totals.get(key, 0) + s.attrs[key]
+        for totals in by_kind.values():
+            for key, value in totals.items():
+                if isinstance(value, float):
+                    totals[key] = round(value, 4)
+
+        return {
+            "total_seconds": round(end - self.started, 4),
+            "nodes": nodes,
+            **by_kind,
+            "spans": [s.as_dict(self.started) for s in spans],
+        }
+
+
+_recorder: ContextVar[Optional[SpanRecorder]] = ContextVar("span_recorder", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# called with every finished span, recorder or not (telemetry/metrics.py hooks in here)
+_listeners: list[Callable[[Span], None]] = []
+# called as each span opens, before the wrapped code runs (telemetry/profiling.py)
+_start_listeners: list[Callable[[Span], None]] = []
+
+
+def add_span_listener(listener: Callable[[Span], None], on_start: bool = False) -> None:
+    (_start_listeners if on_start else _listeners).append(listener)
+
+
+def remove_span_listener(listener: Callable[[Span], None]) -> None:
+    for listeners in (_listeners, _start_listeners):
+        if listener in listeners:
+            listeners.remove(listener)
+
+
+@contextmanager
+def record_spans():
+    """Activate a fresh recorder for the enclosed block and yield it."""
+    recorder = SpanRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        recorder.finished = time.perf_counter()
+        _recorder.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: str, **attrs):
+    """Time the enclosed block as one span. Yields the Span so callers can attach attributes."""
+    s = Span(name, kind, _current_span.get(), time.perf_counter(), attrs)
+    token = _current_span.set(s)
+    _notify(_start_listeners, s)
+    try:
+        yield s
+    except BaseException as e:
+        s.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        s.seconds = time.perf_counter() - s.start
+        _current_span.reset(token)
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder._add(s)
+        _notify(_listeners, s)
+
+
+def _notify(listeners: list, s: Span) -> None:
+    for listener in listeners:
+        try:
+            listener(s)
+        except Exception as e:
+            logger.debug(f"Span listener failed for {s.name}: {e}")
+
+
+def traced(name: str, kind: str):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span, e.g. so the HTTP layer can add downloaded bytes to it."""
+    return _current_span.get()
+
+
+def mark_error(error: BaseException) -> None:
+    """
+    Flag the open span as failed. For fetchers that catch their own
+    exceptions and return an empty result, so the failure still shows
+    up in timings and error-rate metrics.
+    """
+    s = _current_span.get()
+    if s is not None:
+        s.attrs["error"] = type(error).__name__
+
+
+def skipped_sources(timings: dict) -> list[dict]:
+    """Fetch spans that were refused without calling the upstream (e.g. open circuit), one per source."""
+    skipped = {}
+    for s in timings.get("spans", []):
+        # a node skipped for the deadline is already in the report's missing_sources, under its agent's name
+        if s.get("kind") == "fetch" and s.get("skipped") and s["name"] not in skipped:
+            skipped[s["name"]] = {"source": s["name"], "reason": s["skipped"]}
+    return list(skipped.values())
+
+
+def aggregate_timings(reports: list[dict]) -> dict:
+    """
+    Roll the per-report "timings" sections of a batch into one summary:
+    wall-time percentiles per node and per span name, plus summed
+    tokens / bytes / retries / sleep time per kind.
+    """
+    per_node: dict[str, list[float]] = {}
+    per_name: dict[str, list[float]] = {}
+    totals: dict[str, dict] = {}
+    run_seconds = []
+
+    for report in reports:
+        timings = report.get("timings")
+        if not timings:
+            continue
+        run_seconds.append(timings.get("total_seconds", 0.0))
+        for node, seconds in timings.get("nodes", {}).items():
+            per_node.setdefault(node, []).append(seconds)
+        for s in timings.get("spans", []):
+            if s["kind"] == "node":
+                continue
+            per_name.setdefault(f"{s['kind']}.{s['name']}", []).append(s["seconds"])
+            kind_totals = totals.setdefault(s["kind"], {"calls": 0, "seconds": 0.0})
+            kind_totals["calls"] += 1
+            kind_totals["seconds"] += s["seconds"]
+            for key in _SUMMED_ATTRS:
+                if key in s:
+                    kind_totals[key] = kind_totals.get(key, 0) + s[key]
+
+    for kind_totals in totals.values():
+        for key, value in kind_totals.items():
+            if isinstance(value, float):
+                kind_totals[key] = round(value, 4)
+
+    return {
+        "reports": len(run_seconds),
+        "run_seconds": _distribution(run_seconds),
+        "nodes": {name: _distribution(v) for name, v in per_node.items()},
+        "spans": {name: _distribution(v) for name, v in sorted(per_name.items())},
+        "totals": totals,
+    }
+
+
+def _distribution(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "total": round(sum(ordered), 4),
+        "mean": round(statistics.fmean(ordered), 4),
+        "p50": round(_percentile(ordered, 50), 4),
+        "p95": round(_percentile(ordered, 95), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile on an already sorted list."""
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
@@ -5,6 +5,29 @@ Shared pytest fixtures and mock data for all tests.
 import pytest
 import pandas as pd
 import numpy as np
+from unittest.mock import patch
+
+from config.settings import settings
+from agents.memo import reset_memo_store
+from data.negative_cache import reset_negative_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_negative_cache(tmp_path):
+    """Keep the negative cache out of ./output and empty for every test."""
+    reset_negative_cache()
+    with patch.object(settings, "negative_cache_path", str(tmp_path / "negative_cache.sqlite")):
+        yield
+    reset_negative_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_memo_store(tmp_path):
+    """Same for the node memo store: no results carried over between tests."""
+    reset_memo_store()
+    with patch.object(settings, "memo_path", str(tmp_path / "memo.sqlite")):
+        yield
+    reset_memo_store()
 
 
 @pytest.fixture
@@ -0,0 +1,83 @@
+"""
+tests/integration/test_checkpoints.py
+Resumable batch runs: a ticker cut short mid-graph picks up from its last
+checkpoint, a finished one is left alone. Agents and the LLM are mocked.
+"""
+import pytest
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from agents import checkpoints
+from agents.orchestrator_agent import OrchestratorAgent
+from config.settings import settings
+from output.report_generator import build_report
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_db(tmp_path):
+    with patch.object(settings, "checkpoint_path", str(tmp_path / "checkpoints.sqlite")):
+        yield settings.checkpoint_path
+
+
+def _mocked_agents(stack: ExitStack) -> dict:
+    result = {"score": 0.5, "label": "positive", "reasoning": "Mock."}
+    debate = {"bull_case": "Up.", "bear_case": "Down.", "resolution": "Up.", "key_drivers": []}
+    mocks = {
+        name: stack.enter_context(patch(f"agents.sentiment_graph._{name}_agent._safe_run", return_value=dict(result)))
+        for name in ("news", "social", "analyst", "web")
+    }
+    mocks["debate"] = stack.enter_context(patch("agents.sentiment_graph._debate_agent.run", return_value=debate))
+    mocks["llm"] = stack.enter_context(patch("agents.sentiment_graph.gemini_client.generate", return_value="Summary."))
+    return mocks
+
+
+def test_interrupted_ticker_resumes_from_last_node():
+    orchestrator = OrchestratorAgent()
+    run_id = checkpoints.start_run(["AAPL"])
+
+    with ExitStack() as stack:
+        mocks = _mocked_agents(stack)
+        stack.enter_context(patch("agents.sentiment_graph.build_report", side_effect=RuntimeError("killed")))
+        with pytest.raises(RuntimeError):
+            orchestrator.run("AAPL", run_id=run_id)
+    assert mocks["news"].call_count == 1
+    assert orchestrator.checkpoint_status(run_id, "AAPL") == "in_progress"
+
+    with ExitStack() as stack:
+        mocks = _mocked_agents(stack)
+        stack.enter_context(patch("agents.sentiment_graph.build_report", wraps=build_report))
+        report = orchestrator.run("AAPL", run_id=run_id)
+
+    # only the report node ran again; sources, debate and summary came from the checkpoint
+    for name in ("news", "social", "analyst", "web", "debate", "llm"):
+        mocks[name].assert_not_called()
+    assert report["ticker"] == "AAPL"
+    assert report["summary"] == "Summary."
+    assert orchestrator.checkpoint_status(run_id, "AAPL") == "done"
+
+
+def test_status_per_ticker():
+    orchestrator = OrchestratorAgent()
+    run_id = checkpoints.start_run(["AAPL", "MSFT"])
+    with ExitStack() as stack:
+        _mocked_agents(stack)
+        orchestrator.run("AAPL", run_id=run_id)
+
+    assert orchestrator.checkpoint_status(run_id, "AAPL") == "done"
+    assert orchestrator.checkpoint_status(run_id, "MSFT") == "new"
+    assert checkpoints.run_tickers(run_id) == ["AAPL", "MSFT"]
+    assert checkpoints.run_tickers("no-such-run") is None
+
+
+def test_old_runs_are_pruned(checkpoint_db):
+    orchestrator = OrchestratorAgent()
+    run_id = checkpoints.start_run(["AAPL"])
+    with ExitStack() as stack:
+        _mocked_agents(stack)
+        orchestrator.run("AAPL", run_id=run_id)
+
+    with checkpoints._connect(checkpoint_db) as conn:
+        conn.execute("UPDATE batch_runs SET started_at = '2000-01-01T00:00:00+00:00'")
+    assert checkpoints.prune(7) == 1
+    assert checkpoints.run_tickers(run_id) is None
+    assert orchestrator.checkpoint_status(run_id, "AAPL") == "new"
@@ -0,0 +1,128 @@
+"""
+tests/integration/test_daemon.py
+Integration tests for the Unix-socket daemon and its client -- the pipeline is faked.
+"""
+import threading
+import pytest
+from service.daemon import SentimentDaemon
+from service.daemon_client import request_report, ping
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    calls = []
+
+    def compute(ticker):
+        calls.append(ticker)
+        if ticker == "FAIL":
+            raise RuntimeError("provider down")
+        return {"ticker": ticker, "sentiment_label": "NEUTRAL"}
+
+    srv = SentimentDaemon(str(tmp_path / "d.sock"), workers=2, compute=compute)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    srv.calls = calls
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_ping(daemon):
+    assert ping(daemon.socket_path)
+
+
+def test_request_report_runs_on_daemon(daemon):
+    report = request_report("msft", daemon.socket_path, timeout=5)
+    assert report["ticker"] == "MSFT"
+    # second call is answered from the daemon's warm cache
+    request_report("MSFT", daemon.socket_path, timeout=5)
+    assert daemon.calls == ["MSFT"]
+
+
+def test_cli_request_never_gets_a_cached_report(daemon):
+    from argparse import Namespace
+    from unittest.mock import MagicMock
+
+    import main
+
+    # every stored report is past fresh but within stale: `serve` would hand it out
+    daemon.report_cache.fresh_seconds = 0
+    daemon.report_cache.stale_seconds = 3600
+    request_report("MSFT", daemon.socket_path, timeout=5)
+    calls_before = len(daemon.calls)
+
+    orchestrator = MagicMock()
+    reports = list(main._reports(
+        orchestrator, ["MSFT"], Namespace(workers=1, socket=daemon.socket_path), use_daemon=True,
+    ))
+
+    assert reports == [("MSFT", {"ticker": "MSFT", "sentiment_label": "NEUTRAL"})]
+    assert daemon.calls[calls_before:] == ["MSFT"]
+    orchestrator.run.assert_not_called()
+
+
+def test_daemon_error_is_raised(daemon):
+    with pytest.raises(RuntimeError, match="provider down"):
+        request_report("FAIL", daemon.socket_path, timeout=5)
+
+
+def test_no_daemon_returns_none(tmp_path):
+    assert request_report("AAPL", str(tmp_path / "missing.sock")) is None
+    assert not ping(str(tmp_path / "missing.sock"))
+
+
+def test_second_daemon_on_same_socket_refused(daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        SentimentDaemon(daemon.socket_path, compute=lambda t: {})
+
+
+def test_stale_socket_file_is_reclaimed(tmp_path):
+    path = tmp_path / "stale.sock"
+    path.write_text("")
+    srv = SentimentDaemon(str(path), compute=lambda t: {"ticker": t})
+    srv.server_close()
+    assert not path.exists()
+
+
+def _raw_server(path, reply):
+    """A Unix socket that accepts one request and answers `reply` (None = never answers)."""
+    import socket
+
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(path)
+    srv.listen(1)
+    done = threading.Event()
+
+    def serve():
+        conn, _ = srv.accept()
+        conn.recv(1024)
+        if reply is not None:
+            conn.sendall(reply)
+            conn.close()
+        done.wait(5)
+        conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return srv, done
+
+
+@pytest.mark.parametrize("reply", [None, b'{"ok": true, "rep'], ids=["stuck", "truncated"])
+def test_cli_falls_back_to_in_process_when_daemon_misbehaves(tmp_path, reply):
+    from argparse import Namespace
+    from unittest.mock import MagicMock, patch
+
+    import main
+    from config.settings import settings
+
+    path = str(tmp_path / "bad.sock")
+    srv, done = _raw_server(path, reply)
+    orchestrator = MagicMock()
+    orchestrator.run.return_value = {"ticker": "AAPL"}
+    try:
+        with patch.object(settings, "daemon_request_timeout_seconds", 0.3):
+            reports = list(main._reports(orchestrator, ["AAPL"], Namespace(workers=1, socket=path), use_daemon=True))
+    finally:
+        done.set()
+        srv.close()
+
+    assert reports == [("AAPL", {"ticker": "AAPL"})]
+    orchestrator.run.assert_called_once()
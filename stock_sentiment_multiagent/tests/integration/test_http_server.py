@@ -0,0 +1,82 @@
+"""
+tests/integration/test_http_server.py
+Integration tests for the HTTP service -- the pipeline itself is faked.
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from service.http_server import build_server
+
+
+@pytest.fixture
+def server():
+    calls = []
+    release = threading.Event()
+
+    def compute(ticker):
+        calls.append(ticker)
+        release.wait(2)
+        return {"ticker": ticker, "sentiment_label": "POSITIVE"}
+
+    srv = build_server("127.0.0.1", 0, compute=compute)
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    srv.calls = calls
+    srv.release = release
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _get(server, path):
+    host, port = server.server_address[:2]
+    return urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5)
+
+
+def test_healthz(server):
+    with _get(server, "/healthz") as resp:
+        assert json.loads(resp.read()) == {"status": "ok"}
+
+
+def test_concurrent_requests_share_one_run(server):
+    statuses = []
+
+    def fetch():
+        with _get(server, "/sentiment/nvda") as resp:
+            statuses.append(resp.headers["X-Cache"])
+            assert json.loads(resp.read())["ticker"] == "NVDA"
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for t in threads:
+        t.start()
+    # give every request time to join the in-flight run before releasing it
+    threading.Event().wait(0.3)
+    server.release.set()
+    for t in threads:
+        t.join(5)
+
+    assert server.calls == ["NVDA"]
+    assert sorted(statuses) == ["coalesced", "coalesced", "coalesced", "miss"]
+
+    with _get(server, "/sentiment/NVDA") as resp:
+        assert resp.headers["X-Cache"] == "fresh"
+
+
+def test_invalid_ticker_rejected(server):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _get(server, "/sentiment/not_a_ticker!")
+    assert exc.value.code == 400
+
+
+def test_unknown_path_404(server):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _get(server, "/nope")
+    assert exc.value.code == 404
+
+
+def test_metrics_endpoint(server):
+    with _get(server, "/metrics") as resp:
+        assert resp.headers["Content-Type"].startswith("text/plain")
+        assert "sentiment_cache_requests_total" in resp.read().decode()
@@ -6,6 +6,12 @@ Patches the compiled graph's invoke method to avoid real Gemini calls.
 import pytest
 from unittest.mock import patch
 from agents.orchestrator_agent import OrchestratorAgent
+from agents.sentiment_graph import get_sentiment_graph
+
+
+def _patch_graph(method, **kwargs):
+    """Patch a method on the shared (lazily compiled) graph the orchestrator uses."""
+    return patch.object(get_sentiment_graph(), method, **kwargs)
 
 
 def _make_final_state(ticker="AAPL", score=0.5, label="POSITIVE"):
@@ -47,8 +53,7 @@ def orchestrator():
 
 
 def test_report_has_required_fields(orchestrator):
-    with patch("agents.orchestrator_agent.sentiment_graph.invoke",
-               return_value=_make_final_state()):
+    with _patch_graph("invoke", return_value=_make_final_state()):
         report = orchestrator.run("AAPL")
 
     required = ["ticker", "timestamp", "sentiment_label", "sentiment_score",
@@ -58,8 +63,7 @@ def test_report_has_required_fields(orchestrator):
 
 
 def test_sentiment_label_is_valid_enum(orchestrator):
-    with patch("agents.orchestrator_agent.sentiment_graph.invoke",
-               return_value=_make_final_state(label="POSITIVE")):
+    with _patch_graph("invoke", return_value=_make_final_state(label="POSITIVE")):
         report = orchestrator.run("AAPL")
 
     assert report["sentiment_label"] in ("POSITIVE", "NEUTRAL", "NEGATIVE")
@@ -67,16 +71,14 @@ def test_sentiment_label_is_valid_enum(orchestrator):
 
 def test_ticker_uppercased(orchestrator):
     state = _make_final_state(ticker="AAPL")
-    with patch("agents.orchestrator_agent.sentiment_graph.invoke",
-               return_value=state):
+    with _patch_graph("invoke", return_value=state):
         report = orchestrator.run("aapl")
 
     assert report["ticker"] == "AAPL"
 
 
 def test_sentiment_score_in_range(orchestrator):
-    with patch("agents.orchestrator_agent.sentiment_graph.invoke",
-               return_value=_make_final_state(score=0.6)):
+    with _patch_graph("invoke", return_value=_make_final_state(score=0.6)):
         report = orchestrator.run("AAPL")
 
     assert -1.0 <= report["sentiment_score"] <= 1.0
@@ -84,11 +86,42 @@ def test_sentiment_score_in_range(orchestrator):
 
 
 def test_debate_section_present(orchestrator):
-    with patch("agents.orchestrator_agent.sentiment_graph.invoke",
-               return_value=_make_final_state()):
+    with _patch_graph("invoke", return_value=_make_final_state()):
         report = orchestrator.run("AAPL")
 
     assert "debate" in report
     assert "bull_case" in report["debate"]
     assert "bear_case" in report["debate"]
     assert "resolution" in report["debate"]
+
+
+def test_stream_yields_one_event_per_node(orchestrator):
+    updates = [
+        {"news": {"news_result": {"score": 0.4}}},
+        {"social": {"social_result": {"score": 0.1}}},
+        {"report": {"report": {"ticker": "AAPL"}}},
+    ]
+    with _patch_graph("stream", return_value=iter(updates)) as mock_stream:
+        events = list(orchestrator.stream(" aapl "))
+
+    mock_stream.assert_called_once_with({"ticker": "AAPL"}, stream_mode="updates")
+    assert [e["node"] for e in events] == ["news", "social", "report"]
+    assert events[0]["data"] == {"news_result": {"score": 0.4}}
+    assert all(e["ticker"] == "AAPL" for e in events)
+    assert events[-1]["elapsed"] >= events[0]["elapsed"]
+
+
+def test_report_includes_timings(orchestrator):
+    with _patch_graph("invoke", return_value=_make_final_state()):
+        report = orchestrator.run("AAPL")
+
+    assert "timings" in report
+    assert "total_seconds" in report["timings"]
+    assert "spans" in report["timings"]
+
+
+def test_run_batch_preserves_order(orchestrator):
+    with _patch_graph("invoke", side_effect=lambda state: _make_final_state(ticker=state["ticker"])):
+        reports = orchestrator.run_batch(["msft", "AAPL", "nvda"])
+
+    assert [r["ticker"] for r in reports] == ["MSFT", "AAPL", "NVDA"]
@@ -0,0 +1,51 @@
+"""
+tests/integration/test_process_pool.py
+Runs a small scan on real worker processes against the local fake server.
+"""
+import functools
+
+from benchmarks.fake_server import install_fake_server, worker_fakes
+from benchmarks.fakes import FakeConfig, SOURCES
+from service.process_pool import scan
+
+
+def test_scan_yields_reports_in_input_order():
+    config = FakeConfig(latency={s: 0.001 for s in SOURCES})
+    tickers = ["TC", "TA", "TB"]
+    with install_fake_server(config, universe=tickers) as upstream:
+        results = list(scan(tickers, workers=2, setup=functools.partial(worker_fakes, config.as_dict())))
+
+    assert [ticker for ticker, _ in results] == tickers
+    assert all(response["ok"] for _, response in results)
+    assert [response["report"]["ticker"] for _, response in results] == tickers
+    # the workers really went through the server in this process
+    assert upstream.stats()["calls"]["finviz"] == 3
+
+
+def _die_on_tx(config: dict) -> None:
+    """Worker setup: fakes as usual, but ticker TX takes the whole process down."""
+    import os
+    from agents.orchestrator_agent import OrchestratorAgent
+
+    worker_fakes(config)
+    real_run = OrchestratorAgent.run
+
+    def run(self, ticker, *args, **kwargs):
+        if ticker == "TX":
+            os._exit(1)
+        return real_run(self, ticker, *args, **kwargs)
+
+    OrchestratorAgent.run = run
+
+
+def test_dead_worker_fails_its_tickers_not_the_scan():
+    config = FakeConfig(latency={s: 0.001 for s in SOURCES})
+    tickers = ["TA", "TX", "TB", "TC", "TD"]
+    with install_fake_server(config, universe=tickers):
+        results = dict(scan(tickers, workers=1, setup=functools.partial(_die_on_tx, config.as_dict())))
+
+    assert list(results) == tickers
+    assert results["TA"]["ok"]
+    assert not results["TX"]["ok"] and "BrokenProcessPool" in results["TX"]["error"]
+    # TB may have been queued on the dying pool; everything after it runs on the new one
+    assert results["TC"]["ok"] and results["TD"]["ok"]
@@ -112,3 +112,17 @@ def test_graph_debate_section_in_report(graph):
     assert debate["bear_case"] == "EU risk."
     assert debate["resolution"] == "Bullish dominates."
     assert "earnings" in debate["key_drivers"]
+
+
+def test_graph_streams_nodes_in_pipeline_order(graph):
+    """stream() should surface each node as it completes, ending with the report."""
+    with patch("agents.sentiment_graph._news_agent._safe_run",   return_value=_mock_agent_result("news")), \
+         patch("agents.sentiment_graph._social_agent._safe_run", return_value=_mock_agent_result("social")), \
+         patch("agents.sentiment_graph._analyst_agent._safe_run",return_value=_mock_agent_result("analyst")), \
+         patch("agents.sentiment_graph._web_agent._safe_run",    return_value=_mock_agent_result("web")), \
+         patch("agents.sentiment_graph._debate_agent.run",       return_value=_mock_debate()), \
+         patch("agents.sentiment_graph.gemini_client.generate",  return_value="Summary."):
+
+        nodes = [next(iter(update)) for update in graph.stream({"ticker": "AAPL"}, stream_mode="updates")]
+
+    assert nodes == ["news", "social", "analyst", "web", "debate", "aggregate", "summary", "report"]
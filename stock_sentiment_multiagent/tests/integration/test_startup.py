@@ -0,0 +1,17 @@
+"""
+tests/integration/test_startup.py
+Enforces the CLI import-time budget measured by benchmarks/startup.py.
+"""
+from benchmarks.startup import measure_startup, STARTUP_BUDGET_SECONDS
+
+
+def test_main_import_stays_lazy_and_within_budget():
+    result = measure_startup("main", runs=3)
+
+    assert result["heavy_modules_loaded"] == [], (
+        f"`import main` eagerly imported {result['heavy_modules_loaded']}"
+    )
+    assert result["median_seconds"] <= STARTUP_BUDGET_SECONDS, (
+        f"`import main` took {result['median_seconds']:.3f}s "
+        f"(budget {STARTUP_BUDGET_SECONDS:.3f}s): {result['package_imports_ms']}"
+    )
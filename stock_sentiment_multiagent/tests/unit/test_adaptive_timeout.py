@@ -0,0 +1,89 @@
+"""
+tests/unit/test_adaptive_timeout.py
+Unit tests for the per-host adaptive timeouts in data/adaptive_timeout.py
+and their use in data/http_client.py.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from config.settings import settings
+from data import http_client
+from data.adaptive_timeout import LatencyTracker, get_tracker, reset_trackers
+from data.circuit_breaker import reset_breakers
+
+
+@pytest.fixture(autouse=True)
+def fresh_trackers():
+    reset_trackers()
+    reset_breakers()
+    yield
+    reset_trackers()
+    reset_breakers()
+
+
+def test_default_timeout_until_warm():
+    tracker = LatencyTracker(min_samples=5)
+    for _ in range(4):
+        tracker.observe(0.2)
+    assert tracker.timeout() == settings.http_timeout_default
+
+
+def test_connect_from_p50_and_read_from_p99_once_warm():
+    tracker = LatencyTracker(min_samples=5)
+    for seconds in [0.4] * 98 + [1.5, 3.0]:
+        tracker.observe(seconds)
+    connect, read = tracker.timeout()
+    assert connect == 0.8
+    assert read == 3.0
+
+
+def test_timeouts_clamped_to_bounds():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.observe(0.01)
+    assert tracker.timeout() == (settings.http_timeout_min, settings.http_timeout_min)
+    tracker.observe(60.0)
+    _, read = tracker.timeout()
+    assert read == settings.http_timeout_max
+
+
+def test_timeout_retried_once_at_ceiling():
+    tracker = get_tracker("apewisdom.io")
+    tracker.min_samples = 1
+    tracker.observe(0.3)
+    ok = MagicMock(status_code=200, content=b"{}")
+    session = MagicMock()
+    session.get.side_effect = [requests.ReadTimeout("slow"), ok]
+
+    with patch.object(http_client, "get_session", return_value=session):
+        resp = http_client.get("https://apewisdom.io/api/v1.0/filter/all-stocks/page/1")
+
+    assert resp is ok
+    first, second = session.get.call_args_list
+    assert first.kwargs["timeout"] == (0.6, 0.6)
+    assert second.kwargs["timeout"] == settings.http_timeout_max
+
+
+def test_explicit_timeout_is_left_alone():
+    session = MagicMock()
+    session.get.return_value = MagicMock(status_code=200, content=b"")
+    with patch.object(http_client, "get_session", return_value=session):
+        http_client.get("https://finviz.com/quote.ashx", timeout=3)
+    session.get.assert_called_once_with("https://finviz.com/quote.ashx", timeout=3)
+    assert get_tracker("finviz.com").percentile(50) == 0.0
+
+
+def test_only_successful_responses_are_learned_from():
+    session = MagicMock()
+    session.get.side_effect = [
+        MagicMock(status_code=429, content=b""),
+        MagicMock(status_code=503, content=b""),
+        MagicMock(status_code=200, content=b"{}"),
+    ]
+    with patch.object(http_client, "get_session", return_value=session), \
+         patch.object(get_tracker("apewisdom.io"), "observe") as observe:
+        for _ in range(3):
+            http_client.get("https://apewisdom.io/api/v1.0/filter/all-stocks/page/1")
+
+    observe.assert_called_once()
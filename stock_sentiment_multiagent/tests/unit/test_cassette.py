@@ -0,0 +1,59 @@
+"""
+tests/unit/test_cassette.py
+Unit tests for the record/replay cassette in utils/cassette.py.
+"""
+import pytest
+from utils import cassette
+from utils.cassette import CassetteMiss, ReplayedError, use_cassette
+
+
+def test_passthrough_without_cassette():
+    assert cassette.through("http", "url", lambda: "live") == "live"
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+    answers = iter(["first", "second"])
+
+    with use_cassette(path, "record"):
+        assert cassette.through("llm", "k", lambda: next(answers)) == "first"
+        assert cassette.through("llm", "k", lambda: next(answers)) == "second"
+        cassette.through("yahoo", "info:TA", lambda: {"shortName": "TA Inc", "big": "x" * 100},
+                         encode=lambda d: {"shortName": d["shortName"]})
+
+    def boom():
+        raise AssertionError("replay must not call through")
+
+    with use_cassette(path, "replay"):
+        # same key replays in recorded order, then repeats the last answer
+        assert cassette.through("llm", "k", boom) == "first"
+        assert cassette.through("llm", "k", boom) == "second"
+        assert cassette.through("llm", "k", boom) == "second"
+        assert cassette.through("yahoo", "info:TA", boom) == {"shortName": "TA Inc"}
+
+
+def test_recorded_errors_are_raised_again(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+
+    def forbidden():
+        raise RuntimeError("FinnhubAPIException(status_code: 403)")
+
+    with use_cassette(path, "record"):
+        with pytest.raises(RuntimeError):
+            cassette.through("finnhub", "price_target:TA", forbidden)
+
+    with use_cassette(path, "replay"):
+        with pytest.raises(ReplayedError, match="403"):
+            cassette.through("finnhub", "price_target:TA", forbidden)
+
+
+def test_replay_miss_raises_and_is_counted(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+    with use_cassette(path, "record"):
+        pass
+
+    with use_cassette(path, "replay") as active:
+        with pytest.raises(CassetteMiss):
+            cassette.through("http", "https://finviz.com/quote.ashx?t=TA", lambda: "live")
+    assert active.misses == ["http https://finviz.com/quote.ashx?t=TA"]
+    assert cassette.active() is None
@@ -0,0 +1,133 @@
+"""
+tests/unit/test_circuit_breaker.py
+Unit tests for the per-upstream circuit breakers in data/circuit_breaker.py.
+"""
+import pytest
+from data.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, guard, reset_breakers,
+)
+from telemetry.spans import record_spans, span
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("finviz.com", failure_threshold=3, reset_seconds=30, clock=FakeClock())
+    for _ in range(2):
+        breaker.allow()
+        breaker.record_failure("ReadTimeout")
+    assert breaker.state == CLOSED
+
+    breaker.allow()
+    breaker.record_failure("ReadTimeout")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError, match="3 consecutive failures, last: ReadTimeout"):
+        breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("finviz.com", failure_threshold=2, clock=FakeClock())
+    breaker.record_failure("HTTP 503")
+    breaker.record_success()
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("html.duckduckgo.com", failure_threshold=1, reset_seconds=30, clock=clock)
+    breaker.record_failure("HTTP 403")
+
+    clock.now += 31
+    breaker.allow()                      # the probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()                  # everyone else still fails fast
+
+    breaker.record_failure("HTTP 403")   # probe failed -> open for another period
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    clock.now += 31
+    breaker.allow()
+    breaker.record_success()             # probe worked -> closed
+    assert breaker.state == CLOSED
+    breaker.allow()
+
+
+def test_guard_counts_flagged_and_raised_failures(monkeypatch):
+    monkeypatch.setattr("config.settings.settings.breaker_failure_threshold", 2)
+
+    with guard("apewisdom.io") as outcome:
+        outcome.fail("HTTP 429")
+    with pytest.raises(ConnectionError):
+        with guard("apewisdom.io"):
+            raise ConnectionError("refused")
+
+    with record_spans() as recorder:
+        with span("apewisdom", kind="fetch"):
+            with pytest.raises(CircuitOpenError):
+                with guard("apewisdom.io"):
+                    pytest.fail("open breaker must not run the call")
+
+    skipped = recorder.summary()["spans"][0]["skipped"]
+    assert skipped.startswith("circuit open for apewisdom.io")
+
+
+def test_guard_ignores_expected_errors(monkeypatch):
+    monkeypatch.setattr("config.settings.settings.breaker_failure_threshold", 1)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            with guard("finnhub.io", is_failure=lambda e: "403" not in str(e)):
+                raise RuntimeError("FinnhubAPIException(status_code: 403)")
+    with guard("finnhub.io"):
+        pass
+
+
+def _cut_by_deadline(name):
+    from utils import deadline
+
+    with pytest.raises(deadline.DeadlineExceeded):
+        with guard(name):
+            raise deadline.DeadlineExceeded(f"GET {name}")
+
+
+def test_deadline_cut_leaves_the_failure_count_alone(monkeypatch):
+    from data.circuit_breaker import get_breaker
+
+    monkeypatch.setattr("config.settings.settings.breaker_failure_threshold", 5)
+    breaker = get_breaker("finviz.com")
+    for _ in range(4):
+        breaker.record_failure("ReadTimeout")
+
+    _cut_by_deadline("finviz.com")
+    assert breaker.failures == 4 and breaker.state == CLOSED
+    breaker.record_failure("ReadTimeout")
+    assert breaker.state == OPEN
+
+
+def test_deadline_cut_probe_neither_closes_nor_reopens(monkeypatch):
+    from data.circuit_breaker import get_breaker
+
+    monkeypatch.setattr("config.settings.settings.breaker_failure_threshold", 1)
+    monkeypatch.setattr("config.settings.settings.breaker_reset_seconds", 0)
+    breaker = get_breaker("html.duckduckgo.com")
+    breaker.record_failure("HTTP 403")
+
+    _cut_by_deadline("html.duckduckgo.com")      # the half-open probe, cut short
+    assert breaker.state == HALF_OPEN and breaker.failures == 1
+    breaker.allow()                              # the probe is re-armed for the next caller
@@ -0,0 +1,132 @@
+"""
+tests/unit/test_deadline.py
+Unit tests for the per-run time budget in utils/deadline.py and how
+agents, the aggregator and the report react to it.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agents.aggregator_agent import AggregatorAgent
+from agents.news_sentiment_agent import NewsSentimentAgent
+from output.report_generator import build_report
+from telemetry.spans import record_spans, span
+from utils import deadline
+
+
+def test_no_budget_by_default():
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert deadline.cap(5.0) == 5.0
+    with deadline.within(None):
+        assert deadline.remaining() is None
+
+
+def test_nested_scopes_keep_the_tighter_budget():
+    with deadline.within(10):
+        with deadline.within(60):
+            assert deadline.remaining() <= 10
+        with deadline.within(0.5):
+            assert deadline.remaining() <= 0.5
+            assert deadline.cap((3.0, 7.0)) == pytest.approx((0.5, 0.5), abs=0.05)
+        assert deadline.remaining() > 0.5
+    assert deadline.remaining() is None
+
+
+def test_check_marks_span_when_expired():
+    with deadline.within(0.01), record_spans() as recorder:
+        time.sleep(0.02)
+        with span("finviz", kind="fetch"):
+            with pytest.raises(deadline.DeadlineExceeded):
+                deadline.check("GET finviz.com")
+    assert recorder.summary()["spans"][0]["skipped"] == "deadline exceeded"
+
+
+def test_agent_out_of_time_is_missing_not_failed(mock_headlines):
+    with deadline.within(0.01):
+        time.sleep(0.02)
+        with patch("agents.news_sentiment_agent.fetch_all_headlines", return_value=mock_headlines) as fetch:
+            result = NewsSentimentAgent()._safe_run("AAPL")
+    fetch.assert_not_called()
+    assert result["missing"] == "deadline exceeded"
+    assert "error" not in result
+
+
+def test_llm_backoff_gives_up_instead_of_sleeping_past_deadline():
+    from models.gemini_client import LLMClient
+
+    client = LLMClient()
+    client.provider = "groq"
+    client._model = "m"
+    client._client = type("C", (), {})()
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        raise Exception("Error code: 429 - rate_limit_exceeded")
+
+    client._client.chat = type("Chat", (), {"completions": type("Comp", (), {"create": staticmethod(create)})})
+    with deadline.within(2.0), patch("models.gemini_client.time.sleep") as sleep:
+        with pytest.raises(deadline.DeadlineExceeded):
+            client.generate("prompt")
+    sleep.assert_not_called()
+    assert len(calls) == 1
+    assert 0 < calls[0]["timeout"] <= 2.0
+
+
+def test_bug_after_the_deadline_is_still_a_failure():
+    class Boom(NewsSentimentAgent):
+        def run(self, ticker):
+            time.sleep(0.02)
+            raise KeyError("score")
+
+    with deadline.within(0.01):
+        result = Boom()._safe_run("AAPL")
+    assert "missing" not in result
+    assert "score" in result["error"]
+
+
+def test_sdk_timeout_after_the_deadline_is_missing():
+    import requests
+
+    class Slow(NewsSentimentAgent):
+        def run(self, ticker):
+            time.sleep(0.02)
+            raise requests.ReadTimeout("read timed out")
+
+    with deadline.within(0.01):
+        result = Slow()._safe_run("AAPL")
+    assert result["missing"] == "deadline exceeded"
+
+
+def test_gemini_call_timeout_capped_to_deadline():
+    from unittest.mock import MagicMock
+    from models.gemini_client import LLMClient
+
+    client = LLMClient()
+    client.provider = "gemini"
+    client._model = "m"
+    client._client = MagicMock()
+    client._client.models.generate_content.return_value.text = "{}"
+    client._client.models.generate_content.return_value.usage_metadata = None
+
+    with deadline.within(2.0), patch.object(client, "_ensure_initialized"):
+        client.generate("prompt")
+    config = client._client.models.generate_content.call_args.kwargs["config"]
+    assert 0 < config.http_options.timeout <= 2000
+
+
+def test_missing_sources_excluded_and_confidence_scaled(mock_agent_results):
+    full = AggregatorAgent().run(mock_agent_results)
+    partial_results = dict(mock_agent_results)
+    partial_results["analyst_buzz"] = {"score": 0.0, "label": "neutral", "missing": "deadline exceeded"}
+    partial = AggregatorAgent().run(partial_results)
+
+    # without analyst (0.35 weight) the composite is the re-normalized rest, not dragged to 0
+    assert partial["sentiment_score"] == pytest.approx((0.7 * 0.30 + 0.4 * 0.15 + 0.3 * 0.20) / 0.65, abs=1e-4)
+    assert partial["confidence"] < full["confidence"]
+
+    report = build_report("AAPL", partial_results, partial, debate={}, summary="")
+    assert report["missing_sources"] == [{"source": "analyst_buzz", "reason": "deadline exceeded"}]
+    assert "missing" not in report["sources"]["analyst_buzz"]
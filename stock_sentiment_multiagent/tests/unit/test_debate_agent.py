@@ -2,9 +2,12 @@
 tests/unit/test_debate_agent.py
 Unit tests for DebateAgent.
 """
+import threading
+
 import pytest
 from unittest.mock import patch
 from agents.debate_agent import DebateAgent
+from config.settings import settings
 
 
 @pytest.fixture
@@ -53,3 +56,102 @@ def test_key_drivers_is_list(agent, sample_ticker, mock_agent_results, mock_deba
 
     assert isinstance(result["key_drivers"], list)
     assert len(result["key_drivers"]) <= 3
+
+
+def _fake_llm(hooks=None, calls=None):
+    """generate_json stand-in for the structured debate: advocates argue, the judge rules."""
+    hooks = hooks or {}
+
+    def generate_json(prompt):
+        if calls is not None:
+            calls.append(prompt)
+        if "judging a sentiment debate" in prompt:
+            return {"resolution": "Bulls win on earnings.", "key_drivers": ["Earnings", "Upgrades", "Buzz", "Extra"]}
+        side = "bull" if "the bull advocate" in prompt else "bear"
+        if side in hooks:
+            hooks[side]()
+        return {"argument": f"{side} argument"}
+
+    return generate_json
+
+
+@pytest.fixture
+def structured():
+    with patch.object(settings, "debate_mode", "structured"), \
+         patch.object(settings, "debate_rounds", 1), \
+         patch.object(settings, "debate_round_timeout_seconds", 5.0):
+        yield
+
+
+def test_structured_debate_has_both_sides_and_a_verdict(agent, sample_ticker, mock_agent_results, structured):
+    with patch("agents.debate_agent.gemini_client.generate_json", side_effect=_fake_llm()):
+        result = agent.run(sample_ticker, mock_agent_results)
+
+    assert result["bull_case"] == "bull argument"
+    assert result["bear_case"] == "bear argument"
+    assert result["resolution"] == "Bulls win on earnings."
+    assert len(result["key_drivers"]) == 3
+    assert result["rounds"] == 1
+
+
+def test_structured_advocates_run_concurrently(agent, sample_ticker, mock_agent_results, structured):
+    # each advocate waits for the other to have started; run one after the other, the barrier would break
+    both_started = threading.Barrier(2, timeout=2)
+    hooks = {"bull": both_started.wait, "bear": both_started.wait}
+    with patch("agents.debate_agent.gemini_client.generate_json", side_effect=_fake_llm(hooks)):
+        result = agent.run(sample_ticker, mock_agent_results)
+
+    assert result["bull_case"] == "bull argument"
+    assert result["bear_case"] == "bear argument"
+
+
+def test_later_rounds_answer_the_other_side(agent, sample_ticker, mock_agent_results, structured):
+    calls = []
+    with patch.object(settings, "debate_rounds", 2), \
+         patch("agents.debate_agent.gemini_client.generate_json", side_effect=_fake_llm(calls=calls)):
+        result = agent.run(sample_ticker, mock_agent_results)
+
+    assert result["rounds"] == 2
+    bull_prompts = [p for p in calls if "the bull advocate" in p]
+    assert "bear argument" not in bull_prompts[0]
+    assert "bear argument" in bull_prompts[1]
+
+
+def test_slow_advocate_is_cut_off_at_the_round_timeout(agent, sample_ticker, mock_agent_results, structured):
+    release = threading.Event()
+    try:
+        with patch.object(settings, "debate_round_timeout_seconds", 0.2), \
+             patch("agents.debate_agent.gemini_client.generate_json",
+                   side_effect=_fake_llm({"bear": lambda: release.wait(5)})):
+            result = agent.run(sample_ticker, mock_agent_results)
+    finally:
+        release.set()
+
+    assert result["bull_case"] == "bull argument"
+    assert result["bear_case"] == ""
+    assert result["resolution"] == "Bulls win on earnings."
+
+
+def test_one_sided_debate_is_not_memoized(agent, sample_ticker, mock_agent_results, structured):
+    release = threading.Event()
+    try:
+        with patch.object(settings, "debate_round_timeout_seconds", 0.2), \
+             patch("agents.debate_agent.gemini_client.generate_json",
+                   side_effect=_fake_llm({"bear": lambda: release.wait(5)})):
+            first = agent.run(sample_ticker, mock_agent_results)
+    finally:
+        release.set()
+
+    with patch("agents.debate_agent.gemini_client.generate_json", side_effect=_fake_llm()) as llm:
+        second = agent.run(sample_ticker, mock_agent_results)
+
+    assert first["bear_case"] == "" and "fingerprint" not in first
+    assert llm.call_count == 3
+    assert second["bear_case"] == "bear argument"
+
+
+def test_structured_falls_back_when_no_advocate_answers(agent, sample_ticker, mock_agent_results, structured):
+    with patch("agents.debate_agent.gemini_client.generate_json", side_effect=Exception("API error")):
+        result = agent.run(sample_ticker, mock_agent_results)
+
+    assert result["resolution"] == "Debate unavailable."
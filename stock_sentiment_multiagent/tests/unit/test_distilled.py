@@ -0,0 +1,98 @@
+"""
+tests/unit/test_distilled.py
+Unit tests for the distilled news/web scorer (models/distilled.py).
+"""
+import random
+from unittest.mock import patch
+
+import pytest
+
+from agents.memo import MemoStore
+from agents.news_sentiment_agent import NewsSentimentAgent
+from config.settings import settings
+from models import distilled
+from models.distilled import DistilledModel, harvest, score_locally
+
+GOOD = ["beats estimates", "record revenue", "upgrade to buy", "strong demand", "raises guidance"]
+BAD = ["misses estimates", "revenue decline", "downgrade to sell", "weak demand", "cuts guidance"]
+
+
+def _examples(n=60):
+    rng = random.Random(1)
+    examples = []
+    for i in range(n):
+        positive = i % 2 == 0
+        phrases = rng.sample(GOOD if positive else BAD, 3)
+        examples.append(([f"Company {p} this quarter" for p in phrases], 0.7 if positive else -0.6))
+    return examples
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    distilled.reset_model()
+    path = str(tmp_path / "distilled.npz")
+    with patch.object(settings, "distilled_model_path", path):
+        yield path
+    distilled.reset_model()
+
+
+def test_learns_the_direction():
+    model = DistilledModel.train(_examples())
+    up, _ = model.predict(["Company beats estimates and raises guidance"])
+    down, _ = model.predict(["Company misses estimates and cuts guidance"])
+    assert up > 0.3 and down < -0.3
+
+
+def test_unfamiliar_text_has_low_confidence():
+    model = DistilledModel.train(_examples())
+    _, familiar = model.predict(["Company beats estimates this quarter"])
+    _, novel = model.predict(["Regulators open antitrust probe into subsidiary"])
+    assert familiar > novel
+
+
+def test_needs_some_examples():
+    with pytest.raises(ValueError):
+        DistilledModel.train(_examples(3))
+
+
+def test_save_and_load_round_trip(model_path):
+    model = DistilledModel.train(_examples())
+    model.save(model_path)
+    loaded = DistilledModel.load(model_path)
+
+    items = ["Company upgrade to buy this quarter"]
+    assert loaded.predict(items) == pytest.approx(model.predict(items), abs=1e-5)
+    assert loaded.meta["examples"] == 60
+
+
+def test_harvest_reads_llm_scores_from_the_memo_store(tmp_path):
+    store = MemoStore(str(tmp_path / "memo.sqlite"), ttl_seconds=60)
+    store.put("news_sentiment", "fp1", "AAPL", {"headlines": ["a", "b"]}, {"score": 0.4})
+    store.put("web_search", "fp2", "AAPL", {"snippets": ["c"]}, {"score": -0.2})
+    store.put("debate", "fp3", "AAPL", {"news_sentiment": "fp1"}, {"resolution": "x"})
+
+    assert sorted(harvest(store)) == [(["a", "b"], 0.4), (["c"], -0.2)]
+
+
+def test_score_locally_escalates_when_unsure(model_path):
+    DistilledModel.train(_examples()).save(model_path)
+    with patch.object(settings, "distilled_scoring", True):
+        local = score_locally("news_sentiment", ["Company beats estimates this quarter"])
+        assert local["scored_by"] == "distilled" and local["label"] == "positive"
+        assert score_locally("news_sentiment", ["Regulators open antitrust probe into subsidiary"]) is None
+
+
+def test_off_by_default(model_path):
+    DistilledModel.train(_examples()).save(model_path)
+    assert score_locally("news_sentiment", ["Company beats estimates this quarter"]) is None
+
+
+def test_news_agent_skips_the_llm_when_the_model_is_sure(model_path):
+    DistilledModel.train(_examples()).save(model_path)
+    with patch.object(settings, "distilled_scoring", True), \
+         patch("agents.news_sentiment_agent.fetch_all_headlines", return_value=["Company record revenue this quarter"]), \
+         patch("agents.news_sentiment_agent.gemini_client.generate_json") as llm:
+        result = NewsSentimentAgent().run("AAPL")
+
+    llm.assert_not_called()
+    assert result["score"] > 0 and result["sources"] == 1
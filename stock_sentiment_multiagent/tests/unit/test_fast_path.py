@@ -0,0 +1,121 @@
+"""
+tests/unit/test_fast_path.py
+Unit tests for the debate/summary fast path (agents/fast_path.py).
+"""
+from unittest.mock import patch
+
+from agents import fast_path
+from agents.aggregator_agent import AggregatorAgent
+from agents.sentiment_graph import build_sentiment_graph
+from config.settings import settings
+
+EMPTY = {
+    "news_sentiment": {"score": 0.0, "label": "neutral", "reasoning": "No headlines found.", "sources": 0,
+                       "no_data": True},
+    "social_sentiment": {"score": 0.0, "label": "neutral", "reasoning": "Not trending.", "mentions": 0, "upvotes": 0,
+                         "rank": 999, "no_data": True},
+    "analyst_buzz": {"score": 0.0, "label": "neutral", "reasoning": "No analyst data available.",
+                     "buy_count": 0, "hold_count": 0, "sell_count": 0, "no_data": True},
+    "web_search": {"score": 0.0, "label": "neutral", "reasoning": "No web search results found.", "snippets_analyzed": 0,
+                   "no_data": True},
+}
+
+
+def _agreeing(score=0.8, label="positive"):
+    return {name: {"score": score, "label": label, "reasoning": f"{name} looks good."} for name in EMPTY}
+
+
+def _reason(results):
+    return fast_path.reason(results, AggregatorAgent().run(results))
+
+
+def test_all_sources_empty_is_no_data():
+    assert _reason(EMPTY) == fast_path.NO_DATA
+
+
+def test_failed_sources_are_not_empty():
+    results = {**EMPTY, "news_sentiment": {"score": 0.0, "label": "neutral", "reasoning": "x", "missing": "deadline exceeded"}}
+    assert _reason(results) is None
+
+
+def test_zero_counts_without_the_flag_are_not_empty():
+    # what a swallowed fetch error used to look like: the same shape as "no coverage"
+    results = {**EMPTY, "analyst_buzz": {k: v for k, v in EMPTY["analyst_buzz"].items() if k != "no_data"}}
+    assert _reason(results) is None
+
+
+def test_strong_agreement():
+    assert _reason(_agreeing()) == fast_path.AGREEMENT
+
+
+def test_weak_or_split_signals_take_the_llm_path():
+    assert _reason(_agreeing(score=0.3)) is None
+    split = {**_agreeing(), "web_search": {"score": -0.6, "label": "negative", "reasoning": "Bad press."}}
+    assert _reason(split) is None
+
+
+def test_too_few_informative_sources():
+    results = {**EMPTY, "news_sentiment": _agreeing()["news_sentiment"], "analyst_buzz": _agreeing()["analyst_buzz"]}
+    assert _reason(results) is None
+
+
+def test_disabled():
+    with patch.object(settings, "fast_path_enabled", False):
+        assert _reason(EMPTY) is None
+
+
+def _run_graph(results: dict) -> tuple[dict, object, object]:
+    graph = build_sentiment_graph()
+    with patch("agents.sentiment_graph._news_agent._safe_run", return_value=results["news_sentiment"]), \
+         patch("agents.sentiment_graph._social_agent._safe_run", return_value=results["social_sentiment"]), \
+         patch("agents.sentiment_graph._analyst_agent._safe_run", return_value=results["analyst_buzz"]), \
+         patch("agents.sentiment_graph._web_agent._safe_run", return_value=results["web_search"]), \
+         patch("agents.sentiment_graph._debate_agent.run") as debate, \
+         patch("agents.sentiment_graph.gemini_client.generate") as summary:
+        report = graph.invoke({"ticker": "AAPL"})["report"]
+    return report, debate, summary
+
+
+def test_graph_skips_both_llm_calls_on_agreement():
+    report, debate, summary = _run_graph(_agreeing())
+
+    debate.assert_not_called()
+    summary.assert_not_called()
+    assert report["fast_path"] == fast_path.AGREEMENT
+    assert report["sentiment_label"] == "POSITIVE"
+    assert report["debate"]["key_drivers"] == list(EMPTY)
+    assert "POSITIVE" in report["summary"]
+
+
+def test_graph_templates_the_no_data_case():
+    report, debate, summary = _run_graph(EMPTY)
+
+    debate.assert_not_called()
+    summary.assert_not_called()
+    assert report["fast_path"] == fast_path.NO_DATA
+    assert "No news, social, analyst or web data" in report["summary"]
+
+
+def test_fetch_error_does_not_take_the_fast_path():
+    from unittest.mock import MagicMock
+
+    from data import analyst_fetcher
+
+    client = MagicMock()
+    client.recommendation_trends.side_effect = Exception("Finnhub 502")
+    graph = build_sentiment_graph()
+    with patch("agents.news_sentiment_agent.fetch_all_headlines", return_value=[]), \
+         patch("agents.social_sentiment_agent.fetch_apewisdom", return_value={
+             "ticker": "AAPL", "mentions": 0, "upvotes": 0, "rank": 999, "rank_24h_ago": 999, "rank_change": 0,
+             "no_data": True,
+         }), \
+         patch.object(analyst_fetcher, "_get_client", return_value=client), \
+         patch("agents.web_sentiment_agent._live_info", return_value={}), \
+         patch("agents.web_sentiment_agent.fetch_web_snippets", return_value=[]), \
+         patch("agents.sentiment_graph._debate_agent.run", return_value={"resolution": "Debated."}) as debate, \
+         patch("agents.sentiment_graph.gemini_client.generate", return_value="Summary."):
+        report = graph.invoke({"ticker": "AAPL"})["report"]
+
+    debate.assert_called_once()
+    assert report["fast_path"] is None
+    assert "Finnhub 502" in report["sources"]["analyst_buzz"]["reasoning"]
@@ -0,0 +1,103 @@
+"""
+tests/unit/test_memo.py
+Unit tests for per-node memoization (agents/memo.py): same inputs reuse the
+stored result, and an unchanged run skips debate and summary entirely.
+"""
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents.memo import fingerprint, get_memo_store, memoized
+from agents.sentiment_graph import build_sentiment_graph
+from config.settings import settings
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_same_inputs_reuse_the_result():
+    compute = MagicMock(return_value={"score": 0.4})
+    first = memoized("news_sentiment", "AAPL", {"headlines": ["x"]}, compute)
+    second = memoized("news_sentiment", "aapl", {"headlines": ["x"]}, compute)
+
+    assert compute.call_count == 1
+    assert second == first
+    assert first["fingerprint"]
+
+
+def test_changed_inputs_or_template_recompute():
+    compute = MagicMock(return_value={"score": 0.4})
+    memoized("news_sentiment", "AAPL", {"headlines": ["x"]}, compute)
+    memoized("news_sentiment", "AAPL", {"headlines": ["y"]}, compute)
+    memoized("news_sentiment", "MSFT", {"headlines": ["x"]}, compute)
+    memoized("news_sentiment", "AAPL", {"headlines": ["x"]}, compute, template="v2 of the prompt")
+    assert compute.call_count == 4
+
+
+def test_failures_are_not_stored():
+    compute = MagicMock(side_effect=[RuntimeError("429"), {"score": 0.1}])
+    with pytest.raises(RuntimeError):
+        memoized("web_search", "AAPL", {"snippets": []}, compute)
+    assert memoized("web_search", "AAPL", {"snippets": []}, compute)["score"] == 0.1
+
+
+def test_ttl_zero_turns_it_off():
+    compute = MagicMock(return_value={"score": 0.4})
+    with patch.object(settings, "memo_ttl_seconds", 0):
+        assert get_memo_store() is None
+        memoized("news_sentiment", "AAPL", {"headlines": ["x"]}, compute)
+        memoized("news_sentiment", "AAPL", {"headlines": ["x"]}, compute)
+    assert compute.call_count == 2
+
+
+def _fetchers(stack: ExitStack, headlines: list, mock_analyst_data: dict) -> None:
+    stack.enter_context(patch("agents.news_sentiment_agent.fetch_all_headlines", return_value=headlines))
+    stack.enter_context(patch("agents.social_sentiment_agent.fetch_apewisdom", return_value={
+        "ticker": "AAPL", "mentions": 10, "upvotes": 40, "rank": 12, "rank_24h_ago": 15, "rank_change": 3,
+    }))
+    stack.enter_context(patch("agents.analyst_buzz_agent.fetch_analyst_data", return_value=mock_analyst_data))
+    stack.enter_context(patch("agents.web_sentiment_agent._live_info", return_value={"shortName": "Apple"}))
+    stack.enter_context(patch(
+        "agents.web_sentiment_agent.fetch_web_snippets", return_value=["Apple stock up as analysts raise targets"],
+    ))
+
+
+def test_unchanged_rerun_skips_every_llm_call(mock_headlines, mock_analyst_data):
+    graph = build_sentiment_graph()
+    llm_json = MagicMock(return_value={"score": 0.5, "label": "positive", "reasoning": "Fine."})
+    llm_text = MagicMock(return_value="Summary.")
+
+    with ExitStack() as stack:
+        _fetchers(stack, mock_headlines, mock_analyst_data)
+        stack.enter_context(patch("agents.sentiment_graph.gemini_client.generate", llm_text))
+        stack.enter_context(patch("models.gemini_client.gemini_client.generate_json", llm_json))
+        first = graph.invoke({"ticker": "AAPL"})["report"]
+        # four sources + the debate, then the summary
+        assert (llm_json.call_count, llm_text.call_count) == (5, 1)
+
+        second = graph.invoke({"ticker": "AAPL"})["report"]
+        assert (llm_json.call_count, llm_text.call_count) == (5, 1)
+        assert second["sources"] == first["sources"]
+        assert second["summary"] == "Summary."
+        assert "fingerprint" not in second["sources"]["news_sentiment"]
+
+
+def test_one_changed_source_reruns_it_and_the_debate(mock_headlines, mock_analyst_data):
+    graph = build_sentiment_graph()
+    llm_json = MagicMock(return_value={"score": 0.5, "label": "positive", "reasoning": "Fine."})
+
+    with ExitStack() as stack:
+        stack.enter_context(patch("agents.sentiment_graph.gemini_client.generate", return_value="Summary."))
+        stack.enter_context(patch("models.gemini_client.gemini_client.generate_json", llm_json))
+        with ExitStack() as fetch:
+            _fetchers(fetch, mock_headlines, mock_analyst_data)
+            graph.invoke({"ticker": "AAPL"})
+        with ExitStack() as fetch:
+            _fetchers(fetch, mock_headlines + ["Fresh headline"], mock_analyst_data)
+            graph.invoke({"ticker": "AAPL"})
+
+    # the second run: news again, then the debate (its upstream changed); the other three reused
+    assert llm_json.call_count == 5 + 2
@@ -0,0 +1,90 @@
+"""
+tests/unit/test_metrics.py
+Unit tests for the Prometheus metrics registry and the span -> metrics bridge.
+"""
+import pytest
+from telemetry import metrics
+from telemetry.metrics import Counter, Histogram, MetricsRegistry
+from telemetry.spans import span, mark_error
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+def test_counter_render():
+    reg = MetricsRegistry()
+    c = reg.register(Counter("x_total", "Things", ("source",)))
+    c.inc(source="finviz")
+    c.inc(2, source="finviz")
+    text = reg.render()
+    assert "# TYPE x_total counter" in text
+    assert 'x_total{source="finviz"} 3' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    reg = MetricsRegistry()
+    h = reg.register(Histogram("lat_seconds", "Latency", buckets=(0.1, 1.0)))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v)
+    text = reg.render()
+    assert 'lat_seconds_bucket{le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{le="1.0"} 2' in text
+    assert 'lat_seconds_bucket{le="+Inf"} 3' in text
+    assert "lat_seconds_count 3" in text
+
+
+def test_label_values_are_escaped():
+    reg = MetricsRegistry()
+    c = reg.register(Counter("e_total", "Escapes", ("agent",)))
+    c.inc(agent='we"ird')
+    assert 'e_total{agent="we\\"ird"} 1' in reg.render()
+
+
+def test_spans_feed_metrics():
+    with span("news", kind="node"):
+        with span("finviz", kind="fetch") as s:
+            s.add("bytes", 2048)
+        with span("duckduckgo", kind="fetch"):
+            mark_error(TimeoutError())
+        with span("generate", kind="llm", provider="groq") as s:
+            s.attrs["prompt_tokens"] = 300
+            s.attrs["completion_tokens"] = 40
+            s.add("sleep_seconds", 5)
+
+    assert metrics.NODE_SECONDS.count(node="news") == 1
+    assert metrics.FETCH_TOTAL.value(source="finviz", status="ok") == 1
+    assert metrics.FETCH_TOTAL.value(source="duckduckgo", status="error") == 1
+    assert metrics.FETCH_BYTES.value(source="finviz") == 2048
+    assert metrics.LLM_TOKENS.value(provider="groq", type="prompt") == 300
+    assert metrics.LLM_SLEEP_SECONDS.value(provider="groq") == 5
+    assert metrics.LLM_SECONDS.count(provider="groq") == 1
+
+
+def test_safe_run_failures_are_counted():
+    from agents.news_sentiment_agent import NewsSentimentAgent
+    from unittest.mock import patch
+
+    with patch("agents.news_sentiment_agent.fetch_all_headlines", side_effect=Exception("down")):
+        NewsSentimentAgent()._safe_run("AAPL")
+    assert metrics.AGENT_FAILURES.value(agent="news_sentiment") == 1
+
+
+def test_write_textfile(tmp_path):
+    metrics.TICKERS.inc(status="ok")
+    path = metrics.write_textfile(str(tmp_path / "metrics.prom"))
+    with open(path) as f:
+        assert 'sentiment_tickers_total{status="ok"} 1' in f.read()
+
+
+
+def test_metrics_server_is_local_by_default():
+    from unittest.mock import patch
+
+    with patch.object(metrics, "ThreadingHTTPServer") as server, patch.object(metrics.threading, "Thread"):
+        metrics.start_metrics_server(9100)
+    assert server.call_args[0][0] == ("127.0.0.1", 9100)
+    assert metrics.start_metrics_server(0) is None
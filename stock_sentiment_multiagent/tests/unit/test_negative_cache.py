@@ -0,0 +1,106 @@
+"""
+tests/unit/test_negative_cache.py
+Unit tests for the negative (no data) cache in data/negative_cache.py and
+the fetchers / agents that short-circuit on it.
+"""
+from unittest.mock import MagicMock, patch
+
+from agents.social_sentiment_agent import SocialSentimentAgent
+from config.settings import settings
+from data import analyst_fetcher, news_fetcher, social_fetcher
+from data.negative_cache import NegativeCache, get_negative_cache, known_missing, remember_missing
+from telemetry.spans import record_spans, span
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _apewisdom_response(tickers):
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = {"results": [{"ticker": t, "mentions": 10, "upvotes": 5, "rank": 1} for t in tickers]}
+    return resp
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = FakeClock()
+    cache = NegativeCache(str(tmp_path / "neg.sqlite"), ttl_seconds=60, clock=clock)
+    cache.add("apewisdom", "xyz", "not trending")
+    assert cache.lookup("apewisdom", "XYZ") == "not trending"
+    assert cache.lookup("finviz", "XYZ") is None
+
+    clock.now += 61
+    assert cache.lookup("apewisdom", "XYZ") is None
+    assert cache.entries()[0]["expired"]
+    assert cache.clear(ticker="xyz") == 1
+
+
+def test_disabled_with_zero_ttl():
+    with patch.object(settings, "negative_cache_ttl_seconds", 0):
+        remember_missing("apewisdom", "XYZ", "not trending")
+        assert get_negative_cache() is None
+        assert not known_missing("apewisdom", "XYZ")
+
+
+def test_hit_marks_span_skipped():
+    remember_missing("finviz", "XYZ", "empty Finviz news table")
+    with record_spans() as recorder:
+        with span("finviz", kind="fetch"):
+            assert known_missing("finviz", "XYZ")
+    assert recorder.summary()["spans"][0]["skipped"] == "no data: empty Finviz news table"
+
+
+def test_apewisdom_miss_is_remembered_and_skips_download():
+    with patch.object(social_fetcher.http_client, "get", return_value=_apewisdom_response(["AAPL"])) as get:
+        first = social_fetcher.fetch_apewisdom("XYZ")
+        second = social_fetcher.fetch_apewisdom("XYZ")
+        found = social_fetcher.fetch_apewisdom("AAPL")
+
+    assert first["no_data"] and second["no_data"]
+    assert "no_data" not in found
+    assert get.call_count == 2
+
+
+def test_apewisdom_errors_are_not_cached():
+    with patch.object(social_fetcher.http_client, "get", side_effect=Exception("timeout")):
+        result = social_fetcher.fetch_apewisdom("XYZ")
+    assert "no_data" not in result
+    assert not known_missing("apewisdom", "XYZ")
+
+
+def test_social_agent_skips_llm_when_no_data():
+    remember_missing("apewisdom", "XYZ", "not trending")
+    with patch("agents.social_sentiment_agent.gemini_client.generate_json") as generate:
+        result = SocialSentimentAgent().run("XYZ")
+    generate.assert_not_called()
+    assert result["score"] == 0.0
+    assert result["mentions"] == 0
+
+
+def test_finnhub_without_coverage_is_remembered():
+    client = MagicMock()
+    client.recommendation_trends.return_value = []
+    with patch.object(analyst_fetcher, "_get_client", return_value=client):
+        first = analyst_fetcher.fetch_analyst_data("XYZ")
+        second = analyst_fetcher.fetch_analyst_data("XYZ")
+
+    assert first["recommendation_key"] == second["recommendation_key"] == "none"
+    client.recommendation_trends.assert_called_once()
+    client.price_target.assert_not_called()
+
+
+def test_finviz_empty_table_is_remembered_but_missing_table_is_not():
+    empty = MagicMock(status_code=200, text='<table id="news-table"></table>')
+    blocked = MagicMock(status_code=200, text="<html>Access denied</html>")
+    with patch.object(news_fetcher.http_client, "get", return_value=blocked):
+        assert news_fetcher.fetch_finviz_headlines("XYZ") == []
+    assert not known_missing("finviz", "XYZ")
+
+    with patch.object(news_fetcher.http_client, "get", return_value=empty) as get:
+        news_fetcher.fetch_finviz_headlines("XYZ")
+        news_fetcher.fetch_finviz_headlines("XYZ")
+    assert get.call_count == 1
@@ -37,6 +37,15 @@ def test_run_no_headlines(agent, sample_ticker):
     assert result["score"] == 0.0
     assert result["label"] == "neutral"
     assert result["sources"] == 0
+    assert result["no_data"]
+
+
+def test_failed_fetch_is_an_error_not_an_empty_answer(agent, sample_ticker):
+    with patch("data.news_fetcher.fetch_finviz_headlines", return_value=None), \
+         patch("data.news_fetcher.fetch_yahoo_headlines", return_value=[]):
+        result = agent._safe_run(sample_ticker)
+
+    assert "error" in result and "no_data" not in result
 
 
 def test_score_clamped(agent, sample_ticker, mock_headlines):
@@ -0,0 +1,77 @@
+"""
+tests/unit/test_profiling.py
+Unit tests for the per-span CPU/memory profiler behind `main.py --profile`.
+"""
+import json
+import os
+import pstats
+
+from telemetry.profiling import profile_run
+from telemetry.spans import span, _listeners, _start_listeners
+
+
+def parse_page():
+    return [str(i) * 10 for i in range(5000)]
+
+
+def score_headlines():
+    return sum(range(20000))
+
+
+def fake_pipeline():
+    with span("news", kind="node"):
+        with span("finviz", kind="fetch"):
+            parse_page()
+        score_headlines()
+
+
+def _functions(path: str) -> set:
+    return {func for (_, _, func) in pstats.Stats(path).stats}
+
+
+def test_profiles_each_node_and_fetch_exclusively(tmp_path):
+    with profile_run(str(tmp_path), top=5) as profiler:
+        with profiler.ticker("AAPL"):
+            fake_pipeline()
+
+    ticker_dir = os.path.join(profiler.output_dir, "AAPL")
+    files = sorted(os.listdir(ticker_dir))
+    assert "00_fetch.finviz.pstats" in files
+    assert "01_node.news.pstats" in files
+    assert "02_run.pstats" in files
+    assert "00_fetch.finviz.alloc.txt" in files
+
+    # the node's profile is paused while its fetch runs
+    assert "parse_page" in _functions(os.path.join(ticker_dir, "00_fetch.finviz.pstats"))
+    assert "parse_page" not in _functions(os.path.join(ticker_dir, "01_node.news.pstats"))
+    assert "score_headlines" in _functions(os.path.join(ticker_dir, "01_node.news.pstats"))
+
+    with open(os.path.join(ticker_dir, "stacks.collapsed")) as f:
+        stacks = f.read()
+    assert "run:AAPL;node:news;fetch:finviz;test_profiling.py:parse_page" in stacks
+
+    with open(os.path.join(ticker_dir, "memory.json")) as f:
+        memory = {entry["span"]: entry for entry in json.load(f)}
+    assert memory["fetch.finviz"]["allocated_bytes"] > 0
+    assert memory["fetch.finviz"]["peak_bytes"] >= memory["fetch.finviz"]["allocated_bytes"]
+
+
+def test_summary_aggregates_across_tickers_and_unhooks(tmp_path):
+    with profile_run(str(tmp_path), top=5) as profiler:
+        for ticker in ("AAPL", "MSFT"):
+            with profiler.ticker(ticker):
+                fake_pipeline()
+
+    with open(os.path.join(profiler.output_dir, "summary.txt")) as f:
+        summary = f.read()
+    assert "Profiled 2 ticker(s): AAPL, MSFT" in summary
+    assert "by self time" in summary and "by cumulative time" in summary
+    assert profiler._on_start not in _start_listeners
+    assert profiler._on_end not in _listeners
+
+
+def test_spans_outside_a_ticker_are_ignored(tmp_path):
+    with profile_run(str(tmp_path)) as profiler:
+        fake_pipeline()
+    assert profiler.tickers == []
+    assert not os.path.exists(os.path.join(profiler.output_dir, "AAPL"))
@@ -0,0 +1,63 @@
+"""
+tests/unit/test_prompt_budget.py
+Unit tests for prompt budgeting (models/prompt_budget.py) and the
+estimated-vs-actual token accounting on LLM spans.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+from config.prompts import NEWS_SENTIMENT_PROMPT
+from models.gemini_client import LLMClient
+from models.prompt_budget import compact_json, estimate_tokens, fit, truncate
+from telemetry.spans import record_spans
+
+
+def test_estimate_is_about_four_chars_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 100) == 100
+
+
+def test_truncate_collapses_whitespace_and_cuts():
+    assert truncate("a  b\n c", 50) == "a b c"
+    cut = truncate("x" * 500, 100)
+    assert len(cut) == 100 and cut.endswith("…")
+
+
+def test_compact_json_drops_empty_fields():
+    payload = {"consensus": "buy", "price_target_high": None, "recent_actions_sample": [], "nested": {"a": 1, "b": ""}}
+    text = compact_json(payload)
+    assert json.loads(text) == {"consensus": "buy", "nested": {"a": 1}}
+    assert " " not in text
+
+
+def test_fit_keeps_leading_items_within_budget():
+    headlines = [f"Headline number {i} " + "word " * 30 for i in range(40)]
+    kept = fit(NEWS_SENTIMENT_PROMPT, "headlines", headlines, budget=600, ticker="AAPL")
+
+    assert 0 < len(kept) < len(headlines)
+    assert kept[0].startswith("Headline number 0")
+    prompt = NEWS_SENTIMENT_PROMPT.format(ticker="AAPL", headlines="\n".join(f"- {h}" for h in kept))
+    assert estimate_tokens(prompt) <= 600
+
+
+def test_fit_always_keeps_one_item():
+    assert len(fit(NEWS_SENTIMENT_PROMPT, "headlines", ["x" * 5000], budget=10, ticker="AAPL")) == 1
+
+
+def test_llm_span_records_estimated_and_actual_tokens():
+    client = LLMClient()
+    client.provider = "groq"
+    client._model = "fake"
+    client._client = MagicMock()
+    response = client._client.chat.completions.create.return_value
+    response.usage.prompt_tokens = 130
+    response.usage.completion_tokens = 20
+    response.choices[0].message.content = "{}"
+
+    prompt = "word " * 100
+    with patch.object(client, "_ensure_initialized"), record_spans() as recorder:
+        client.generate(prompt)
+
+    llm = next(s for s in recorder.summary()["spans"] if s["kind"] == "llm")
+    assert llm["estimated_prompt_tokens"] == estimate_tokens(prompt)
+    assert llm["prompt_tokens"] == 130
@@ -0,0 +1,54 @@
+"""
+tests/unit/test_rate_limit.py
+Unit tests for the client-side pacing in utils/rate_limit.py.
+"""
+import multiprocessing
+from unittest.mock import patch
+
+import pytest
+
+from config.settings import settings
+from utils import deadline, rate_limit
+from utils.rate_limit import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    rate_limit.reset_limiters()
+    yield
+    rate_limit.reset_limiters()
+
+
+def test_burst_of_a_minutes_worth_then_paced():
+    limiter = RateLimiter("finnhub", per_minute=60)
+    with patch("utils.rate_limit.time.time", return_value=1000.0):
+        waits = [limiter.reserve() for _ in range(62)]
+    assert waits[:60] == [0.0] * 60
+    assert waits[60] == pytest.approx(1.0)
+    assert waits[61] == pytest.approx(2.0)
+
+
+def test_unpaced_when_limit_is_zero():
+    with patch.object(settings, "llm_requests_per_minute", 0):
+        assert rate_limit.get_limiter("llm") is None
+        assert rate_limit.acquire("llm") == 0.0
+
+
+def test_processes_share_one_budget():
+    slots = rate_limit.share_limiters(multiprocessing.get_context("spawn"))
+    first = RateLimiter("llm", per_minute=2, slot=slots["llm"])
+    second = RateLimiter("llm", per_minute=2, slot=slots["llm"])
+    with patch("utils.rate_limit.time.time", return_value=1000.0):
+        assert first.reserve() == 0.0
+        assert second.reserve() == 0.0
+        # the third call waits no matter which "process" makes it
+        assert first.reserve() == pytest.approx(30.0)
+
+
+def test_refuses_to_wait_past_deadline():
+    limiter = RateLimiter("llm", per_minute=1)
+    limiter.reserve()
+    with deadline.within(5), patch("utils.rate_limit.time.sleep") as sleep:
+        with pytest.raises(deadline.DeadlineExceeded):
+            limiter.acquire()
+    sleep.assert_not_called()
@@ -0,0 +1,108 @@
+"""
+tests/unit/test_relevance.py
+Unit tests for the web snippet relevance filter (models/relevance.py).
+"""
+from unittest.mock import patch
+
+from agents.web_sentiment_agent import WebSentimentAgent
+from config.settings import settings
+from models.relevance import filter_snippets, score_snippets
+
+ON_TOPIC = "Apple Inc. (AAPL) shares rise after analysts raise price target on strong iPhone demand."
+NAME_ONLY = "Apple stock outlook: analysts expect services revenue to keep growing."
+LISTICLE = "10 best stocks to buy now for a recession-proof portfolio."
+OTHER = "Microsoft (MSFT) earnings beat as Azure cloud revenue accelerates."
+OTHER_ON_INTENT = "Nvidia shares rally as analyst raises price target ahead of earnings guidance."
+NAMED_LISTICLE = "10 best stocks to buy now: AAPL, MSFT, NVDA and more for a recession-proof portfolio."
+
+
+def test_ticker_and_company_name_both_count():
+    ticker_hit, name_hit, miss = score_snippets([ON_TOPIC, NAME_ONLY, OTHER], "AAPL", "Apple Inc.")
+    assert ticker_hit > miss and name_hit > miss
+
+
+def test_other_company_in_stock_vocabulary_is_dropped():
+    kept, stats = filter_snippets([ON_TOPIC, OTHER_ON_INTENT], "AAPL", "Apple Inc.")
+    assert kept == [ON_TOPIC]
+    assert stats["snippets_filtered"] == 1
+
+
+def test_listicle_naming_the_ticker_is_dropped_at_the_default_threshold():
+    kept, _ = filter_snippets([ON_TOPIC, NAMED_LISTICLE], "AAPL", "Apple Inc.")
+    assert kept == [ON_TOPIC]
+
+
+def test_naming_the_company_without_saying_anything_about_the_stock_is_dropped():
+    kept, _ = filter_snippets([ON_TOPIC, "Apple pie recipe for a slow Sunday afternoon."], "AAPL", "Apple Inc.")
+    assert kept == [ON_TOPIC]
+
+
+def test_company_name_must_match_in_full():
+    sibling, own = score_snippets(
+        ["General Electric stock outlook: analysts raise price target.",
+         "General Motors stock outlook: analysts raise price target."],
+        "GM", "General Motors Company",
+    )
+    assert sibling == 0.0 and own > 0
+
+
+def test_short_ticker_needs_a_cashtag_or_exchange_context():
+    word, cashtag, exchange = score_snippets(
+        ["A strong quarter lifts the stock price target.",
+         "$A shares rise as analysts raise the price target.",
+         "Agilent (NYSE: A) stock price target raised by analysts."],
+        "A",
+    )
+    assert word == 0.0
+    assert cashtag > 0 and exchange > 0
+
+
+def test_ticker_must_be_a_whole_word():
+    embedded, standalone = score_snippets(["The AAPLX fund rebalanced.", "$AAPL rebalanced."], "AAPL")
+    assert standalone > embedded
+
+
+def test_drops_listicles_and_other_companies():
+    kept, stats = filter_snippets([LISTICLE, ON_TOPIC, OTHER, NAME_ONLY], "AAPL", "Apple Inc.")
+
+    assert LISTICLE not in kept and OTHER not in kept
+    assert stats["snippets_filtered"] == 2
+    assert stats["tokens_saved"] > 0
+
+
+def test_kept_snippets_are_most_relevant_first():
+    kept, _ = filter_snippets([NAME_ONLY, ON_TOPIC], "AAPL", "Apple Inc.")
+    assert kept == [ON_TOPIC, NAME_ONLY]
+
+
+def test_zero_threshold_turns_the_filter_off():
+    snippets = [LISTICLE, OTHER]
+    with patch.object(settings, "web_relevance_min", 0.0):
+        kept, stats = filter_snippets(snippets, "AAPL", "Apple Inc.")
+    assert kept == snippets
+    assert stats == {"snippets_filtered": 0, "tokens_saved": 0}
+
+
+def test_web_agent_only_scores_relevant_snippets(mock_gemini_positive):
+    with patch("agents.web_sentiment_agent.fetch_web_snippets", return_value=[LISTICLE, ON_TOPIC, OTHER]), \
+         patch("agents.web_sentiment_agent.yf.Ticker") as mock_yf, \
+         patch("agents.web_sentiment_agent.gemini_client.generate_json", return_value=mock_gemini_positive) as llm:
+        mock_yf.return_value.info = {"shortName": "Apple Inc."}
+        result = WebSentimentAgent().run("AAPL")
+
+    prompt = llm.call_args[0][0]
+    assert ON_TOPIC in prompt and LISTICLE not in prompt and OTHER not in prompt
+    assert result["snippets_analyzed"] == 1
+    assert result["snippets_filtered"] == 2
+
+
+def test_web_agent_with_nothing_relevant_skips_the_llm():
+    with patch("agents.web_sentiment_agent.fetch_web_snippets", return_value=[LISTICLE, OTHER]), \
+         patch("agents.web_sentiment_agent.yf.Ticker") as mock_yf, \
+         patch("agents.web_sentiment_agent.gemini_client.generate_json") as llm:
+        mock_yf.return_value.info = {"shortName": "Apple Inc."}
+        result = WebSentimentAgent().run("AAPL")
+
+    llm.assert_not_called()
+    assert result["score"] == 0.0 and result["snippets_analyzed"] == 0
+    assert result["snippets_filtered"] == 2
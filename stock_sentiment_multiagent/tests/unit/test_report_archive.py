@@ -0,0 +1,83 @@
+"""
+tests/unit/test_report_archive.py
+Unit tests for the report archive index and save_report().
+"""
+import json
+import os
+import pytest
+from output.report_archive import ReportArchive
+from output.report_generator import save_report
+
+
+def _report(ticker, timestamp, label="POSITIVE", score=0.5):
+    return {
+        "ticker": ticker,
+        "timestamp": timestamp,
+        "sentiment_label": label,
+        "sentiment_score": score,
+        "confidence": 0.7,
+        "summary": f"{ticker} at {timestamp}",
+    }
+
+
+@pytest.fixture
+def archive(tmp_path):
+    out = str(tmp_path)
+    save_report(_report("MSFT", "2026-10-12T10:00:00+00:00", "POSITIVE", 0.4), out)
+    save_report(_report("MSFT", "2026-10-13T10:00:00+00:00", "NEGATIVE", -0.3), out)
+    save_report(_report("MSFT", "2026-10-14T10:00:00+00:00", "NEGATIVE", -0.6), out)
+    save_report(_report("AAPL", "2026-10-13T12:00:00+00:00", "NEUTRAL", 0.0), out)
+    save_report(_report("AAPL", "2026-10-15T12:00:00+00:00", "NEGATIVE", -0.2), out)
+    return ReportArchive(out)
+
+
+def test_save_report_writes_file_and_indexes(tmp_path):
+    path = save_report(_report("TSLA", "2026-10-12T10:00:00+00:00"), str(tmp_path))
+    assert os.path.exists(path)
+    assert os.path.basename(path) == "TSLA_2026-10-12T10-00-00_00-00.json"
+
+    entry = ReportArchive(str(tmp_path)).latest("tsla")
+    assert entry["path"] == path
+    assert entry["label"] == "POSITIVE"
+
+
+def test_latest(archive):
+    entry = archive.latest("MSFT")
+    assert entry["timestamp"].startswith("2026-10-14")
+    assert entry["score"] == -0.6
+
+
+def test_latest_unknown_ticker(archive):
+    assert archive.latest("ZZZZ") is None
+
+
+def test_range_is_half_open_and_ordered(archive):
+    entries = archive.range("MSFT", since="2026-10-12T10:00:00+00:00", until="2026-10-14T10:00:00+00:00")
+    assert [e["label"] for e in entries] == ["POSITIVE", "NEGATIVE"]
+
+
+def test_filter_by_label_and_score(archive):
+    entries = archive.filter(label="negative", max_score=-0.25)
+    assert [(e["ticker"], e["score"]) for e in entries] == [("MSFT", -0.3), ("MSFT", -0.6)]
+
+
+def test_flips_into_label(archive):
+    flips = archive.flips(label="NEGATIVE", since="2026-10-13")
+    assert [(f["ticker"], f["previous_label"]) for f in flips] == [("MSFT", "POSITIVE"), ("AAPL", "NEUTRAL")]
+
+
+def test_load_reads_full_report(archive):
+    report = archive.load(archive.latest("AAPL"))
+    assert report["summary"] == "AAPL at 2026-10-15T12:00:00+00:00"
+
+
+def test_rebuild_indexes_existing_files(tmp_path):
+    with open(tmp_path / "NVDA_old.json", "w") as f:
+        json.dump(_report("NVDA", "2026-01-01T00:00:00+00:00"), f)
+    with open(tmp_path / "notes.json", "w") as f:
+        f.write("not a report")
+
+    archive = ReportArchive(str(tmp_path))
+    assert archive.latest("NVDA") is None
+    assert archive.rebuild() == 1
+    assert archive.latest("NVDA")["ticker"] == "NVDA"
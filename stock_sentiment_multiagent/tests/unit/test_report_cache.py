@@ -0,0 +1,128 @@
+"""
+tests/unit/test_report_cache.py
+Unit tests for SingleFlight coalescing and the stale-while-revalidate ReportCache.
+"""
+import threading
+import time
+import pytest
+from service.report_cache import SingleFlight, ReportCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return "report"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("NVDA", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert [r for r, _ in results] == ["report"] * 5
+    assert sum(1 for _, shared in results if shared) == 4
+
+
+def test_singleflight_propagates_errors_and_clears_key():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("TSLA", boom)
+    assert not flight.in_flight("TSLA")
+    assert flight.do("TSLA", lambda: "ok") == ("ok", False)
+
+
+def test_cache_miss_then_fresh():
+    clock = FakeClock()
+    calls = []
+    cache = ReportCache(lambda t: calls.append(t) or {"ticker": t}, fresh_seconds=60, stale_seconds=600, clock=clock)
+
+    assert cache.get("aapl")[1] == "miss"
+    clock.now += 30
+    report, status, age = cache.get("AAPL")
+    assert status == "fresh"
+    assert age == 30
+    assert calls == ["AAPL"]
+
+
+def test_cache_serves_stale_and_refreshes_in_background():
+    clock = FakeClock()
+    refreshed = threading.Event()
+    version = {"n": 0}
+
+    def compute(ticker):
+        version["n"] += 1
+        if version["n"] > 1:
+            refreshed.set()
+        return {"ticker": ticker, "version": version["n"]}
+
+    cache = ReportCache(compute, fresh_seconds=60, stale_seconds=600, clock=clock)
+    cache.get("AAPL")
+    clock.now += 120
+
+    report, status, _ = cache.get("AAPL")
+    assert status == "stale"
+    assert report["version"] == 1
+    assert refreshed.wait(2)
+
+    time.sleep(0.05)
+    report, status, _ = cache.get("AAPL")
+    assert status == "fresh"
+    assert report["version"] == 2
+
+
+def test_cache_expired_entry_recomputes():
+    clock = FakeClock()
+    cache = ReportCache(lambda t: {"ticker": t}, fresh_seconds=60, stale_seconds=600, clock=clock)
+    cache.get("AAPL")
+    clock.now += 1000
+    assert cache.get("AAPL")[1] == "miss"
+
+
+def test_fresh_request_skips_the_cache_but_joins_a_run_in_flight():
+    clock = FakeClock()
+    release = threading.Event()
+    calls = []
+
+    def compute(ticker):
+        calls.append(ticker)
+        release.wait(2)
+        return {"ticker": ticker, "run": len(calls)}
+
+    cache = ReportCache(compute, fresh_seconds=60, stale_seconds=600, clock=clock)
+    release.set()
+    cache.get("AAPL")
+    release.clear()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("AAPL", fresh=True))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(2)
+
+    assert calls == ["AAPL", "AAPL"]
+    assert sorted(status for _, status, _ in results) == ["coalesced", "miss"]
+    assert all(report["run"] == 2 for report, _, _ in results)
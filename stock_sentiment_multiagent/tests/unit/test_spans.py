@@ -0,0 +1,81 @@
+"""
+tests/unit/test_spans.py
+Unit tests for the timing span recorder and batch aggregation.
+"""
+import pytest
+from telemetry.spans import span, traced, record_spans, current_span, aggregate_timings, skipped_sources
+
+
+def test_spans_are_recorded_with_parent_and_attrs():
+    with record_spans() as recorder:
+        with span("news", kind="node"):
+            with span("finviz", kind="fetch") as s:
+                s.add("bytes", 1200)
+                s.add("bytes", 300)
+            with span("generate", kind="llm", retries=0) as s:
+                s.add("retries", 2)
+                s.attrs["prompt_tokens"] = 400
+                s.attrs["completion_tokens"] = 60
+
+    summary = recorder.summary()
+    assert set(summary["nodes"]) == {"news"}
+    assert summary["fetch"]["calls"] == 1
+    assert summary["fetch"]["bytes"] == 1500
+    assert summary["llm"]["retries"] == 2
+    assert summary["llm"]["prompt_tokens"] == 400
+    finviz = next(s for s in summary["spans"] if s["name"] == "finviz")
+    assert finviz["parent"] == "news"
+
+
+def test_span_without_recorder_is_harmless():
+    with span("finviz", kind="fetch") as s:
+        s.add("bytes", 10)
+        assert current_span() is s
+    assert current_span() is None
+
+
+def test_traced_records_errors():
+    @traced("apewisdom", kind="fetch")
+    def boom():
+        raise ValueError("bad json")
+
+    with record_spans() as recorder:
+        with pytest.raises(ValueError):
+            boom()
+
+    assert recorder.summary()["spans"][0]["error"] == "ValueError"
+
+
+def test_aggregate_timings_across_reports():
+    reports = []
+    for seconds in (1.0, 2.0, 3.0, 10.0):
+        reports.append({"timings": {
+            "total_seconds": seconds,
+            "nodes": {"news": seconds / 2},
+            "spans": [
+                {"name": "news", "kind": "node", "seconds": seconds / 2},
+                {"name": "generate", "kind": "llm", "seconds": seconds / 4, "retries": 1, "sleep_seconds": 5.0},
+            ],
+        }})
+    reports.append({"ticker": "NO_TIMINGS"})
+
+    summary = aggregate_timings(reports)
+    assert summary["reports"] == 4
+    assert summary["run_seconds"]["p50"] == 2.0
+    assert summary["run_seconds"]["max"] == 10.0
+    assert summary["nodes"]["news"]["count"] == 4
+    assert summary["spans"]["llm.generate"]["count"] == 4
+    assert summary["totals"]["llm"]["retries"] == 4
+    assert summary["totals"]["llm"]["sleep_seconds"] == 20.0
+
+
+def test_skipped_sources_lists_fetches_not_nodes():
+    with record_spans() as recorder:
+        with span("web", kind="node") as node:
+            node.attrs["skipped"] = "deadline exceeded"
+            with span("duckduckgo", kind="fetch") as fetch:
+                fetch.attrs["skipped"] = "circuit open for html.duckduckgo.com"
+
+    assert skipped_sources(recorder.summary()) == [
+        {"source": "duckduckgo", "reason": "circuit open for html.duckduckgo.com"},
+    ]
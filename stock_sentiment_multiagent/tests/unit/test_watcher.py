@@ -0,0 +1,142 @@
+"""
+tests/unit/test_watcher.py
+Unit tests for watch mode (service/watcher.py): probe first, full run only
+when the inputs moved or the report went stale, priority sets the cadence.
+"""
+from datetime import datetime
+
+import pytest
+
+from config.settings import settings
+from service.watcher import Watcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _report(ticker, score=0.2):
+    return {
+        "ticker": ticker,
+        "timestamp": "2026-10-19T10:00:00+00:00",
+        "sentiment_label": "NEUTRAL",
+        "sentiment_score": score,
+        "confidence": 0.5,
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def inputs():
+    # what the probe sees per ticker; tests edit it between steps
+    return {
+        "AAPL": {"headlines": ["a1", "a2", "a3", "a4"], "rank": 10, "rank_change": 0},
+        "MSFT": {"headlines": ["m1", "m2"], "rank": 50, "rank_change": 0},
+    }
+
+
+@pytest.fixture
+def runs():
+    return []
+
+
+@pytest.fixture
+def watcher(tmp_path, clock, inputs, runs):
+    def compute(ticker):
+        runs.append(ticker)
+        return _report(ticker)
+
+    return Watcher(
+        ["aapl", "msft"], compute=compute, probe_fn=lambda t: dict(inputs[t]),
+        output_dir=str(tmp_path), clock=clock,
+    )
+
+
+def test_first_probe_runs_everything(watcher, runs):
+    assert watcher.run(max_probes=2) == 2
+    assert sorted(runs) == ["AAPL", "MSFT"]
+
+
+def test_unchanged_inputs_skip_the_full_run(watcher, clock, runs):
+    watcher.run(max_probes=2)
+    clock.now += 600
+    assert not watcher.step("AAPL")
+    assert runs.count("AAPL") == 1
+
+
+def test_new_headlines_trigger_a_refresh(watcher, clock, inputs, runs):
+    watcher.run(max_probes=2)
+    clock.now += 600
+    inputs["AAPL"]["headlines"] = ["a1", "b1", "b2", "b3"]
+    assert watcher.step("AAPL")
+    # one new headline out of four isn't material
+    inputs["AAPL"]["headlines"] = ["a1", "b1", "b2", "c1"]
+    assert not watcher.step("AAPL")
+
+
+def test_rank_move_triggers_a_refresh(watcher, inputs):
+    watcher.run(max_probes=2)
+    inputs["MSFT"].update(rank=35, rank_change=15)
+    assert watcher.step("MSFT")
+
+
+def test_stale_report_is_rerun(watcher, clock):
+    watcher.run(max_probes=2)
+    clock.now += settings.watch_max_age_seconds
+    assert watcher.step("AAPL")
+
+
+def test_movers_are_probed_sooner(watcher, inputs):
+    watcher.run(max_probes=2)
+    inputs["AAPL"]["rank_change"] = 40
+    watcher.step("AAPL")
+    watcher.step("MSFT")
+    assert watcher.watched["AAPL"].due_at < watcher.watched["MSFT"].due_at
+
+
+def test_restart_seeds_from_the_archive(tmp_path, clock, inputs, runs, watcher):
+    watcher.run(max_probes=2)
+
+    # a new process five minutes after the archived report: fresh, so the first probe is only a baseline
+    clock.now = datetime.fromisoformat("2026-10-19T10:05:00+00:00").timestamp()
+    restarted = Watcher(
+        ["AAPL"], compute=lambda t: runs.append(t) or _report(t), probe_fn=lambda t: dict(inputs[t]),
+        output_dir=str(tmp_path), clock=clock,
+    )
+    assert restarted.watched["AAPL"].scores == [0.2]
+    assert not restarted.step("AAPL")
+    assert runs.count("AAPL") == 1
+
+
+def test_probe_looks_past_the_negative_cache():
+    from unittest.mock import MagicMock, patch
+
+    from data import http_client
+    from data.negative_cache import known_missing, remember_missing
+    from service.watcher import probe
+
+    remember_missing("apewisdom", "XYZ", "not in ApeWisdom's trending list")
+    remember_missing("finviz", "XYZ", "empty Finviz news table")
+
+    def get(url, **kwargs):
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {"results": [{"ticker": "XYZ", "rank": 3, "rank_24h_ago": 40}]}
+        resp.text = '<table id="news-table"><tr><td><a href="#">XYZ wins contract</a></td></tr></table>'
+        return resp
+
+    with patch.object(http_client, "get", side_effect=get), \
+         patch("data.news_fetcher.fetch_yahoo_headlines", return_value=[]):
+        seen = probe("XYZ")
+
+    assert seen["rank"] == 3 and seen["rank_change"] == 37
+    assert seen["headlines"] == ["XYZ wins contract"]
+    # everything else still trusts the cache
+    assert known_missing("apewisdom", "XYZ")
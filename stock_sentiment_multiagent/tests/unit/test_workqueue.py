@@ -0,0 +1,142 @@
+"""
+tests/unit/test_workqueue.py
+Unit tests for the queue backend (workqueue/sqlite_backend.py) and the
+lease/ack worker loop (workqueue/worker.py).
+"""
+import threading
+import time
+
+import pytest
+
+from workqueue.backend import open_backend
+from workqueue.sqlite_backend import SQLiteBackend
+from workqueue.worker import QueueWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def backend(tmp_path, clock):
+    return SQLiteBackend(str(tmp_path / "queue.sqlite"), max_attempts=2, clock=clock)
+
+
+def test_open_backend_by_url(tmp_path):
+    backend = open_backend(f"sqlite:///{tmp_path}/q.sqlite")
+    assert isinstance(backend, SQLiteBackend)
+    with pytest.raises(ValueError, match="No queue backend"):
+        open_backend("redis://localhost/0")
+
+
+def test_enqueue_skips_tickers_already_queued(backend):
+    assert backend.enqueue("nightly", ["aapl", "MSFT"]) == 2
+    assert backend.enqueue("nightly", ["AAPL", "NVDA"]) == 1
+    assert backend.enqueue("backfill", ["AAPL"]) == 1
+    assert backend.stats("nightly")["pending"] == 3
+
+
+def test_lease_hides_task_until_it_expires(backend, clock):
+    backend.enqueue("q", ["AAPL"])
+    first = backend.lease("q", "node-a", lease_seconds=60)
+    assert first.ticker == "AAPL" and first.attempts == 1
+    assert backend.lease("q", "node-b", lease_seconds=60) is None
+
+    # node-a crashed: after the visibility timeout node-b gets it, and node-a's ack is refused
+    clock.now += 61
+    second = backend.lease("q", "node-b", lease_seconds=60)
+    assert second.id == first.id and second.attempts == 2
+    assert not backend.ack(first, {"ticker": "AAPL"})
+    assert backend.ack(second, {"ticker": "AAPL", "score": 1})
+    assert list(backend.results("q")) == [("AAPL", {"ticker": "AAPL", "score": 1})]
+
+
+def test_extend_keeps_the_lease(backend, clock):
+    backend.enqueue("q", ["AAPL"])
+    task = backend.lease("q", "node-a", lease_seconds=60)
+    clock.now += 50
+    assert backend.extend(task, 60)
+    clock.now += 50
+    assert backend.lease("q", "node-b", lease_seconds=60) is None
+
+
+def test_failures_retry_with_delay_then_park(backend, clock):
+    backend.enqueue("q", ["AAPL"])
+    task = backend.lease("q", "w", 60)
+    backend.fail(task, "RuntimeError: boom", retry_delay=30)
+    assert backend.lease("q", "w", 60) is None
+    clock.now += 31
+    task = backend.lease("q", "w", 60)
+    backend.fail(task, "RuntimeError: boom again", retry_delay=30)
+    assert backend.stats("q")["failed"] == 1
+    assert backend.failures("q") == [{"ticker": "AAPL", "attempts": 2, "error": "RuntimeError: boom again"}]
+
+
+def test_expired_last_attempt_is_parked(backend, clock):
+    backend.enqueue("q", ["AAPL"])
+    for _ in range(2):
+        backend.lease("q", "crashy", 60)
+        clock.now += 61
+    assert backend.lease("q", "w", 60) is None
+    assert backend.failures("q")[0]["error"] == "lease expired"
+
+
+def test_concurrent_workers_never_share_a_task(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "queue.sqlite"))
+    tickers = [f"T{i}" for i in range(40)]
+    backend.enqueue("q", tickers)
+    seen = []
+
+    def compute(ticker):
+        seen.append(ticker)
+        return {"ticker": ticker}
+
+    workers = [QueueWorker(backend, "q", compute=compute, poll_seconds=0.01) for _ in range(4)]
+    threads = [threading.Thread(target=w.run, kwargs={"until_empty": True}) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(seen) == sorted(tickers)
+    assert backend.stats("q")["done"] == 40
+
+
+def test_worker_heartbeat_outlives_short_lease(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "queue.sqlite"))
+    backend.enqueue("q", ["AAPL"])
+    stolen = []
+
+    def slow(ticker):
+        time.sleep(0.5)
+        stolen.append(backend.lease("q", "other", 0.3))
+        return {"ticker": ticker}
+
+    QueueWorker(backend, "q", compute=slow, lease_seconds=0.3).run_once()
+    assert stolen == [None]
+    assert backend.stats("q")["done"] == 1
+
+
+def test_worker_retries_failed_ticker(backend, clock):
+    backend.enqueue("q", ["AAPL"])
+    calls = []
+
+    def flaky(ticker):
+        calls.append(ticker)
+        if len(calls) == 1:
+            raise RuntimeError("provider outage")
+        return {"ticker": ticker}
+
+    worker = QueueWorker(backend, "q", compute=flaky, retry_delay=0)
+    assert worker.run_once()
+    assert worker.run_once()
+    assert backend.stats("q")["done"] == 1
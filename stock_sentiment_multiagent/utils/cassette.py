@@ -0,0 +1,154 @@
+"""
+Record/replay of everything the pipeline pulls from the outside world.
+
+Every external call goes through `through(kind, key, fn)`:
+    http      data.http_client.get          (Finviz, DuckDuckGo, ApeWisdom raw bodies)
+    yahoo     yf.Ticker(...).news / .info
+    finnhub   Finnhub SDK calls
+    llm       LLMClient.generate            (keyed by a hash of the prompt)
+
+With no cassette active that's just fn(). In record mode the result (or
+the exception message) is captured; in replay mode it's served back from
+the cassette without touching the network or the SDKs, so a run is
+deterministic and only the pure-Python parts -- parsing, prompt building,
+aggregation, reporting -- cost anything. Handy for reproducing a bad
+score or profiling.
+
+    python main.py --ticker NVDA --record cassettes/nvda.json.gz
+    python main.py --ticker NVDA --replay cassettes/nvda.json.gz
+
+Cassettes are gzipped JSON. The same key recorded more than once replays
+in recorded order (the last answer repeats once they run out).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# the one active cassette, process-wide -- module global rather than a
+# contextvar so worker threads in thread-pool runs see it too
+_active: Optional["Cassette"] = None
+
+
+class CassetteMiss(LookupError):
+    """Replay asked for a call the cassette never recorded."""
+
+
+class ReplayedError(Exception):
+    """An exception recorded during a `record` run, raised again on replay."""
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+        self.misses: list[str] = []
+        if mode == "replay":
+            self._load()
+
+    @staticmethod
+    def _slot(kind: str, key: str) -> str:
+        return f"{kind} {key}"
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+        for entry in data["entries"]:
+            self._entries.setdefault(self._slot(entry["kind"], entry["key"]), []).append(entry)
+
+    def save(self) -> str:
+        entries = [entry for recorded in self._entries.values() for entry in recorded]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({
+                "version": CASSETTE_VERSION,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "entries": entries,
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def record(self, kind: str, key: str, fn: Callable[[], object], encode=None):
+        try:
+            result = fn()
+        except Exception as e:
+            self._append(kind, key, {"error": str(e)})
+            raise
+        self._append(kind, key, {"value": encode(result) if encode else result})
+        return result
+
+    def _append(self, kind: str, key: str, payload: dict) -> None:
+        with self._lock:
+            self._entries.setdefault(self._slot(kind, key), []).append({"kind": kind, "key": key, **payload})
+
+    def replay(self, kind: str, key: str, decode=None):
+        slot = self._slot(kind, key)
+        with self._lock:
+            recorded = self._entries.get(slot)
+            if not recorded:
+                self.misses.append(slot)
+                logger.warning(f"Cassette miss: {kind} {key[:120]}")
+                raise CassetteMiss(f"Not in cassette {self.path}: {kind} {key[:120]}")
+            index = self._cursor.get(slot, 0)
+            self._cursor[slot] = index + 1
+            entry = recorded[min(index, len(recorded) - 1)]
+
+        if "error" in entry:
+            raise ReplayedError(entry["error"])
+        return decode(entry["value"]) if decode else entry["value"]
+
+
+def through(kind: str, key: str, fn: Callable[[], object], encode=None, decode=None):
+    """
+    Run fn() via the active cassette, if any. `encode` turns the result into
+    something JSON-serializable for recording; `decode` rebuilds it on replay.
+    """
+    cassette = _active
+    if cassette is None:
+        return fn()
+    if cassette.mode == "replay":
+        return cassette.replay(kind, key, decode)
+    return cassette.record(kind, key, fn, encode)
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:24]
+
+
+def active() -> Optional[Cassette]:
+    return _active
+
+
+@contextmanager
+def use_cassette(path: str, mode: str):
+    """Activate a cassette for the block; in record mode it's written out on exit."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("A cassette is already active")
+    cassette = Cassette(path, mode)
+    _active = cassette
+    try:
+        yield cassette
+    finally:
+        _active = None
+        if mode == "record":
+            logger.info(f"Cassette written to {cassette.save()}")
+        elif cassette.misses:
+            logger.warning(f"{len(cassette.misses)} call(s) were not in cassette {path}")
@@ -0,0 +1,87 @@
+"""
+Per-run time budget.
+
+`OrchestratorAgent.run(ticker, deadline=30)` opens a deadline scope; the
+absolute expiry lives in a contextvar (like the current span), so every
+node, fetcher and LLM call running under it can ask how much time is left
+without it being threaded through each signature:
+
+    HTTP requests     timeout capped to what's left (data/http_client.py)
+    SDK calls         refused once it's passed (Yahoo, Finnhub)
+    LLM calls         refused once it's passed; a 429 backoff that would
+                      sleep past it gives up instead of sleeping
+    agents            an agent that runs out of time comes back as a
+                      "missing" source instead of an error (BaseAgent)
+
+The aggregate and report nodes never check it, so a run that blows its
+budget still ends in a report -- one that lists its missing_sources and
+has its confidence scaled down by the weight of what's missing.
+
+Scopes nest and the tighter one wins, so run_batch(tickers, deadline=60)
+is one budget for the whole batch.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Union
+
+from telemetry.spans import current_span
+
+_expires_at: ContextVar[Optional[float]] = ContextVar("deadline_expires_at", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The run's time budget is used up; the work was skipped or cut short."""
+
+    def __init__(self, what: str = "call"):
+        super().__init__(f"deadline exceeded before {what}")
+        self.what = what
+
+
+@contextmanager
+def within(seconds: Optional[float]):
+    """Run the block with `seconds` of budget (None or <= 0: no extra limit)."""
+    if not seconds or seconds <= 0:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    outer = _expires_at.get()
+    token = _expires_at.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget (never negative), or None when there is none."""
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(what: str = "call") -> None:
+    """Raise DeadlineExceeded (and mark the open span skipped) if the budget is used up."""
+    if expired():
+        s = current_span()
+        if s is not None:
+            s.attrs["skipped"] = "deadline exceeded"
+        raise DeadlineExceeded(what)
+
+
+def cap(timeout: Union[float, tuple, None]) -> Union[float, tuple, None]:
+    """Shrink a requests-style timeout (seconds or (connect, read)) to fit what's left."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(min(t, left) for t in timeout)
+    return min(timeout, left)
@@ -0,0 +1,41 @@
+"""
+Deferred module imports.
+
+yfinance (which drags in pandas), bs4, finnhub and requests together take
+most of a second to import, and plenty of invocations never touch some
+of them (serve/daemon modes answering from cache, --help, report
+lookups...). `lazy_import("yfinance")` hands back a stand-in that does the
+real import the first time one of its attributes is used.
+
+    yf = lazy_import("yfinance")
+    yf.Ticker("AAPL")          # yfinance is imported here, not at module load
+
+Because the stand-in is an ordinary object, tests can still patch
+attributes on it, e.g. patch("agents.web_sentiment_agent.yf.Ticker").
+"""
+import importlib
+
+
+class LazyModule:
+    """Proxy for a module that isn't imported until first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        # only called for attributes not set on the proxy itself
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
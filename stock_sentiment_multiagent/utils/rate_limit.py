@@ -0,0 +1,108 @@
+"""
+Client-side request pacing, shareable across processes.
+
+The free tiers we run on have per-key limits (Finnhub 60 calls/min, Groq
+~30 requests/min), and the 429 backoff in LLMClient only reacts after
+we've already been told off. A RateLimiter spaces calls out up front:
+up to a minute's worth can go back to back, after that each call waits
+for its slot (GCRA -- a token bucket expressed as one timestamp).
+
+That one timestamp is all the state there is, so it can live in shared
+memory: the process pool (service/process_pool.py) creates it with
+share_limiters() and every worker adopts it, which makes N processes
+draw from one budget instead of each assuming it has the key to itself.
+
+Limits come from settings, <name>_requests_per_minute; 0 = no pacing.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from config.settings import settings
+from telemetry.metrics import RATE_LIMIT_WAIT_SECONDS
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+LIMITED = ("llm", "finnhub")
+
+
+class _LocalSlot:
+    """Same interface as a multiprocessing.Value('d') for the single-process case."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def get_lock(self):
+        return self._lock
+
+
+class RateLimiter:
+    def __init__(self, name: str, per_minute: int, slot=None):
+        self.name = name
+        self.interval = 60.0 / per_minute
+        # allow a minute's worth of burst before pacing kicks in
+        self.tolerance = 60.0 - self.interval
+        # theoretical arrival time of the next call, on the time.time() clock so it means the same in every process
+        self._tat = slot if slot is not None else _LocalSlot()
+
+    def reserve(self) -> float:
+        """Claim the next slot; returns how long the caller must wait for it."""
+        with self._tat.get_lock():
+            now = time.time()
+            tat = max(self._tat.value, now)
+            wait = max(0.0, tat - self.tolerance - now)
+            self._tat.value = tat + self.interval
+        return wait
+
+    def acquire(self) -> float:
+        """Block until a call may go out. Raises DeadlineExceeded rather than waiting past the run's deadline."""
+        wait = self.reserve()
+        if wait <= 0:
+            return 0.0
+        left = deadline.remaining()
+        if left is not None and wait >= left:
+            raise deadline.DeadlineExceeded(f"{self.name} slot in {wait:.1f}s")
+        RATE_LIMIT_WAIT_SECONDS.inc(wait, limiter=self.name)
+        time.sleep(wait)
+        return wait
+
+
+_limiters: dict[str, Optional[RateLimiter]] = {}
+_shared: dict = {}
+_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> Optional[RateLimiter]:
+    """The limiter for `name` ("llm", "finnhub"), or None if it isn't paced."""
+    with _lock:
+        if name not in _limiters:
+            per_minute = getattr(settings, f"{name}_requests_per_minute", 0)
+            _limiters[name] = RateLimiter(name, per_minute, _shared.get(name)) if per_minute > 0 else None
+        return _limiters[name]
+
+
+def acquire(name: str) -> float:
+    limiter = get_limiter(name)
+    return limiter.acquire() if limiter is not None else 0.0
+
+
+def share_limiters(mp_context) -> dict:
+    """Shared-memory slots for every limiter, to hand to worker processes (see adopt_shared)."""
+    return {name: mp_context.Value("d", 0.0) for name in LIMITED}
+
+
+def adopt_shared(slots: dict) -> None:
+    """In a worker process: pace against the parent's shared slots from now on."""
+    with _lock:
+        _shared.clear()
+        _shared.update(slots)
+        _limiters.clear()
+
+
+def reset_limiters() -> None:
+    with _lock:
+        _shared.clear()
+        _limiters.clear()
@@ -0,0 +1,101 @@
+"""
+The queue interface the coordinator and the workers talk to.
+
+A task is one ticker (plus an optional JSON payload, e.g. a deadline) in a
+named queue. Workers lease tasks: a lease hides the task from everyone
+else for `lease_seconds` (a visibility timeout), and the worker has to ack
+it, fail it, or extend the lease before then. A worker that crashes just
+stops extending; once its lease runs out the task is handed to the next
+worker that asks, on any machine. Each lease counts as an attempt, and a
+task that has used up QUEUE_MAX_ATTEMPTS is parked as failed instead of
+being retried forever.
+
+Backends are picked by URL scheme (QUEUE_URL):
+    sqlite:///./output/queue.sqlite      the default, see workqueue/sqlite_backend.py
+Anything else can be plugged in with register_backend("redis", factory).
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlparse
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+STATES = (PENDING, LEASED, DONE, FAILED)
+
+
+class Task:
+    """One leased task. `token` identifies this particular lease of it."""
+
+    def __init__(self, id: int, queue: str, ticker: str, payload: dict, attempts: int, token: str):
+        self.id = id
+        self.queue = queue
+        self.ticker = ticker
+        self.payload = payload
+        self.attempts = attempts
+        self.token = token
+
+    def __repr__(self) -> str:
+        return f"Task({self.id}, {self.queue}/{self.ticker}, attempt {self.attempts})"
+
+
+class QueueBackend(ABC):
+    """
+    Ack, fail and extend take the Task returned by lease() and return False
+    if the lease was lost (it expired and someone else took the task), in
+    which case the caller's result is discarded.
+    """
+
+    max_attempts: int = 3
+
+    @abstractmethod
+    def enqueue(self, queue: str, tickers: list[str], payload: Optional[dict] = None) -> int:
+        """Add tickers not already pending/leased in `queue`. Returns how many were added."""
+
+    @abstractmethod
+    def lease(self, queue: str, owner: str, lease_seconds: float) -> Optional[Task]:
+        """Take the oldest available task (pending, or leased with an expired lease), or None."""
+
+    @abstractmethod
+    def extend(self, task: Task, lease_seconds: float) -> bool:
+        ...
+
+    @abstractmethod
+    def ack(self, task: Task, result: dict) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, task: Task, error: str, retry_delay: float) -> bool:
+        """Make the task available again after `retry_delay`, or park it as failed if out of attempts."""
+
+    @abstractmethod
+    def stats(self, queue: str) -> dict:
+        """{state: count} for every state."""
+
+    @abstractmethod
+    def results(self, queue: str) -> Iterator[tuple[str, dict]]:
+        """(ticker, result) for every done task, in enqueue order."""
+
+    @abstractmethod
+    def failures(self, queue: str) -> list[dict]:
+        """{ticker, attempts, error} for every task parked as failed."""
+
+
+_BACKENDS: dict[str, Callable[..., QueueBackend]] = {}
+
+
+def register_backend(scheme: str, factory: Callable[..., QueueBackend]) -> None:
+    """factory(url, max_attempts=...) -> QueueBackend, used for QUEUE_URLs starting with `scheme://`."""
+    _BACKENDS[scheme] = factory
+
+
+def open_backend(url: str, max_attempts: int = 3) -> QueueBackend:
+    scheme = urlparse(url).scheme
+    if scheme == "sqlite" and scheme not in _BACKENDS:
+        # the built-in backend, imported only when it's used
+        from workqueue.sqlite_backend import SQLiteBackend
+        return SQLiteBackend.from_url(url, max_attempts=max_attempts)
+    if scheme not in _BACKENDS:
+        raise ValueError(f"No queue backend for {url!r} (known: {', '.join(sorted(_BACKENDS)) or 'none'})")
+    return _BACKENDS[scheme](url, max_attempts=max_attempts)
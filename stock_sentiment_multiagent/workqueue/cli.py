@@ -0,0 +1,114 @@
+"""
+Coordinator / worker command line for the distributed scan.
+
+On the coordinator:
+    python -m workqueue.cli enqueue AAPL MSFT NVDA --queue nightly
+    python -m workqueue.cli enqueue --file universe.txt --queue nightly --deadline 120
+    python -m workqueue.cli status --queue nightly
+    python -m workqueue.cli collect --queue nightly --output ./output
+
+On every worker node (any number, started or killed at any time):
+    python -m workqueue.cli work --queue nightly --threads 4
+
+All of them point at the same QUEUE_URL (default: a SQLite file under
+./output; for several machines, a path on shared storage).
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+
+from config.settings import settings
+from workqueue.backend import open_backend
+
+logger = logging.getLogger(__name__)
+
+
+def _tickers(args) -> list[str]:
+    tickers = list(args.tickers or [])
+    if args.file:
+        with open(args.file) as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return tickers
+
+
+def work(backend, queue: str, threads: int, until_empty: bool, output_dir) -> int:
+    """Run `threads` QueueWorkers in this process until stopped (or drained). Returns tasks run."""
+    from agents.orchestrator_agent import OrchestratorAgent
+    from agents.sentiment_graph import get_sentiment_graph
+    from workqueue.worker import QueueWorker
+
+    get_sentiment_graph()
+    orchestrator = OrchestratorAgent()
+    workers = [QueueWorker(backend, queue, compute=orchestrator.run, output_dir=output_dir) for _ in range(threads)]
+    counts = [0] * threads
+
+    def _run(i: int):
+        counts[i] = workers[i].run(until_empty=until_empty)
+
+    pool = [threading.Thread(target=_run, args=(i,), name=f"queue-worker-{i}") for i in range(threads)]
+    for t in pool:
+        t.start()
+    try:
+        for t in pool:
+            t.join()
+    except KeyboardInterrupt:
+        # finish the tickers in flight; anything unacked goes back to the queue when its lease runs out
+        logger.info("Stopping workers after their current task")
+        for w in workers:
+            w.stop()
+        for t in pool:
+            t.join()
+    return sum(counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Queue-backed sentiment scan across machines")
+    parser.add_argument("--url", default=settings.queue_url, help="Queue backend (default: QUEUE_URL)")
+    parser.add_argument("--queue", default="default", help="Queue name")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="Add tickers to the queue")
+    p.add_argument("tickers", nargs="*")
+    p.add_argument("--file", help="Read tickers from a file, one per line")
+    p.add_argument("--deadline", type=float, help="Time budget per ticker run, in seconds")
+
+    p = sub.add_parser("work", help="Lease and run tickers until interrupted")
+    p.add_argument("--threads", type=int, default=1, help="Concurrent pipelines in this process")
+    p.add_argument("--until-empty", action="store_true", help="Exit once nothing is pending or leased")
+    p.add_argument("--output", help="Also save each report locally, as main.py does")
+
+    sub.add_parser("status", help="Task counts per state, plus parked failures")
+
+    p = sub.add_parser("collect", help="Save every finished report to the output folder")
+    p.add_argument("--output", "-o", default="./output")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    backend = open_backend(args.url, max_attempts=settings.queue_max_attempts)
+
+    if args.command == "enqueue":
+        tickers = _tickers(args)
+        if not tickers:
+            parser.error("enqueue needs tickers or --file")
+        payload = {"deadline": args.deadline} if args.deadline else None
+        added = backend.enqueue(args.queue, tickers, payload)
+        print(f"Enqueued {added} of {len(tickers)} tickers on {args.queue!r} ({len(tickers) - added} already queued)")
+    elif args.command == "work":
+        count = work(backend, args.queue, args.threads, args.until_empty, args.output)
+        print(f"Ran {count} tasks from {args.queue!r}")
+    elif args.command == "status":
+        json.dump({"stats": backend.stats(args.queue), "failures": backend.failures(args.queue)}, sys.stdout, indent=2)
+        print()
+    elif args.command == "collect":
+        from output.report_generator import save_report
+        count = 0
+        for _, report in backend.results(args.queue):
+            save_report(report, args.output)
+            count += 1
+        print(f"Saved {count} reports to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+SQLite queue backend -- the default.
+
+One file, one table. Leasing happens inside a BEGIN IMMEDIATE transaction,
+so two workers can never take the same task: SQLite hands the write lock
+to one of them and the other sees the updated row. Every worker process
+(and thread) opens its own short-lived connection.
+
+For several machines, put the file on storage they all mount. The default
+rollback journal works over network filesystems where WAL does not; that
+is fine for this load, which is a handful of writes per ticker. If you
+need more, plug in another backend (workqueue/backend.py).
+
+URLs follow the usual convention: sqlite:///relative/path.sqlite or
+sqlite:////absolute/path.sqlite.
+"""
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from workqueue.backend import DONE, FAILED, LEASED, PENDING, STATES, QueueBackend, Task
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id            INTEGER PRIMARY KEY,
+    queue         TEXT NOT NULL,
+    ticker        TEXT NOT NULL,
+    payload       TEXT NOT NULL DEFAULT '{}',
+    state         TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    available_at  REAL NOT NULL,
+    lease_owner   TEXT,
+    lease_token   TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    enqueued_at   REAL NOT NULL,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_queue_state ON tasks (queue, state, available_at);
+"""
+
+
+class SQLiteBackend(QueueBackend):
+    def __init__(self, path: str, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        # wall clock, not monotonic: leases are compared across processes and machines
+        self._clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_url(cls, url: str, max_attempts: int = 3) -> "SQLiteBackend":
+        prefix = "sqlite:///"
+        if not url.startswith(prefix):
+            raise ValueError(f"Expected {prefix}<path>, got {url!r}")
+        return cls(url[len(prefix):], max_attempts=max_attempts)
+
+    @contextmanager
+    def _connect(self):
+        # autocommit mode, so _write() can open the transaction with BEGIN IMMEDIATE itself
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        """A transaction that holds the write lock from the start (no read-then-upgrade races)."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- coordinator side ----
+
+    def enqueue(self, queue: str, tickers: list[str], payload: Optional[dict] = None) -> int:
+        now = self._clock()
+        payload_json = json.dumps(payload or {}, sort_keys=True)
+        added = 0
+        with self._write() as conn:
+            for ticker in tickers:
+                ticker = ticker.upper().strip()
+                queued = conn.execute(
+                    "SELECT 1 FROM tasks WHERE queue = ? AND ticker = ? AND payload = ? AND state IN (?, ?)",
+                    (queue, ticker, payload_json, PENDING, LEASED),
+                ).fetchone()
+                if queued:
+                    continue
+                conn.execute(
+                    "INSERT INTO tasks (queue, ticker, payload, state, available_at, enqueued_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (queue, ticker, payload_json, PENDING, now, now, now),
+                )
+                added += 1
+        return added
+
+    def stats(self, queue: str) -> dict:
+        counts = {state: 0 for state in STATES}
+        with self._connect() as conn:
+            for row in conn.execute("SELECT state, COUNT(*) AS n FROM tasks WHERE queue = ? GROUP BY state", (queue,)):
+                counts[row["state"]] = row["n"]
+        return counts
+
+    def results(self, queue: str) -> Iterator[tuple[str, dict]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, result FROM tasks WHERE queue = ? AND state = ? ORDER BY id", (queue, DONE)
+            ).fetchall()
+        for row in rows:
+            yield row["ticker"], json.loads(row["result"])
+
+    def failures(self, queue: str) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, attempts, error FROM tasks WHERE queue = ? AND state = ? ORDER BY id", (queue, FAILED)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ---- worker side ----
+
+    def lease(self, queue: str, owner: str, lease_seconds: float) -> Optional[Task]:
+        now = self._clock()
+        with self._write() as conn:
+            # expired leases that were the last attempt: the worker died on it every time, park it
+            conn.execute(
+                "UPDATE tasks SET state = ?, error = COALESCE(error, 'lease expired'), lease_token = NULL, updated_at = ? "
+                "WHERE queue = ? AND state = ? AND lease_expires <= ? AND attempts >= ?",
+                (FAILED, now, queue, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, ticker, payload, attempts FROM tasks WHERE queue = ? AND ("
+                "  (state = ? AND available_at <= ?) OR (state = ? AND lease_expires <= ?)"
+                ") ORDER BY id LIMIT 1",
+                (queue, PENDING, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE tasks SET state = ?, attempts = attempts + 1, lease_owner = ?, lease_token = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (LEASED, owner, token, now + lease_seconds, now, row["id"]),
+            )
+        return Task(row["id"], queue, row["ticker"], json.loads(row["payload"]), row["attempts"] + 1, token)
+
+    def _update_leased(self, task: Task, assignments: str, params: tuple) -> bool:
+        with self._write() as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {assignments}, updated_at = ? WHERE id = ? AND state = ? AND lease_token = ?",
+                (*params, self._clock(), task.id, LEASED, task.token),
+            )
+            return cursor.rowcount == 1
+
+    def extend(self, task: Task, lease_seconds: float) -> bool:
+        return self._update_leased(task, "lease_expires = ?", (self._clock() + lease_seconds,))
+
+    def ack(self, task: Task, result: dict) -> bool:
+        return self._update_leased(
+            task, "state = ?, result = ?, error = NULL, lease_token = NULL", (DONE, json.dumps(result)),
+        )
+
+    def fail(self, task: Task, error: str, retry_delay: float) -> bool:
+        if task.attempts >= self.max_attempts:
+            return self._update_leased(task, "state = ?, error = ?, lease_token = NULL", (FAILED, error))
+        return self._update_leased(
+            task, "state = ?, error = ?, available_at = ?, lease_token = NULL",
+            (PENDING, error, self._clock() + retry_delay),
+        )
@@ -0,0 +1,121 @@
+"""
+Stateless queue worker: lease a ticker, run the pipeline, ack the report.
+
+While the pipeline runs, a heartbeat thread keeps extending the lease
+(every third of QUEUE_LEASE_SECONDS), so a slow ticker stuck in LLM
+backoff isn't handed to a second worker, but a crashed one is, within one
+lease period. If the lease is lost anyway (the host stalled past it), the
+ack is refused and the report is dropped -- whoever holds the lease now
+will produce it.
+
+A pipeline error puts the task back with a growing delay
+(QUEUE_RETRY_DELAY_SECONDS x attempt) until QUEUE_MAX_ATTEMPTS, then it is
+parked as failed for `python -m workqueue.cli status` to show.
+"""
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Optional
+
+from config.settings import settings
+from telemetry.metrics import QUEUE_TASKS
+from utils.deadline import within
+from workqueue.backend import QueueBackend, Task
+
+logger = logging.getLogger(__name__)
+
+
+class QueueWorker:
+    def __init__(
+        self,
+        backend: QueueBackend,
+        queue: str,
+        compute: Optional[Callable[[str], dict]] = None,
+        lease_seconds: Optional[float] = None,
+        retry_delay: Optional[float] = None,
+        poll_seconds: float = 2.0,
+        output_dir: Optional[str] = None,
+    ):
+        self.backend = backend
+        self.queue = queue
+        self.lease_seconds = lease_seconds or settings.queue_lease_seconds
+        self.retry_delay = settings.queue_retry_delay_seconds if retry_delay is None else retry_delay
+        self.poll_seconds = poll_seconds
+        self.output_dir = output_dir
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+        self._stopping = threading.Event()
+
+        if compute is None:
+            from agents.orchestrator_agent import OrchestratorAgent
+            compute = OrchestratorAgent().run
+        self.compute = compute
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self, until_empty: bool = False, max_tasks: Optional[int] = None) -> int:
+        """Work until stopped (or the queue drains, with until_empty). Returns how many tasks were run."""
+        processed = 0
+        while not self._stopping.is_set():
+            if self.run_once():
+                processed += 1
+                if max_tasks is not None and processed >= max_tasks:
+                    break
+                continue
+            if until_empty:
+                # retries waiting out their delay still count as work left
+                stats = self.backend.stats(self.queue)
+                if not stats["pending"] and not stats["leased"]:
+                    break
+            self._stopping.wait(self.poll_seconds)
+        return processed
+
+    def run_once(self) -> bool:
+        """Lease and run one task. False if nothing was available."""
+        task = self.backend.lease(self.queue, self.owner, self.lease_seconds)
+        if task is None:
+            return False
+        logger.info(f"[{self.owner}] {task}")
+
+        lost = threading.Event()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(task, done, lost), name=f"lease-{task.id}", daemon=True,
+        )
+        heartbeat.start()
+        try:
+            with within(task.payload.get("deadline")):
+                report = self.compute(task.ticker)
+        except Exception as e:
+            done.set()
+            heartbeat.join()
+            self._failed(task, f"{type(e).__name__}: {e}")
+            return True
+        done.set()
+        heartbeat.join()
+
+        if lost.is_set() or not self.backend.ack(task, report):
+            logger.warning(f"Lost the lease on {task} before finishing; dropping the result")
+            QUEUE_TASKS.inc(queue=self.queue, outcome="lost")
+            return True
+        if self.output_dir:
+            from output.report_generator import save_report
+            save_report(report, self.output_dir)
+        QUEUE_TASKS.inc(queue=self.queue, outcome="done")
+        return True
+
+    def _heartbeat(self, task: Task, done: threading.Event, lost: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            if not self.backend.extend(task, self.lease_seconds):
+                lost.set()
+                return
+
+    def _failed(self, task: Task, error: str) -> None:
+        logger.error(f"{task} failed: {error}")
+        if not self.backend.fail(task, error, self.retry_delay * task.attempts):
+            QUEUE_TASKS.inc(queue=self.queue, outcome="lost")
+        elif task.attempts >= self.backend.max_attempts:
+            QUEUE_TASKS.inc(queue=self.queue, outcome="failed")
+        else:
+            QUEUE_TASKS.inc(queue=self.queue, outcome="retry")